@@ -0,0 +1,194 @@
+from contextlib import contextmanager
+import json
+import os
+import queue
+import threading
+import time
+
+# Where the resolved chromedriver path is remembered between runs
+DRIVER_PATH_CACHE = '.chromedriver_path.json'
+DRIVER_PATH_MAX_AGE_DAYS = 7
+_DRIVER_PATH_LOCK = threading.Lock()
+
+# Requests dropped via CDP before they leave the browser
+BLOCKED_IMAGES_AND_FONTS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'
+]
+BLOCKED_STYLESHEETS = ['*.css']
+BLOCKED_ANALYTICS = [
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*facebook.net*', '*hotjar.com*', '*segment.io*', '*segment.com*',
+    '*mixpanel.com*', '*clarity.ms*', '*intercom.io*', '*sentry.io*'
+]
+
+
+def resolve_driver_path(max_age_days=DRIVER_PATH_MAX_AGE_DAYS):
+    """
+    chromedriver path, resolved through webdriver_manager at most once
+    every max_age_days instead of a network version lookup on every start
+    """
+    # Pool browsers start concurrently: one thread resolves and writes the
+    # cache, the others wait and read it (no torn reads, no duplicate installs)
+    with _DRIVER_PATH_LOCK:
+        try:
+            with open(DRIVER_PATH_CACHE, encoding='utf-8') as f:
+                cached = json.load(f)
+            if (os.path.exists(cached['path']) and
+                    time.time() - cached['resolved_at'] < max_age_days * 86400):
+                return cached['path']
+        except (OSError, ValueError, KeyError):
+            pass
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+
+        with open(DRIVER_PATH_CACHE, 'w', encoding='utf-8') as f:
+            json.dump({'path': path, 'resolved_at': time.time()}, f)
+        return path
+
+
+def build_chrome_options(headless=True, extra_arguments=None, experimental_options=None):
+    """Chrome options shared by the Selenium scrapers (eager page loads, no images)"""
+    # Selenium is imported on first use so importing a scraper (e.g. for --help) stays light
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    for argument in extra_arguments or []:
+        options.add_argument(argument)
+    for name, value in (experimental_options or {}).items():
+        options.add_experimental_option(name, value)
+
+    # Return control once the DOM is ready instead of waiting for every subresource
+    options.page_load_strategy = 'eager'
+    options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    return options
+
+
+class BrowserPool:
+    """
+    N reusable Chrome instances that are leased and returned
+
+    Browsers start lazily (up to `size`) and are reused across pages, so
+    startup and driver resolution are paid once per run. Images, fonts,
+    analytics and (optionally) stylesheets are blocked through CDP.
+
+        with BrowserPool(size=3) as pool:
+            with pool.lease() as driver:
+                driver.get(url)
+    """
+
+    def __init__(self, size=1, headless=True, block_resources=True, block_stylesheets=True,
+                 extra_arguments=None, experimental_options=None):
+        self.size = size
+        self.headless = headless
+        self.extra_arguments = extra_arguments
+        self.experimental_options = experimental_options
+        self.blocked_urls = []
+        if block_resources:
+            self.blocked_urls = BLOCKED_IMAGES_AND_FONTS + BLOCKED_ANALYTICS
+            if block_stylesheets:
+                self.blocked_urls += BLOCKED_STYLESHEETS
+
+        self.driver_path = None
+        self.idle = queue.Queue()
+        self.drivers = []
+        self.lock = threading.Lock()
+
+    def _start_driver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        if self.driver_path is None:
+            self.driver_path = resolve_driver_path()
+        options = build_chrome_options(self.headless, self.extra_arguments, self.experimental_options)
+        driver = webdriver.Chrome(service=Service(self.driver_path), options=options)
+        if self.blocked_urls:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls})
+        return driver
+
+    def acquire(self):
+        """Take a browser from the pool, starting one if under `size`, else wait"""
+        while True:
+            with self.lock:
+                can_start = self.idle.empty() and len(self.drivers) < self.size
+                if can_start:
+                    # Reserve the slot before the (slow) start so other threads wait
+                    self.drivers.append(None)
+
+            if not can_start:
+                driver = self.idle.get()
+                if driver is None:
+                    # A dead browser was discarded; its slot is free again
+                    continue
+                return driver
+
+            try:
+                driver = self._start_driver()
+            except Exception:
+                with self.lock:
+                    self.drivers.remove(None)
+                # Wake a waiting thread so it can retry the start in this slot
+                self.idle.put(None)
+                raise
+            with self.lock:
+                self.drivers[self.drivers.index(None)] = driver
+            return driver
+
+    def _discard(self, driver):
+        with self.lock:
+            if driver in self.drivers:
+                self.drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        # Wake a thread waiting for a browser so it can start a replacement
+        self.idle.put(None)
+
+    def release(self, driver, healthy=True):
+        """Return a browser to the pool (or drop it if it died)"""
+        if healthy:
+            self.idle.put(driver)
+        else:
+            self._discard(driver)
+
+    @contextmanager
+    def lease(self):
+        """Borrow a browser; it goes back to the pool afterwards (or is replaced if it died)"""
+        driver = self.acquire()
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            try:
+                driver.current_url
+            except Exception:
+                healthy = False
+            raise
+        finally:
+            self.release(driver, healthy)
+
+    def close(self):
+        with self.lock:
+            drivers = [driver for driver in self.drivers if driver is not None]
+            self.drivers = []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self.idle = queue.Queue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
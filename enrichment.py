@@ -0,0 +1,348 @@
+import json
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http_fetch import get_fetcher
+from instrumentation import span, bind, count
+
+DEFAULT_CACHE_PATH = '.detail_cache.sqlite'
+DEFAULT_WORKERS = 8
+
+# Extra CSV columns written by an enriched scrape (the warehouse load keeps
+# only the shared COLUMNS, so older loaders read these files unchanged)
+DETAIL_COLUMNS = ['tags', 'question_type', 'asked_date']
+
+DIFFICULTIES = {'easy': 'Easy', 'medium': 'Medium', 'hard': 'Hard'}
+
+# InterviewBit topic pages, e.g. /courses/programming/arrays/
+TOPIC_LINK_RE = re.compile(r'/courses/programming/(?:topics/)?[\w-]+/?$')
+
+
+class DetailCache:
+    """
+    Local SQLite cache of parsed question detail pages
+
+    One row per URL holding the fields parsed from the page and the ETag /
+    Last-Modified it was served with, so an old entry can be revalidated
+    with a conditional GET (a 304 costs no body and no parse) instead of
+    being refetched. Only the thread that owns the cache reads and writes it.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS details (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                fields TEXT NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM details").fetchone()[0]
+
+    def get_many(self, urls, chunk=500):
+        """{url: entry} for the cached URLs among `urls`"""
+        urls = list(urls)
+        entries = {}
+        for i in range(0, len(urls), chunk):
+            part = urls[i:i + chunk]
+            rows = self._conn.execute(
+                f"SELECT url, etag, last_modified, fetched_at, fields FROM details "
+                f"WHERE url IN ({','.join('?' * len(part))})", part
+            )
+            for url, etag, last_modified, fetched_at, fields in rows:
+                entries[url] = {'etag': etag, 'last_modified': last_modified,
+                                'fetched_at': fetched_at, 'fields': json.loads(fields)}
+        return entries
+
+    def put(self, url, fields, etag=None, last_modified=None):
+        self._conn.execute("""
+            INSERT INTO details (url, etag, last_modified, fetched_at, fields)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                fetched_at = excluded.fetched_at,
+                fields = excluded.fields
+        """, (url, etag, last_modified, time.time(), json.dumps(fields)))
+
+    def touch(self, url):
+        """Mark an entry as just revalidated (the server answered 304)"""
+        self._conn.execute("UPDATE details SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+
+def enrich_urls(urls, parse, cache=None, name='details', workers=DEFAULT_WORKERS,
+                revalidate_after=None, headers=None):
+    """
+    Parsed detail fields for each distinct URL: {url: fields}
+
+    Cached URLs are answered from `cache` without a request, unless their
+    entry is older than `revalidate_after` seconds, in which case they are
+    revalidated with If-None-Match / If-Modified-Since. Everything else is
+    fetched over the shared fetcher's pooled sessions with at most
+    `workers` requests in flight (the per-host rate limit still applies)
+    and parsed by `parse(html)` in the worker that fetched it.
+    """
+    fetcher = get_fetcher()
+    urls = list(dict.fromkeys(url for url in urls if url))
+    cached = cache.get_many(urls) if cache is not None else {}
+    now = time.time()
+
+    details = {}
+    pending = []
+    for url in urls:
+        entry = cached.get(url)
+        if entry is None:
+            pending.append((url, None))
+        elif revalidate_after is not None and now - entry['fetched_at'] > revalidate_after:
+            pending.append((url, entry))
+        else:
+            details[url] = entry['fields']
+    count('detail_cache_hits', len(details))
+
+    print(f"\nEnriching {len(urls)} {name} page(s): {len(details)} cached, "
+          f"{len(pending)} to fetch ({workers} workers)...")
+
+    def fetch(url, entry):
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry['etag']:
+                request_headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request_headers['If-Modified-Since'] = entry['last_modified']
+        with span(f'{name}.detail', url=url) as unit:
+            # The detail cache does its own revalidation, so skip the HTTP cache
+            response = fetcher.get(url, headers=request_headers, timeout=15, use_cache=False)
+            if entry is not None and response.status_code == 304:
+                return None, response.headers
+            response.raise_for_status()
+            fields = parse(response.content)
+            unit.count('rows')
+            return fields, response.headers
+
+    fetched = revalidated = failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(bind(fetch), url, entry): (url, entry) for url, entry in pending}
+        for done, future in enumerate(as_completed(futures), 1):
+            url, entry = futures[future]
+            try:
+                fields, response_headers = future.result()
+            except Exception as e:
+                print(f"  ✗ {url}: {str(e)[:60]}")
+                failed += 1
+                continue
+
+            if fields is None:
+                revalidated += 1
+                details[url] = entry['fields']
+                if cache is not None:
+                    cache.touch(url)
+            else:
+                fetched += 1
+                details[url] = fields
+                if cache is not None:
+                    cache.put(url, fields, response_headers.get('ETag'), response_headers.get('Last-Modified'))
+
+            if done % 100 == 0:
+                if cache is not None:
+                    cache.commit()
+                print(f"  [{done}/{len(pending)}] fetched")
+
+    if cache is not None:
+        cache.commit()
+    count('detail_fetched', fetched)
+    count('detail_revalidated', revalidated)
+    count('detail_failed', failed)
+    print(f"✓ {name}: {fetched} fetched, {revalidated} unchanged (304), "
+          f"{len(details) - fetched - revalidated} from cache, {failed} failed")
+    return details
+
+
+def normalize_difficulty(value):
+    if not value:
+        return None
+    return DIFFICULTIES.get(str(value).strip().lower())
+
+
+def next_data(root):
+    """The JSON a Next.js page is hydrated from (<script id="__NEXT_DATA__">), or {}"""
+    scripts = root.xpath('//script[@id="__NEXT_DATA__"]/text()')
+    if not scripts:
+        return {}
+    try:
+        return json.loads(scripts[0])
+    except ValueError:
+        return {}
+
+
+def find_object(data, keys):
+    """First dict (depth first) in a JSON document holding any of `keys`"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if any(key in node for key in keys):
+                return node
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return {}
+
+
+def _label(value):
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('label') or value.get('title')
+    return str(value).strip() if value else None
+
+
+def _link_labels(root, *query_keys):
+    """Distinct link texts of anchors filtering a listing by one of `query_keys`"""
+    labels = []
+    for link in root.iter('a'):
+        href = link.get('href') or ''
+        if any(f"?{key}=" in href or f"&{key}=" in href for key in query_keys):
+            text = link.text_content().strip()
+            if text and text not in labels:
+                labels.append(text)
+    return labels
+
+
+def parse_tryexponent_question(html):
+    """
+    Difficulty, tags, question type and asked-date from a TryExponent
+    question page: the embedded Next.js data when present, otherwise the
+    rendered tag/type links, difficulty badge and <time> element
+    """
+    import lxml.html
+
+    root = lxml.html.fromstring(html)
+    question = find_object(next_data(root), ('difficulty', 'questionType', 'tags'))
+
+    difficulty = normalize_difficulty(question.get('difficulty'))
+    if difficulty is None:
+        for badge in root.xpath('//*[contains(@class, "difficulty")]'):
+            difficulty = normalize_difficulty(badge.text_content())
+            if difficulty:
+                break
+
+    tags = [label for label in map(_label, question.get('tags') or []) if label]
+    if not tags:
+        tags = _link_labels(root, 'tag', 'topic')
+
+    question_type = _label(question.get('questionType') or question.get('type'))
+    if not question_type:
+        types = _link_labels(root, 'type')
+        question_type = types[0] if types else None
+
+    asked_date = question.get('askedAt') or question.get('dateAsked') or question.get('createdAt')
+    if not asked_date:
+        times = root.xpath('//time/@datetime')
+        asked_date = times[0] if times else None
+
+    return {
+        'difficulty': difficulty,
+        'tags': tags,
+        'question_type': question_type,
+        'asked_date': str(asked_date)[:10] if asked_date else None
+    }
+
+
+def sprite_company_name(key, sprite_names):
+    """Company for an InterviewBit sprite key ("ib-<key>"), title-cased if it isn't in `sprite_names`"""
+    return sprite_names.get(key) or key.replace('-', ' ').title()
+
+
+def parse_interviewbit_problem(html, sprite_names=None):
+    """
+    Difficulty, topics and the complete company list from an InterviewBit
+    problem page. Company sprites ("ib-<key>" classes) are named through
+    `sprite_names`; keys missing from it are title-cased rather than dropped.
+    """
+    import lxml.html
+
+    root = lxml.html.fromstring(html)
+    sprite_names = sprite_names or {}
+
+    difficulty = None
+    for badge in root.xpath('//*[contains(@class, "difficulty")]'):
+        difficulty = normalize_difficulty(badge.text_content())
+        if difficulty:
+            break
+
+    topics = []
+    for link in root.iter('a'):
+        text = link.text_content().strip()
+        if text and TOPIC_LINK_RE.search(link.get('href') or '') and text not in topics:
+            topics.append(text)
+
+    companies = []
+    for element in root.xpath('//*[contains(@class, "ib-company-sprites")]'):
+        for cls in element.get('class').split():
+            if cls.startswith('ib-') and cls != 'ib-company-sprites':
+                key = cls[3:]
+                name = sprite_company_name(key, sprite_names)
+                if name not in companies:
+                    companies.append(name)
+    for element in root.xpath('//a[contains(@href, "/companies/")] | //*[contains(@class, "company-tag")]'):
+        name = element.text_content().strip()
+        if name and name not in companies:
+            companies.append(name)
+
+    return {'difficulty': difficulty, 'tags': topics, 'companies': companies}
+
+
+def expand_companies(df, details, placeholder='Multiple Companies'):
+    """
+    Add a row for every company a detail page lists that the listing row
+    missed, copying the question's first row; placeholder rows go away
+    for questions whose page names real companies
+    """
+    import pandas as pd
+    from records import concat_records
+
+    urls = df['question_url'].astype(object)
+    known = set(zip(urls, df['company_name'].astype(object)))
+    first = df.drop_duplicates(subset=['question_url'])
+
+    positions, companies, attributed = [], [], set()
+    for position, url in enumerate(first['question_url'].astype(object)):
+        for company in (details.get(url) or {}).get('companies') or []:
+            attributed.add(url)
+            if (url, company) not in known:
+                positions.append(position)
+                companies.append(company)
+
+    added = first.iloc[positions].copy()
+    added['company_name'] = pd.Categorical(companies)
+    df = concat_records([df, added])
+    placeholder_rows = (df['company_name'] == placeholder) & df['question_url'].astype(object).isin(attributed)
+    return df[~placeholder_rows].reset_index(drop=True)
+
+
+def apply_details(df, details):
+    """
+    Fill difficulty from the detail pages (where they name one) and add
+    the DETAIL_COLUMNS, matching rows on question_url
+    """
+    df = df.copy()
+    fields = df['question_url'].astype(object).map(lambda url: details.get(url) or {})
+
+    difficulty = fields.map(lambda f: f.get('difficulty'))
+    df['difficulty'] = df['difficulty'].astype(object).where(difficulty.isna(), difficulty).astype('category')
+    df['tags'] = fields.map(lambda f: '; '.join(f.get('tags') or []) or None)
+    df['question_type'] = fields.map(lambda f: f.get('question_type')).astype('category')
+    df['asked_date'] = fields.map(lambda f: f.get('asked_date'))
+    return df
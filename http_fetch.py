@@ -0,0 +1,352 @@
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import instrumentation
+
+# Status codes worth retrying (rate limited / transient server errors)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Requests per second allowed per host unless configured otherwise
+DEFAULT_HOST_RATE = 5.0
+
+# Politeness limits for the hosts the scrapers talk to
+HOST_RATES = {
+    'www.reddit.com': 0.5,
+    'api.github.com': 1.0,
+    'raw.githubusercontent.com': 8.0,
+    'www.geeksforgeeks.org': 4.0,
+    'practice.geeksforgeeks.org': 4.0,
+    'www.tryexponent.com': 8.0,
+    'www.interviewbit.com': 12.0
+}
+
+DEFAULT_USER_AGENT = 'JobPrepAI Scraper v2.0'
+
+
+def _accept_encoding():
+    """gzip/deflate always; br only if urllib3 can decode it"""
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+        except ImportError:
+            return 'gzip, deflate'
+    return 'gzip, deflate, br'
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/second, bursts up to `capacity`"""
+
+    def __init__(self, rate, capacity=1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HttpCache:
+    """
+    On-disk HTTP cache with RFC 7234 freshness rules
+
+    Responses are fresh for Cache-Control max-age (or Expires - Date),
+    `no-store` responses are never written, and stale or `no-cache` entries
+    are revalidated with If-None-Match / If-Modified-Since so a 304 reuses
+    the stored body.
+    """
+
+    def __init__(self, directory='.http_cache'):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key[:2], key)
+        return base + '.json', base + '.body'
+
+    @staticmethod
+    def _cache_control(headers):
+        directives = {}
+        for part in headers.get('Cache-Control', '').split(','):
+            name, _, value = part.strip().partition('=')
+            if name:
+                directives[name.lower()] = value.strip('"')
+        return directives
+
+    def load(self, url):
+        """Stored (metadata, body) for a URL, or None"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, meta):
+        headers = CaseInsensitiveDict(meta['headers'])
+        directives = self._cache_control(headers)
+        if 'no-cache' in directives:
+            return False
+
+        if 'max-age' in directives:
+            try:
+                lifetime = int(directives['max-age'])
+            except ValueError:
+                return False
+        elif 'Expires' in headers:
+            try:
+                expires = parsedate_to_datetime(headers['Expires']).timestamp()
+                date = parsedate_to_datetime(headers['Date']).timestamp() if 'Date' in headers else meta['stored_at']
+                lifetime = expires - date
+            except (TypeError, ValueError):
+                return False
+        else:
+            return False
+
+        try:
+            age = max(0, int(headers.get('Age', 0)))
+        except ValueError:
+            age = 0
+        current_age = age + (time.time() - meta['stored_at'])
+        return current_age < lifetime
+
+    @staticmethod
+    def validators(meta):
+        """Conditional request headers for revalidating a stored response"""
+        headers = CaseInsensitiveDict(meta['headers'])
+        conditional = {}
+        if 'ETag' in headers:
+            conditional['If-None-Match'] = headers['ETag']
+        if 'Last-Modified' in headers:
+            conditional['If-Modified-Since'] = headers['Last-Modified']
+        return conditional
+
+    def store(self, url, response, body=None):
+        if 'no-store' in self._cache_control(response.headers):
+            return
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        body = response.content if body is None else body
+        with open(body_path, 'wb') as f:
+            f.write(body)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'url': url,
+                'status': response.status_code,
+                'headers': dict(response.headers),
+                'stored_at': time.time()
+            }, f)
+
+    def refresh(self, url, meta, not_modified):
+        """Merge the headers of a 304 into the stored entry and restart its age"""
+        meta['headers'].update(dict(not_modified.headers))
+        meta['stored_at'] = time.time()
+        meta_path, _ = self._paths(url)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+
+def cached_response(url, meta, body):
+    """Build a requests.Response from a cache entry"""
+    response = requests.Response()
+    response.status_code = meta['status']
+    response.headers = CaseInsensitiveDict(meta['headers'])
+    # Stored bodies are already decoded; don't let callers decode them again
+    response.headers.pop('Content-Encoding', None)
+    response._content = body
+    response.url = url
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.from_cache = True
+    return response
+
+
+class Fetcher:
+    """
+    Shared HTTP client for the scrapers
+
+    - one pooled keep-alive Session per host
+    - gzip/deflate (and brotli when available) transfer encoding
+    - retries on connection errors and 429/5xx with exponential backoff
+      and full jitter, honoring Retry-After
+    - per-host token buckets instead of fixed sleeps
+    - optional RFC 7234 disk cache
+    """
+
+    def __init__(self, cache_dir=None, max_retries=4, backoff_base=1.0, backoff_cap=60.0,
+                 host_rates=None, default_rate=DEFAULT_HOST_RATE, pool_size=16,
+                 user_agent=DEFAULT_USER_AGENT, url_overrides=None):
+        self.cache = HttpCache(cache_dir) if cache_dir else None
+        # URL prefix -> replacement, e.g. to serve recorded fixtures locally
+        self.url_overrides = dict(url_overrides or {})
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.host_rates = dict(HOST_RATES, **(host_rates or {}))
+        self.default_rate = default_rate
+        self.pool_size = pool_size
+        self.default_headers = {
+            'User-Agent': user_agent,
+            'Accept-Encoding': _accept_encoding()
+        }
+        self.sessions = {}
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'retries': 0, 'cache_hits': 0, 'revalidated': 0, 'throttled_seconds': 0.0}
+
+    def session_for(self, host):
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update(self.default_headers)
+                self.sessions[host] = session
+            return session
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.stats[name] += value
+        # Also attribute it to whatever stage/unit span is making the request
+        instrumentation.count(f"http_{name}", value)
+
+    def bucket_for(self, host):
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.host_rates.get(host, self.default_rate))
+                self.buckets[host] = bucket
+            return bucket
+
+    def retry_delay(self, attempt, response=None):
+        """Retry-After if the server sent one, else capped exponential backoff with full jitter"""
+        if response is not None and 'Retry-After' in response.headers:
+            value = response.headers['Retry-After']
+            try:
+                return min(self.backoff_cap, max(0.0, float(value)))
+            except ValueError:
+                try:
+                    return min(self.backoff_cap, max(0.0, parsedate_to_datetime(value).timestamp() - time.time()))
+                except (TypeError, ValueError):
+                    pass
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def get(self, url, params=None, headers=None, timeout=15, use_cache=True, stream=False):
+        """
+        GET with pooling, rate limiting, retries and caching
+        Returns the final response (callers still check status_code);
+        raises only if every attempt failed at the connection level
+        """
+        full_url = requests.Request('GET', url, params=params).prepare().url
+        for prefix, replacement in self.url_overrides.items():
+            if full_url.startswith(prefix):
+                full_url = replacement + full_url[len(prefix):]
+                break
+        host = urlsplit(full_url).netloc
+        session = self.session_for(host)
+
+        cache = self.cache if use_cache and not stream else None
+        entry = cache.load(full_url) if cache else None
+        request_headers = dict(headers or {})
+        if entry is not None:
+            meta, body = entry
+            if cache.is_fresh(meta):
+                self.count('cache_hits')
+                return cached_response(full_url, meta, body)
+            request_headers.update(cache.validators(meta))
+
+        for attempt in range(self.max_retries + 1):
+            self.count('throttled_seconds', self.bucket_for(host).acquire())
+            self.count('requests')
+            start = time.perf_counter()
+            try:
+                response = session.get(full_url, headers=request_headers, timeout=timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                instrumentation.count('http_network_seconds', time.perf_counter() - start)
+                instrumentation.count('http_connection_errors')
+                if attempt == self.max_retries:
+                    raise
+                self.count('retries')
+                time.sleep(self.retry_delay(attempt))
+                continue
+
+            instrumentation.count('http_network_seconds', time.perf_counter() - start)
+            instrumentation.count(f"http_status_{response.status_code}")
+            if not stream:
+                instrumentation.count('bytes_fetched', len(response.content))
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = self.retry_delay(attempt, response)
+                response.close()
+                self.count('retries')
+                time.sleep(delay)
+                continue
+            break
+
+        if entry is not None and response.status_code == 304:
+            self.count('revalidated')
+            cache.refresh(full_url, meta, response)
+            return cached_response(full_url, meta, body)
+
+        if cache is not None and response.status_code == 200:
+            cache.store(full_url, response)
+
+        return response
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+
+_default_fetcher = None
+_default_lock = threading.Lock()
+
+
+def get_fetcher():
+    """
+    Process-wide Fetcher shared by every scraper
+    The disk cache is enabled by pointing $JOBPREP_HTTP_CACHE at a directory
+    """
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = Fetcher(cache_dir=os.environ.get('JOBPREP_HTTP_CACHE'))
+        return _default_fetcher
+
+
+def set_fetcher(fetcher):
+    """Replace the process-wide Fetcher (benchmarks, alternate configuration)"""
+    global _default_fetcher
+    with _default_lock:
+        previous, _default_fetcher = _default_fetcher, fetcher
+    return previous
+
+
+def fetch(url, **kwargs):
+    """Shortcut for get_fetcher().get(url, ...)"""
+    return get_fetcher().get(url, **kwargs)
@@ -0,0 +1,237 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+# Span events are appended here as JSON lines when the variable is set
+METRICS_PATH_ENV = 'JOBPREP_METRICS'
+
+_current_span = contextvars.ContextVar('jobprep_span', default=None)
+
+# Counters that describe a span's own output rather than work done, so they are
+# not rolled up into the parent: a query's rows, its comments' rows and the
+# stage's deduplicated rows would otherwise be summed into one meaningless total.
+# A span that reports rows counts them itself.
+LOCAL_COUNTERS = frozenset({'rows'})
+
+
+class Span:
+    """
+    A timed unit of work (a stage, a page, a company, a query...)
+
+    Counters recorded while a span is current (bytes fetched, rows, HTTP
+    statuses, retries) are kept on the span itself (`counters`); when it
+    ends, its additive totals are rolled up into its parent's `nested`
+    counters, so a stage span reports the totals of its units next to its
+    own counts. LOCAL_COUNTERS stay on the span that counted them.
+    """
+
+    def __init__(self, name, parent=None, **attrs):
+        self.name = name
+        self.parent = parent
+        self.attrs = attrs
+        self.counters = defaultdict(float)
+        self.nested = defaultdict(float)
+        self.lock = threading.Lock()
+        self.start = None
+        self.seconds = None
+        self.error = None
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.counters[name] += value
+
+    def add_nested(self, counters):
+        with self.lock:
+            for name, value in counters.items():
+                if name not in LOCAL_COUNTERS:
+                    self.nested[name] += value
+
+    def total_counters(self):
+        """Own counters plus everything rolled up from finished child spans"""
+        with self.lock:
+            totals = defaultdict(float, self.nested)
+            for name, value in self.counters.items():
+                totals[name] += value
+            return totals
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def path(self):
+        names = []
+        span = self
+        while span is not None:
+            names.append(span.name)
+            span = span.parent
+        return '/'.join(reversed(names))
+
+    def to_event(self):
+        def rounded(counters):
+            return {name: int(value) if value == int(value) else round(value, 6)
+                    for name, value in counters.items()}
+
+        return {
+            'span': self.name,
+            'path': self.path(),
+            'start': self.start,
+            'seconds': round(self.seconds, 6),
+            'attrs': self.attrs,
+            'counters': rounded(self.total_counters()),
+            'self_counters': rounded(self.counters),
+            'error': self.error
+        }
+
+
+class Recorder:
+    """Collects finished spans: one JSON line per span plus per-name aggregates"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.totals = {}
+        self._file = None
+
+    def record(self, span):
+        event = span.to_event()
+        with self.lock:
+            if self.path:
+                if self._file is None:
+                    self._file = open(self.path, 'a', encoding='utf-8')
+                self._file.write(json.dumps(event, default=str) + '\n')
+                self._file.flush()
+
+            totals = self.totals.setdefault(span.name, {'calls': 0, 'errors': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+                                                        'counters': defaultdict(float),
+                                                        'self_counters': defaultdict(float)})
+            totals['calls'] += 1
+            totals['errors'] += span.error is not None
+            totals['seconds'] += span.seconds
+            totals['max_seconds'] = max(totals['max_seconds'], span.seconds)
+            for name, value in span.total_counters().items():
+                totals['counters'][name] += value
+            for name, value in span.counters.items():
+                totals['self_counters'][name] += value
+
+    def summary_rows(self):
+        with self.lock:
+            return sorted(self.totals.items(), key=lambda item: -item[1]['seconds'])
+
+    def close(self):
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_recorder = Recorder(os.environ.get(METRICS_PATH_ENV))
+
+
+def configure(path=None):
+    """Start a fresh recording, writing JSON lines to `path` (None: summary only)"""
+    global _recorder
+    _recorder.close()
+    _recorder = Recorder(path)
+    return _recorder
+
+
+class span:
+    """
+    Context manager / decorator timing a unit of work
+
+        with span('reddit.query', subreddit=name, query=q) as s:
+            ...
+            s.count('rows', len(rows))
+
+        @span('load.merge')
+        def merge(...): ...
+    """
+
+    def __init__(self, name, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self._stack = []
+
+    def __enter__(self):
+        current = Span(self.name, _current_span.get(), **self.attrs)
+        token = _current_span.set(current)
+        self._stack.append((current, token))
+        current.start = time.time()
+        current._perf_start = time.perf_counter()
+        return current
+
+    def __exit__(self, exc_type, exc, tb):
+        current, token = self._stack.pop()
+        current.seconds = time.perf_counter() - current._perf_start
+        if exc_type is not None:
+            current.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(token)
+
+        if current.parent is not None:
+            current.parent.add_nested(current.total_counters())
+        _recorder.record(current)
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(self.name, **self.attrs):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def current_span():
+    return _current_span.get()
+
+
+def count(name, value=1):
+    """Add to a counter on the current span (no-op outside any span)"""
+    current = _current_span.get()
+    if current is not None:
+        current.count(name, value)
+
+
+def bind(func):
+    """
+    Wrap a callable so it runs inside the caller's current span, e.g. when
+    submitting it to a thread pool (threads don't inherit context variables)
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return context.copy().run(func, *args, **kwargs)
+    return wrapper
+
+
+def _format_count(value):
+    if value >= 10 * 1024 * 1024:
+        return f"{value / (1024 * 1024):.0f}M"
+    if value == int(value):
+        return str(int(value))
+    return f"{value:.2f}"
+
+
+def print_summary(recorder=None):
+    """End-of-run table: calls, total/max wall time and counters per span name"""
+    rows = (recorder or _recorder).summary_rows()
+    if not rows:
+        return
+
+    print("\n" + "="*80)
+    print("TIMING SUMMARY (own counters; [nested: ...] = totals including child spans, where different)")
+    print("="*80)
+    print(f"  {'span':<28} {'calls':>6} {'total s':>9} {'max s':>8}  counters")
+    for name, totals in rows:
+        own = totals['self_counters']
+        counters = ', '.join(f"{key}={_format_count(value)}" for key, value in sorted(own.items()))
+        nested = ', '.join(f"{key}={_format_count(value)}" for key, value in sorted(totals['counters'].items())
+                           if value != own.get(key, 0))
+        if nested:
+            counters = f"{counters} [nested: {nested}]" if counters else f"[nested: {nested}]"
+        errors = f" [{totals['errors']} errors]" if totals['errors'] else ''
+        print(f"  {name:<28} {totals['calls']:>6} {totals['seconds']:>9.2f} "
+              f"{totals['max_seconds']:>8.2f}  {counters}{errors}")
@@ -0,0 +1,71 @@
+import argparse
+import importlib
+import sys
+
+# Only the standard library is imported up front: each subcommand imports
+# its script and calls its main(), so pandas, selenium, duckdb or the Snowflake
+# connector are imported by the one subcommand that needs them
+
+SCRAPERS = {
+    'reddit': 'scrape_reddit_interviews',
+    'github': 'scrape_github_leetcode_final',
+    'gfg': 'scrape_geeksforgeeks_companywise',
+    'interviewbit': 'scrape_interviewbit_coding',
+    'tryexponent': 'scrape_tryexponent'
+}
+
+# command -> (module, description)
+COMMANDS = {
+    'setup': ('setup_snowflake', "create the INTERVIEW_QUESTIONS table"),
+    'load': ('load_to_snowflake', "load a scraped CSV/Parquet file"),
+    'query': ('query_snowflake', "dashboard and company question browser"),
+    'search': ('search_questions', "full-text search over the local question index"),
+    'pipeline': ('run_pipeline', "scrape all sources in parallel, merge and load"),
+    'benchmark': ('run_benchmarks', "benchmark the scrapers, loader and CLI startup")
+}
+
+
+def run_script(module, prog, args):
+    """
+    Call a script's main() with `args` as its command line. The script is
+    imported under its own name (not run as __main__), so functions it
+    hands to process pools pickle by reference to an importable module.
+    """
+    saved_argv = sys.argv
+    # argparse takes the usage line's program name from argv[0]
+    sys.argv = [prog] + list(args)
+    try:
+        importlib.import_module(module).main(list(args))
+    finally:
+        sys.argv = saved_argv
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='jobprep',
+        description="JobPrep AI data tools",
+        epilog="Options after the subcommand go to that script, e.g. 'jobprep load --help'"
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND', required=True)
+
+    # No help/arguments of their own: everything else is forwarded to the script
+    scrape = subparsers.add_parser('scrape', help="run one scraper", add_help=False)
+    scrape.add_argument('source', choices=list(SCRAPERS))
+
+    for name, (_, description) in COMMANDS.items():
+        subparsers.add_parser(name, help=description, add_help=False)
+
+    return parser
+
+
+def main(argv=None):
+    args, script_args = build_parser().parse_known_args(argv)
+
+    if args.command == 'scrape':
+        run_script(SCRAPERS[args.source], f"jobprep scrape {args.source}", script_args)
+    else:
+        run_script(COMMANDS[args.command][0], f"jobprep {args.command}", script_args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,28 @@
-import snowflake.connector
-import pandas as pd
-from snowflake_config import SNOWFLAKE_CONFIG
 import glob
 from datetime import datetime
 import os
+import argparse
+from query_cache import QueryCache
+from storage_backends import get_backend, prepare_records, TABLE_NAME, BACKENDS
+from search_questions import QuestionSearchIndex
+from instrumentation import span, print_summary
+from profiling import add_profile_argument, profile_run
+
+CSV_PATTERNS = [
+    'tryexponent_*.csv',
+    'gfg_companywise_*.csv',
+    'geeksforgeeks_*.csv',
+    'interviewbit_*.csv',
+    'github_*.csv',
+    'reddit_*.csv',
+    'MASTER_*.csv'
+]
 
 def get_latest_csv():
     """Find the most recent interview CSV file (any source)"""
     
-    csv_patterns = [
-        'tryexponent_*.csv',
-        'gfg_companywise_*.csv',
-        'geeksforgeeks_*.csv',
-        'interviewbit_*.csv',
-        'github_*.csv',
-        'reddit_*.csv',
-        'MASTER_*.csv'
-    ]
-    
     all_csv_files = []
-    for pattern in csv_patterns:
+    for pattern in CSV_PATTERNS:
         all_csv_files.extend(glob.glob(pattern))
     
     if not all_csv_files:
@@ -48,11 +51,15 @@ def get_latest_csv():
     return latest_file
 
 
-def load_csv_to_snowflake(csv_file=None):
-    """Load interview CSV data into Snowflake"""
+@span('load')
+def load_csv_to_snowflake(csv_file=None, backend=None):
+    """Load interview CSV data into Snowflake (or another storage backend)"""
+    
+    if backend is None:
+        backend = get_backend()
     
     print("="*80)
-    print("LOADING DATA TO SNOWFLAKE")
+    print(f"LOADING DATA TO {backend.name.upper()}")
     print("="*80)
     
     if csv_file is None:
@@ -60,23 +67,23 @@ def load_csv_to_snowflake(csv_file=None):
         if csv_file is None:
             return False
     
-    print(f"\n[1/6] Reading CSV file: {csv_file}")
+    # Connect first: DuckDB reads the file with its own parallel scanner
+    print(f"\n[1/6] Connecting to {backend.describe()}...")
+    try:
+        backend.connect()
+        print("✓ Connected successfully!")
+    except Exception as e:
+        print(f"✗ Error connecting: {e}")
+        return False
+    
+    print(f"\n[2/6] Reading CSV file: {csv_file}")
     try:
-        df = pd.read_csv(csv_file)
         now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        # Replace NaNs with defaults
-        df = df.fillna({
-            'company_name': 'Unknown',
-            'role_name': 'Software Engineer',
-            'interview_question': '',
-            'difficulty': 'Not Specified',
-            'question_url': '',
-            'source': 'Unknown',
-            'date_collected': now_str
-        })
-        
-        df.drop_duplicates(subset=['company_name','interview_question'], inplace=True)
+        # Replace NaNs with defaults and drop in-file duplicates
+        with span('load.read', file=os.path.basename(csv_file)) as unit:
+            df = prepare_records(backend.read_input(csv_file), now_str)
+            unit.count('rows', len(df))
         
         print(f"✓ Loaded {len(df)} records from CSV")
         print("\nPreview of data:")
@@ -84,74 +91,38 @@ def load_csv_to_snowflake(csv_file=None):
         
     except Exception as e:
         print(f"✗ Error reading CSV: {e}")
+        backend.close()
         return False
     
-    # Connect to Snowflake
-    print("\n[2/6] Connecting to Snowflake...")
     try:
-        conn_params = {
-            'user': SNOWFLAKE_CONFIG['user'],
-            'account': SNOWFLAKE_CONFIG['account'],
-            'warehouse': SNOWFLAKE_CONFIG['warehouse'],
-            'database': SNOWFLAKE_CONFIG['database'],
-            'schema': SNOWFLAKE_CONFIG['schema']
-        }
-        if 'password' in SNOWFLAKE_CONFIG:
-            conn_params['password'] = SNOWFLAKE_CONFIG['password']
-            print("\n⚠️  MFA Required!")
-            mfa_code = input("Enter your MFA/TOTP code: ").strip()
-            if mfa_code:
-                conn_params['passcode'] = mfa_code
-        if 'authenticator' in SNOWFLAKE_CONFIG:
-            conn_params['authenticator'] = SNOWFLAKE_CONFIG['authenticator']
-        
-        conn = snowflake.connector.connect(**conn_params)
-        cursor = conn.cursor()
-        print("✓ Connected successfully!")
-        
         # Check current record count
         print("\n[3/6] Checking current data...")
-        cursor.execute("SELECT COUNT(*) FROM INTERVIEW_QUESTIONS")
-        before_count = cursor.fetchone()[0]
-        print(f"✓ Current records in Snowflake: {before_count}")
+        before_count = backend.count()
+        print(f"✓ Current records in {backend.name}: {before_count}")
         
-        # Prepare data for insertion
-        print("\n[4/6] Preparing data for insertion...")
-        records = [
-            (
-                row.get('company_name', 'Unknown'),
-                row.get('role_name', 'Software Engineer'),
-                row.get('interview_question', ''),
-                row.get('difficulty', 'Not Specified'),
-                row.get('question_url', ''),
-                row.get('source', 'Unknown'),
-                row.get('date_collected', now_str)
-            )
-            for _, row in df.iterrows()
-        ]
-        print(f"✓ Prepared {len(records)} records for insertion")
-        
-        # Step 5: Insert using MERGE to handle duplicates
-        print("\n[5/6] Inserting data into Snowflake (duplicates handled automatically)...")
-        merge_sql = """
-        MERGE INTO INTERVIEW_QUESTIONS tgt
-        USING VALUES (%s, %s, %s, %s, %s, %s, %s) AS src(
-            company_name, role_name, interview_question, difficulty, question_url, source, date_collected
-        )
-        ON tgt.company_name = src.company_name
-           AND tgt.interview_question = src.interview_question
-        WHEN NOT MATCHED THEN
-          INSERT (company_name, role_name, interview_question, difficulty, question_url, source, date_collected)
-          VALUES (src.company_name, src.role_name, src.interview_question, src.difficulty, src.question_url, src.source, src.date_collected);
-        """
-        cursor.executemany(merge_sql, records)
-        conn.commit()
+        # Step 4: Insert using MERGE to handle duplicates
+        print(f"\n[4/6] Inserting {len(df)} records (duplicates handled automatically)...")
+        with span('load.merge', backend=backend.name) as unit:
+            backend.merge_dataframe(df)
+            backend.commit()
+            unit.count('rows', len(df))
         print("✅ All records inserted successfully (duplicates automatically skipped)")
         
+        # New data landed: invalidate cached query results for this table
+        version = QueryCache().bump_table_version(backend.cache_namespace)
+        print(f"✓ Query cache invalidated (table version {version})")
+        
+        # Incrementally add the new rows to the local full-text index
+        with span('load.search_index') as unit:
+            index = QuestionSearchIndex()
+            added = index.add_records(df)
+            index.close()
+            unit.count('rows', added)
+        print(f"✓ Search index updated (+{added} questions)")
+        
         # Verify insertion
-        print("\n[6/6] Verifying insertion...")
-        cursor.execute("SELECT COUNT(*) FROM INTERVIEW_QUESTIONS")
-        after_count = cursor.fetchone()[0]
+        print("\n[5/6] Verifying insertion...")
+        after_count = backend.count()
         inserted_count = after_count - before_count
         print(f"✓ Records before: {before_count}")
         print(f"✓ Records after: {after_count}")
@@ -159,10 +130,10 @@ def load_csv_to_snowflake(csv_file=None):
         
         # Show sample data
         print("\n" + "="*80)
-        print("SAMPLE DATA FROM SNOWFLAKE:")
+        print(f"[6/6] SAMPLE DATA FROM {backend.name.upper()}:")
         print("="*80)
-        cursor.execute("SELECT COMPANY_NAME, DIFFICULTY, INTERVIEW_QUESTION FROM INTERVIEW_QUESTIONS LIMIT 5")
-        for row in cursor.fetchall():
+        rows = backend.fetchall(f"SELECT COMPANY_NAME, DIFFICULTY, INTERVIEW_QUESTION FROM {TABLE_NAME} LIMIT 5")
+        for row in rows:
             print(f"\n{row[0]} [{row[1]}]")
             print(f"  {row[2]}")
         
@@ -170,29 +141,41 @@ def load_csv_to_snowflake(csv_file=None):
         print("\n" + "="*80)
         print("SUMMARY BY COMPANY:")
         print("="*80)
-        cursor.execute("""
+        rows = backend.fetchall(f"""
             SELECT COMPANY_NAME, COUNT(*) as QUESTION_COUNT
-            FROM INTERVIEW_QUESTIONS
+            FROM {TABLE_NAME}
             GROUP BY COMPANY_NAME
             ORDER BY QUESTION_COUNT DESC
         """)
-        for row in cursor.fetchall():
+        for row in rows:
             print(f"{row[0]:<30} {row[1]:>5} questions")
         
         print("\n" + "="*80)
         print("✅ DATA LOADED SUCCESSFULLY!")
         print("="*80)
         
-        cursor.close()
-        conn.close()
+        backend.close()
         return True
     
     except Exception as e:
         print(f"\n✗ Error: {e}")
         import traceback
         traceback.print_exc()
+        backend.close()
         return False
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load scraped interview questions")
+    parser.add_argument('csv_file', nargs='?', help="CSV/Parquet file to load (default: pick interactively)")
+    parser.add_argument('--backend', choices=list(BACKENDS), help="storage backend (default: $JOBPREP_BACKEND or snowflake)")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+    
+    with profile_run('load', enabled=args.profile):
+        load_csv_to_snowflake(args.csv_file, backend=get_backend(args.backend))
+    print_summary()
+
+
 if __name__ == "__main__":
-    load_csv_to_snowflake()
\ No newline at end of file
+    main()
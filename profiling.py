@@ -0,0 +1,212 @@
+import contextlib
+import html
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+DEFAULT_INTERVAL = 0.005
+
+# Leaf frames of threads that are parked rather than working (pool workers
+# waiting for a task, a thread blocked on a future/event, a server loop);
+# dropped by default like py-spy does without --idle
+IDLE_LEAVES = {
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('selectors.py', 'select'),
+    ('queue.py', 'get'),
+    ('thread.py', '_worker')
+}
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for every thread in the process
+
+    A background thread snapshots sys._current_frames() every `interval`
+    seconds and counts each collapsed stack, so overhead stays flat no
+    matter how many calls the job makes (unlike cProfile's per-call hooks).
+    Frames are labelled like py-spy's: "function (file.py:line)", with the
+    line of the function definition so a function is one box per caller.
+    Threads are root frames, so pool workers show up separately.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, include_idle=False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self.started = None
+        self.seconds = None
+
+    @staticmethod
+    def _label(code):
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            code = frame.f_code
+            if not self.include_idle and (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, f"thread-{thread_id}"))
+            self.stacks[';'.join(reversed(stack))] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.seconds = time.perf_counter() - self.started
+
+    def write_collapsed(self, path):
+        """Brendan Gregg / py-spy collapsed format: 'frame;frame;frame count' per line"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def tree(self):
+        """Nested {name, value, children} built from the collapsed stacks"""
+        root = {'name': 'all', 'value': 0, 'children': {}}
+        for stack, count in self.stacks.items():
+            root['value'] += count
+            node = root
+            for frame in stack.split(';'):
+                child = node['children'].get(frame)
+                if child is None:
+                    child = node['children'][frame] = {'name': frame, 'value': 0, 'children': {}}
+                child['value'] += count
+                node = child
+
+        def to_list(node):
+            return {'name': node['name'], 'value': node['value'],
+                    'children': sorted((to_list(child) for child in node['children'].values()),
+                                       key=lambda child: -child['value'])}
+        return to_list(root)
+
+    def write_flamegraph(self, path, title='Profile'):
+        """Self-contained HTML flamegraph (click a frame to zoom, click the root to reset)"""
+        subtitle = (f"{self.samples} samples every {self.interval * 1000:.0f} ms "
+                    f"over {self.seconds:.1f}s wall time")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(FLAMEGRAPH_TEMPLATE
+                    .replace('__TITLE__', html.escape(title))
+                    .replace('__SUBTITLE__', html.escape(subtitle))
+                    .replace('__DATA__', json.dumps(self.tree()).replace('</', '<\\/')))
+
+
+FLAMEGRAPH_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>__TITLE__</title>
+<style>
+body { font: 12px monospace; margin: 16px; }
+#graph { position: relative; width: 100%; }
+.frame { position: absolute; height: 17px; box-sizing: border-box; border: 1px solid #fff;
+         overflow: hidden; white-space: nowrap; cursor: pointer; padding-left: 3px; line-height: 15px; }
+.frame:hover { border-color: #000; }
+#details { height: 1.5em; margin: 8px 0; }
+</style></head>
+<body>
+<h3>__TITLE__</h3>
+<div>__SUBTITLE__</div>
+<div id="details"></div>
+<div id="graph"></div>
+<script>
+const data = __DATA__;
+const graph = document.getElementById('graph');
+const details = document.getElementById('details');
+const ROW = 17;
+
+function depth(node) {
+  return 1 + Math.max(0, ...node.children.map(depth));
+}
+
+function color(name) {
+  let hash = 0;
+  for (const ch of name) hash = (hash * 31 + ch.charCodeAt(0)) | 0;
+  return `hsl(${20 + Math.abs(hash) % 40}, 90%, ${55 + Math.abs(hash >> 8) % 20}%)`;
+}
+
+function render(focus) {
+  graph.innerHTML = '';
+  const rows = depth(focus);
+  graph.style.height = (rows * ROW) + 'px';
+  const width = graph.clientWidth;
+
+  function draw(node, x, level, total) {
+    const w = node.value / total * width;
+    if (w < 0.5) return;
+    const div = document.createElement('div');
+    div.className = 'frame';
+    div.style.left = x + 'px';
+    div.style.width = w + 'px';
+    // Flame orientation: callers at the bottom
+    div.style.top = ((rows - level - 1) * ROW) + 'px';
+    div.style.background = color(node.name);
+    div.textContent = node.name;
+    const pct = (node.value / data.value * 100).toFixed(2);
+    div.title = `${node.name}\\n${node.value} samples (${pct}%)`;
+    div.onmouseover = () => { details.textContent = `${node.name} — ${node.value} samples (${pct}%)`; };
+    div.onclick = () => render(node === focus ? data : node);
+    graph.appendChild(div);
+    let childX = x;
+    for (const child of node.children) {
+      draw(child, childX, level + 1, total);
+      childX += child.value / total * width;
+    }
+  }
+  draw(focus, 0, 0, focus.value);
+}
+
+render(data);
+window.onresize = () => render(data);
+</script>
+</body></html>
+"""
+
+
+def add_profile_argument(parser):
+    parser.add_argument('--profile', action='store_true',
+                        help="sample the run and write a collapsed-stack file and HTML flamegraph")
+
+
+@contextlib.contextmanager
+def profile_run(name, enabled=True, interval=DEFAULT_INTERVAL, directory='.'):
+    """
+    Run the body under the sampling profiler and write
+    profile_<name>_<timestamp>.collapsed / .html into `directory`
+    (the working directory, where the scrapers write their CSVs)
+    """
+    if not enabled:
+        yield None
+        return
+
+    profiler = SamplingProfiler(interval)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        base = os.path.join(directory, f"profile_{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        profiler.write_collapsed(base + '.collapsed')
+        profiler.write_flamegraph(base + '.html', title=f"{name} ({profiler.samples} samples)")
+        print(f"\n✓ Profile: {base}.html ({profiler.samples} samples; collapsed stacks in {base}.collapsed)")
@@ -0,0 +1,124 @@
+import sqlite3
+import hashlib
+import io
+import json
+import re
+import time
+
+DEFAULT_CACHE_PATH = '.query_cache.sqlite'
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+
+class QueryCache:
+    """
+    Local SQLite cache for warehouse query results
+
+    Entries are keyed by normalized SQL + bound parameters + the current
+    version of the table(s) they read. The loader bumps the version after a
+    successful MERGE, so every cached result for that table goes stale at
+    once without having to enumerate entries.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS table_versions (
+                table_name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS query_results (
+                cache_key TEXT PRIMARY KEY,
+                table_name TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                payload BLOB NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def table_version(self, table_name):
+        """Current version number of a table (0 if it was never loaded)"""
+        row = self._conn.execute(
+            "SELECT version FROM table_versions WHERE table_name = ?",
+            (table_name.upper(),)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump_table_version(self, table_name):
+        """Invalidate every cached result for a table; call after new data lands"""
+        table_name = table_name.upper()
+        self._conn.execute("""
+            INSERT INTO table_versions (table_name, version, updated_at)
+            VALUES (?, 1, ?)
+            ON CONFLICT(table_name) DO UPDATE SET
+                version = version + 1,
+                updated_at = excluded.updated_at
+        """, (table_name, time.time()))
+        # Old versions can never be hit again, so drop them right away
+        self._conn.execute("DELETE FROM query_results WHERE table_name = ?", (table_name,))
+        self._conn.commit()
+        return self.table_version(table_name)
+
+    def cache_key(self, sql, params=None, table_name='INTERVIEW_QUESTIONS'):
+        """Hash of normalized SQL, parameters and table version"""
+        normalized_sql = re.sub(r'\s+', ' ', sql).strip()
+        key_parts = {
+            'sql': normalized_sql,
+            'params': params,
+            'table': table_name.upper(),
+            'version': self.table_version(table_name)
+        }
+        encoded = json.dumps(key_parts, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key):
+        """Return the cached DataFrame for a key, or None if missing/expired"""
+        row = self._conn.execute(
+            "SELECT created_at, payload FROM query_results WHERE cache_key = ?",
+            (key,)
+        ).fetchone()
+
+        if row is None or time.time() - row[0] > self.ttl_seconds:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        import pandas as pd
+        return pd.read_parquet(io.BytesIO(row[1]))
+
+    def put(self, key, df, table_name='INTERVIEW_QUESTIONS'):
+        """Store a DataFrame result (as Parquet) under a key"""
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False)
+        self._conn.execute("""
+            INSERT OR REPLACE INTO query_results (cache_key, table_name, created_at, payload)
+            VALUES (?, ?, ?, ?)
+        """, (key, table_name.upper(), time.time(), buffer.getvalue()))
+        self._conn.commit()
+
+    def fetch(self, run_query, sql, params=None, table_name='INTERVIEW_QUESTIONS'):
+        """
+        Return a cached result for (sql, params), or call
+        run_query(sql, params) and cache what it returns
+        """
+        key = self.cache_key(sql, params, table_name)
+        df = self.get(key)
+        if df is None:
+            df = run_query(sql, params)
+            self.put(key, df, table_name)
+        return df
+
+    def purge_expired(self):
+        """Delete entries older than the TTL"""
+        self._conn.execute(
+            "DELETE FROM query_results WHERE created_at < ?",
+            (time.time() - self.ttl_seconds,)
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
@@ -1,123 +1,317 @@
-import snowflake.connector
-import pandas as pd
-from snowflake_config import SNOWFLAKE_CONFIG
+import difflib
+import argparse
+from query_cache import QueryCache
+from storage_backends import get_backend, BACKENDS
+from profiling import add_profile_argument, profile_run
 
-def query_snowflake_data():
+# One statement for every dashboard aggregate: GROUPING SETS computes the
+# total, per-company and per-difficulty counts in a single scan. SECTION
+# tells the client which is which.
+DASHBOARD_REPORT_SQL = """
+    SELECT
+        CASE
+            WHEN GROUPING(COMPANY_NAME) = 1 AND GROUPING(DIFFICULTY) = 1 THEN 'TOTAL'
+            WHEN GROUPING(DIFFICULTY) = 1 THEN 'COMPANY'
+            ELSE 'DIFFICULTY'
+        END AS SECTION,
+        COMPANY_NAME,
+        DIFFICULTY,
+        NULL AS INTERVIEW_QUESTION,
+        COUNT(*) AS COUNT
+    FROM INTERVIEW_QUESTIONS
+    GROUP BY GROUPING SETS ((COMPANY_NAME), (DIFFICULTY), ())
+"""
+
+# Never cached, so each run shows a new sample
+DASHBOARD_SAMPLE_SQL = """
+    SELECT COMPANY_NAME, DIFFICULTY, INTERVIEW_QUESTION
+    FROM INTERVIEW_QUESTIONS
+    {sample}
+"""
+
+# Report and sample in one statement, for when the aggregates aren't cached
+DASHBOARD_REPORT_WITH_SAMPLE_SQL = DASHBOARD_REPORT_SQL + """
+    UNION ALL
+    SELECT 'SAMPLE', COMPANY_NAME, DIFFICULTY, INTERVIEW_QUESTION, NULL
+    FROM (""" + DASHBOARD_SAMPLE_SQL + """)
+"""
+
+
+class QueryRunner:
     """
-    Query and display data from Snowflake
+    Runs queries through the local result cache and only connects to the
+    storage backend (and asks for MFA) on the first cache miss
     """
     
-    print("="*80)
-    print("QUERYING SNOWFLAKE DATA")
-    print("="*80)
+    def __init__(self, backend, cache=None):
+        self.backend = backend
+        self.cache = cache
+        self.connected = False
     
-    try:
-        # Connect
-        print("\nConnecting to Snowflake...")
-        
-        # Build connection parameters dynamically
-        conn_params = {
-            'user': SNOWFLAKE_CONFIG['user'],
-            'account': SNOWFLAKE_CONFIG['account'],
-            'warehouse': SNOWFLAKE_CONFIG['warehouse'],
-            'database': SNOWFLAKE_CONFIG['database'],
-            'schema': SNOWFLAKE_CONFIG['schema']
-        }
+    def query(self, sql, params=None, cached=True):
+        if self.cache is None or not cached:
+            return self._run(sql, params)
+        return self.cache.fetch(self._run, sql, params, table_name=self.backend.cache_namespace)
+    
+    def cached(self, sql, params=None):
+        """Cached result for a query, or None (never runs it)"""
+        if self.cache is None:
+            return None
+        return self.cache.get(self.cache.cache_key(sql, params, self.backend.cache_namespace))
+    
+    def remember(self, sql, df, params=None):
+        """Cache a result obtained some other way (e.g. as part of a larger statement)"""
+        if self.cache is not None:
+            key = self.cache.cache_key(sql, params, self.backend.cache_namespace)
+            self.cache.put(key, df, self.backend.cache_namespace)
+    
+    def _run(self, sql, params=None):
+        if not self.connected:
+            print(f"\nConnecting to {self.backend.describe()}...")
+            self.backend.connect()
+            self.connected = True
+            print("✓ Connected!")
+        return self.backend.query(sql, params)
+    
+    def close(self):
+        if self.connected:
+            self.backend.close()
+            self.connected = False
+        if self.cache is not None:
+            print(f"\nQuery cache: {self.cache.hits} hit(s), {self.cache.misses} miss(es)")
+
+
+def fetch_dashboard_report(runner):
+    """
+    Fetch the dashboard in a single round trip and split it into total
+    count, by-company, by-difficulty and sample sections
+
+    The aggregates are cached, the random sample never is: on a cache miss
+    both come from one statement and the aggregate rows are cached; on a
+    hit the sample is the only query sent.
+    """
+    sample_clause = runner.backend.sample_clause(10)
+    df = runner.cached(DASHBOARD_REPORT_SQL)
+    if df is None:
+        combined = runner.query(DASHBOARD_REPORT_WITH_SAMPLE_SQL.format(sample=sample_clause), cached=False)
+        is_sample = combined['SECTION'] == 'SAMPLE'
+        sample = (
+            combined.loc[is_sample, ['COMPANY_NAME', 'DIFFICULTY', 'INTERVIEW_QUESTION']]
+            .reset_index(drop=True)
+        )
+        df = combined.loc[~is_sample].astype({'COUNT': 'int64'}).reset_index(drop=True)
+        runner.remember(DASHBOARD_REPORT_SQL, df)
+    else:
+        sample = runner.query(DASHBOARD_SAMPLE_SQL.format(sample=sample_clause), cached=False)
+    
+    total = df.loc[df['SECTION'] == 'TOTAL', 'COUNT']
+    
+    by_company = (
+        df.loc[df['SECTION'] == 'COMPANY', ['COMPANY_NAME', 'COUNT']]
+        .sort_values('COUNT', ascending=False)
+        .reset_index(drop=True)
+    )
+    by_difficulty = (
+        df.loc[df['SECTION'] == 'DIFFICULTY', ['DIFFICULTY', 'COUNT']]
+        .sort_values('COUNT', ascending=False)
+        .reset_index(drop=True)
+    )
+    
+    return {
+        'total': int(total.iloc[0]) if len(total) else 0,
+        'by_company': by_company,
+        'by_difficulty': by_difficulty,
+        'sample': sample
+    }
+
+
+DISTINCT_COMPANIES_SQL = """
+    SELECT DISTINCT COMPANY_NAME
+    FROM INTERVIEW_QUESTIONS
+    WHERE COMPANY_NAME IS NOT NULL
+"""
+
+
+def fetch_company_names(runner):
+    """Distinct company names (served from the query cache after the first call)"""
+    df = runner.query(DISTINCT_COMPANIES_SQL)
+    return sorted(df['COMPANY_NAME'].tolist())
+
+
+def resolve_company_names(user_input, company_names, max_matches=5):
+    """
+    Resolve free-text input to canonical company names client-side
+    Exact match wins, then prefix matches, then fuzzy (difflib) matches
+    """
+    needle = user_input.strip().lower()
+    if not needle:
+        return []
+    
+    by_lower = {name.lower(): name for name in company_names}
+    
+    if needle in by_lower:
+        return [by_lower[needle]]
+    
+    prefix_matches = [name for lower, name in by_lower.items() if lower.startswith(needle)]
+    if prefix_matches:
+        return prefix_matches[:max_matches]
+    
+    fuzzy_matches = difflib.get_close_matches(needle, list(by_lower), n=max_matches, cutoff=0.6)
+    return [by_lower[lower] for lower in fuzzy_matches]
+
+
+def search_questions(runner, companies, difficulty=None, role=None, source=None,
+                     after_id=None, page_size=20):
+    """
+    One page of questions for canonical company names, using bound
+    parameters and an equality/IN predicate the warehouse can prune on
+
+    Pagination is keyset-based: pass the last ID of the previous page as
+    after_id to get the next one.
+    """
+    if not companies:
+        import pandas as pd
+        return pd.DataFrame(columns=['ID', 'COMPANY_NAME', 'ROLE_NAME', 'DIFFICULTY',
+                                     'SOURCE', 'INTERVIEW_QUESTION', 'QUESTION_URL'])
+    
+    conditions = [f"COMPANY_NAME IN ({', '.join(['?'] * len(companies))})"]
+    params = list(companies)
+    
+    if difficulty:
+        conditions.append("DIFFICULTY = ?")
+        params.append(difficulty)
+    if role:
+        conditions.append("ROLE_NAME = ?")
+        params.append(role)
+    if source:
+        conditions.append("SOURCE = ?")
+        params.append(source)
+    if after_id is not None:
+        conditions.append("ID > ?")
+        params.append(int(after_id))
+    
+    sql = f"""
+        SELECT ID, COMPANY_NAME, ROLE_NAME, DIFFICULTY, SOURCE, INTERVIEW_QUESTION, QUESTION_URL
+        FROM INTERVIEW_QUESTIONS
+        WHERE {' AND '.join(conditions)}
+        ORDER BY ID
+        LIMIT {int(page_size)}
+    """
+    return runner.query(sql, tuple(params))
+
+
+def browse_company_questions(runner, page_size=20):
+    """Interactive company search with optional filters and paging"""
+    
+    user_input = input("Enter company name to see questions (or press Enter to skip): ").strip()
+    if not user_input:
+        return
+    
+    companies = resolve_company_names(user_input, fetch_company_names(runner))
+    if not companies:
+        print(f"\nNo company matching '{user_input}'")
+        return
+    print(f"✓ Matched: {', '.join(companies)}")
+    
+    difficulty = input("Difficulty (Easy/Medium/Hard, Enter for all): ").strip() or None
+    if difficulty and difficulty.lower() in ['easy', 'medium', 'hard']:
+        difficulty = difficulty.capitalize()
+    role = input("Role (Enter for all): ").strip() or None
+    source = input("Source (Enter for all): ").strip() or None
+    
+    after_id = None
+    while True:
+        df = search_questions(runner, companies, difficulty=difficulty, role=role,
+                              source=source, after_id=after_id, page_size=page_size)
         
-        # Add password if it exists
-        if 'password' in SNOWFLAKE_CONFIG:
-            conn_params['password'] = SNOWFLAKE_CONFIG['password']
-            
-            # Ask for MFA code if password authentication is being used
-            print("\n⚠️  MFA Required!")
-            mfa_code = input("Enter your MFA/TOTP code from your authenticator app: ").strip()
-            if mfa_code:
-                conn_params['passcode'] = mfa_code
+        if len(df) == 0:
+            if after_id is None:
+                print(f"\nNo questions found for {', '.join(companies)}")
+            break
         
-        # Add authenticator if it exists (for externalbrowser)
-        if 'authenticator' in SNOWFLAKE_CONFIG:
-            conn_params['authenticator'] = SNOWFLAKE_CONFIG['authenticator']
+        print(f"\n{', '.join(companies)} Questions:")
+        print("="*80)
+        for row in df.itertuples(index=False):
+            print(f"\n[{row.DIFFICULTY}] {row.INTERVIEW_QUESTION}  ({row.COMPANY_NAME})")
         
-        conn = snowflake.connector.connect(**conn_params)
+        if len(df) < page_size:
+            break
         
-        print("✓ Connected!")
+        after_id = int(df['ID'].iloc[-1])
+        if input("\nShow next page? (y/N): ").strip().lower() != 'y':
+            break
+
+
+def query_snowflake_data(use_cache=True, backend=None):
+    """
+    Query and display data from Snowflake (or another storage backend)
+    Results are served from the local query cache until the loader
+    brings in new data (or the TTL expires)
+    """
+    
+    if backend is None:
+        backend = get_backend()
+    
+    print("="*80)
+    print(f"QUERYING {backend.name.upper()} DATA")
+    print("="*80)
+    
+    runner = QueryRunner(backend, QueryCache() if use_cache else None)
+    
+    try:
+        # Dashboard report: every aggregate plus the sample in one round trip
+        report = fetch_dashboard_report(runner)
         
         # Total count
         print("\n" + "="*80)
         print("TOTAL RECORDS")
         print("="*80)
-        
-        df = pd.read_sql("SELECT COUNT(*) as TOTAL FROM INTERVIEW_QUESTIONS", conn)
-        print(f"Total questions in database: {df['TOTAL'][0]}")
+        print(f"Total questions in database: {report['total']}")
         
         # By company
         print("\n" + "="*80)
         print("QUESTIONS BY COMPANY")
         print("="*80)
-        
-        df = pd.read_sql("""
-            SELECT COMPANY_NAME, COUNT(*) as COUNT
-            FROM INTERVIEW_QUESTIONS
-            GROUP BY COMPANY_NAME
-            ORDER BY COUNT DESC
-        """, conn)
-        print(df.to_string(index=False))
+        print(report['by_company'].to_string(index=False))
         
         # By difficulty
         print("\n" + "="*80)
         print("QUESTIONS BY DIFFICULTY")
         print("="*80)
-        
-        df = pd.read_sql("""
-            SELECT DIFFICULTY, COUNT(*) as COUNT
-            FROM INTERVIEW_QUESTIONS
-            GROUP BY DIFFICULTY
-            ORDER BY COUNT DESC
-        """, conn)
-        print(df.to_string(index=False))
+        print(report['by_difficulty'].to_string(index=False))
         
         # Sample questions
         print("\n" + "="*80)
         print("SAMPLE QUESTIONS (Random 10)")
         print("="*80)
         
-        df = pd.read_sql("""
-            SELECT COMPANY_NAME, DIFFICULTY, INTERVIEW_QUESTION
-            FROM INTERVIEW_QUESTIONS
-            SAMPLE (10 ROWS)
-        """, conn)
-        
-        for idx, row in df.iterrows():
-            print(f"\n{row['COMPANY_NAME']} [{row['DIFFICULTY']}]:")
-            print(f"  {row['INTERVIEW_QUESTION']}")
+        for row in report['sample'].itertuples(index=False):
+            print(f"\n{row.COMPANY_NAME} [{row.DIFFICULTY}]:")
+            print(f"  {row.INTERVIEW_QUESTION}")
         
         # Search by company
         print("\n" + "="*80)
-        company = input("Enter company name to see questions (or press Enter to skip): ").strip()
-        
-        if company:
-            df = pd.read_sql(f"""
-                SELECT DIFFICULTY, INTERVIEW_QUESTION
-                FROM INTERVIEW_QUESTIONS
-                WHERE UPPER(COMPANY_NAME) LIKE UPPER('%{company}%')
-                LIMIT 20
-            """, conn)
-            
-            if len(df) > 0:
-                print(f"\n{company} Questions:")
-                print("="*80)
-                for idx, row in df.iterrows():
-                    print(f"\n[{row['DIFFICULTY']}] {row['INTERVIEW_QUESTION']}")
-            else:
-                print(f"\nNo questions found for {company}")
-        
-        conn.close()
+        browse_company_questions(runner)
         
     except Exception as e:
         print(f"\n✗ Error: {e}")
         import traceback
         traceback.print_exc()
+    
+    finally:
+        runner.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query interview questions")
+    parser.add_argument('--backend', choices=list(BACKENDS), help="storage backend (default: $JOBPREP_BACKEND or snowflake)")
+    parser.add_argument('--no-cache', action='store_true', help="bypass the local query cache")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+    
+    with profile_run('query', enabled=args.profile):
+        query_snowflake_data(use_cache=not args.no_cache, backend=get_backend(args.backend))
 
 
 if __name__ == "__main__":
-    query_snowflake_data()
\ No newline at end of file
+    main()
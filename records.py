@@ -0,0 +1,155 @@
+from array import array
+from datetime import datetime
+import time
+from storage_backends import COLUMNS, column_defaults
+
+# Low-cardinality labels: stored once per distinct value, one small code per row
+CATEGORY_COLUMNS = ['company_name', 'role_name', 'difficulty', 'source']
+
+# Free text: Arrow string arrays (one contiguous buffer, no object per row)
+TEXT_COLUMNS = ['interview_question', 'question_url']
+
+
+def text_dtype():
+    import pandas as pd
+    return pd.StringDtype('pyarrow')
+
+
+def repeated_category(value, rows):
+    """A column holding the same label on every row: one category, a one-byte code per row"""
+    import numpy as np
+    import pandas as pd
+    categories = pd.DatetimeIndex([value]) if isinstance(value, datetime) else [value]
+    return pd.Categorical.from_codes(np.zeros(rows, dtype=np.int8), categories=categories)
+
+
+def batch_timestamps(collected_at, rows):
+    """date_collected for a batch collected at `collected_at` (seconds since the epoch)"""
+    return repeated_category(datetime.fromtimestamp(collected_at), rows)
+
+
+class QuestionRecords:
+    """
+    Column-wise builder for one scrape's question rows
+
+    Company, role, difficulty and source are interned as rows arrive, so
+    each row costs a few int32 codes instead of a dict of repeated strings;
+    question and URL text become Arrow string arrays, and the whole batch
+    shares a single collection timestamp (seconds since the epoch).
+    """
+
+    def __init__(self, source=None, role_name=None, collected_at=None):
+        defaults = column_defaults()
+        self.defaults = {column: defaults[column] for column in CATEGORY_COLUMNS}
+        if source is not None:
+            self.defaults['source'] = source
+        if role_name is not None:
+            self.defaults['role_name'] = role_name
+        self.collected_at = int(collected_at if collected_at is not None else time.time())
+        self.categories = {column: {} for column in CATEGORY_COLUMNS}
+        self.codes = {column: array('i') for column in CATEGORY_COLUMNS}
+        self.text = {column: [] for column in TEXT_COLUMNS}
+        # Rows already handed out by take_new()
+        self.taken = 0
+
+    def __len__(self):
+        return len(self.text['interview_question'])
+
+    def append(self, company_name, interview_question, question_url='', difficulty=None,
+               role_name=None, source=None):
+        labels = (('company_name', company_name), ('role_name', role_name),
+                  ('difficulty', difficulty), ('source', source))
+        for column, value in labels:
+            if not value:
+                value = self.defaults[column]
+            table = self.categories[column]
+            code = table.get(value)
+            if code is None:
+                code = table[value] = len(table)
+            self.codes[column].append(code)
+        self.text['interview_question'].append(interview_question)
+        self.text['question_url'].append(question_url or '')
+
+    def extend(self, rows):
+        """Add row dicts (as the page/parse helpers return them); their date_collected is ignored"""
+        for row in rows:
+            self.append(row['company_name'], row['interview_question'], row.get('question_url'),
+                        row.get('difficulty'), row.get('role_name'), row.get('source'))
+
+    def to_frame(self, start=0):
+        """DataFrame in the shared column order, with compact dtypes (rows from `start` on)"""
+        import numpy as np
+        import pandas as pd
+
+        rows = max(0, len(self) - start)
+        columns = {}
+        for column in COLUMNS:
+            if column in CATEGORY_COLUMNS:
+                codes = np.frombuffer(self.codes[column], dtype=np.int32)[start:] if rows else np.zeros(0, np.int32)
+                columns[column] = pd.Categorical.from_codes(codes, categories=list(self.categories[column]))
+            elif column in TEXT_COLUMNS:
+                columns[column] = pd.array(self.text[column][start:], dtype=text_dtype())
+            else:
+                columns[column] = batch_timestamps(self.collected_at, rows)
+        return pd.DataFrame(columns)
+
+    def take_new(self):
+        """Rows added since the last call as a frame (None if there are none), for streaming them out"""
+        if len(self) == self.taken:
+            return None
+        df = self.to_frame(start=self.taken)
+        self.taken = len(self)
+        return df
+
+
+def compact_frame(df):
+    """
+    Convert question rows read from a CSV (or built from dicts) to the
+    compact dtypes: categorical labels and collection timestamps, Arrow text
+    """
+    import pandas as pd
+
+    df = df.copy()
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    for column in TEXT_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype(text_dtype())
+
+    if 'date_collected' in df.columns:
+        dates = df['date_collected'].astype('category')
+        if not isinstance(dates.cat.categories, pd.DatetimeIndex):
+            # Parse each distinct timestamp once, not every row
+            try:
+                dates = dates.cat.rename_categories(pd.to_datetime(dates.cat.categories))
+            except (ValueError, TypeError):
+                pass
+        df['date_collected'] = dates
+    return df
+
+
+def concat_records(frames):
+    """pd.concat for compact frames, keeping label columns categorical (unioning their categories)"""
+    import pandas as pd
+    from pandas.api.types import union_categoricals
+
+    df = pd.concat(frames, ignore_index=True)
+    for column in CATEGORY_COLUMNS + ['date_collected']:
+        if column not in df.columns or isinstance(df[column].dtype, pd.CategoricalDtype):
+            continue
+        parts = [frame[column] for frame in frames if column in frame.columns]
+        if len(parts) == len(frames) and all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            try:
+                df[column] = union_categoricals(parts, ignore_order=True)
+                continue
+            except TypeError:
+                # e.g. parsed timestamps in one file, unparseable strings in another
+                pass
+        df[column] = df[column].astype('category')
+    return df
+
+
+def memory_bytes(df):
+    """Deep in-memory size of a DataFrame (string payloads and category tables included)"""
+    return int(df.memory_usage(deep=True, index=False).sum())
@@ -0,0 +1,37 @@
+import json
+from scrape_reddit_interviews import extract_company_conservative, extract_technical_questions
+
+
+def extract_dump_batch(lines, subreddits):
+    """
+    Process-pool worker: parse prefiltered dump lines and run the company /
+    question extractors; returns ([(company, question, permalink, subreddit)], records parsed)
+    """
+    wanted = {name.lower(): name for name in subreddits}
+    found = []
+    parsed = 0
+    for line in lines:
+        try:
+            item = json.loads(line)
+        except ValueError:
+            continue
+        subreddit = wanted.get(str(item.get('subreddit', '')).lower())
+        if subreddit is None:
+            continue
+        parsed += 1
+        
+        if 'body' in item:
+            # Comment: no title; link_id is 't3_<post id>'
+            title, text = '', item.get('body') or ''
+            permalink = item.get('permalink') or (
+                f"/r/{subreddit}/comments/{str(item.get('link_id', ''))[3:]}/_/{item.get('id', '')}/")
+        else:
+            title, text = item.get('title') or '', item.get('selftext') or ''
+            permalink = item.get('permalink') or f"/r/{subreddit}/comments/{item.get('id', '')}/"
+        
+        company = extract_company_conservative(title, text)
+        if company == 'SKIP':
+            continue
+        for q in extract_technical_questions(title, text):
+            found.append((company, q, permalink, subreddit))
+    return found, parsed
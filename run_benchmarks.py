@@ -0,0 +1,1257 @@
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+import instrumentation
+from http_fetch import Fetcher, set_fetcher
+
+FIXTURES_DIR = 'benchmark_fixtures'
+RESULTS_PATH = 'benchmark_results.jsonl'
+
+# Live hosts whose responses are served from fixtures during a benchmark
+FIXTURE_HOSTS = [
+    'www.reddit.com', 'api.github.com', 'github.com', 'raw.githubusercontent.com', 'codeload.github.com',
+    'www.geeksforgeeks.org', 'practice.geeksforgeeks.org',
+    'www.tryexponent.com', 'www.interviewbit.com'
+]
+
+# source -> (module, function, kwargs, span that marks one unit of work)
+SCRAPER_BENCHMARKS = {
+    'reddit': ('scrape_reddit_interviews', 'scrape_reddit_technical_questions', {}, 'reddit.query'),
+    'github': ('scrape_github_leetcode_final', 'scrape_github_leetcode_raw', {}, 'github.company'),
+    'github-archive': ('scrape_github_leetcode_final', 'scrape_github_leetcode_archive', {'force': True}, 'github.company'),
+    'gfg': ('scrape_geeksforgeeks_companywise', 'scrape_geeksforgeeks_correct', {'crawl': True}, 'gfg.parse'),
+    'tryexponent': ('scrape_tryexponent', 'scrape_tryexponent_updated', {}, 'tryexponent.page'),
+    'interviewbit': ('scrape_interviewbit_coding', 'scrape_interviewbit_complete', {}, 'interviewbit.scroll')
+}
+
+BROWSER_SOURCES = {'tryexponent', 'interviewbit'}
+
+# Pages served for TryExponent in a benchmark run (the live site has ~221)
+TRYEXPONENT_FIXTURE_PAGES = 6
+
+# Question pages behind the TryExponent listing fixtures (20 per page)
+TRYEXPONENT_QUESTION_URL = 'https://www.tryexponent.com/questions/{0}/design-{0}'
+
+# InterviewBit problem tiles in the listing fixture, and their problem pages
+INTERVIEWBIT_FIXTURE_PROBLEMS = 300
+INTERVIEWBIT_PROBLEM_URL = 'https://www.interviewbit.com/problems/p-{0}/'
+
+# Rows per put() in the streaming loader benchmark (about one scraper query/page)
+STREAM_CHUNK_ROWS = 500
+
+
+def fixture_path(directory, url):
+    """File that holds the recorded response for a URL (query strings are hashed)"""
+    parts = urlsplit(url)
+    path = parts.path.strip('/') or 'index'
+    if parts.query:
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        path += '__' + hashlib.sha1(query.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(directory, parts.netloc, *path.split('/'))
+
+
+# ----------------------------------------------------------------------
+# Fixture server
+# ----------------------------------------------------------------------
+
+class FixtureServer:
+    """
+    Local HTTP server replaying recorded responses
+
+    Requests arrive as /<original host>/<path>?<query>, which is what the
+    Fetcher url_overrides and the patched browser URLs point at.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        fixtures = directory
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                host, _, rest = self.path.lstrip('/').partition('/')
+                path = fixture_path(fixtures, f"https://{host}/{rest}")
+                try:
+                    with open(path, 'rb') as f:
+                        body = f.read()
+                except OSError:
+                    self.send_error(404)
+                    return
+
+                if rest.split('?')[0].endswith('.json') or body[:1] in (b'{', b'['):
+                    content_type = 'application/json'
+                elif rest.split('?')[0].endswith('.csv'):
+                    content_type = 'text/csv; charset=utf-8'
+                else:
+                    content_type = 'text/html; charset=utf-8'
+                # Strong validator so conditional GETs can be answered with 304
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-store')
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            # The default backlog of 5 drops connects from concurrent
+            # crawlers, which then stall for a SYN retransmit
+            request_queue_size = 128
+
+        self.server = Server(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def url_for(self, url):
+        parts = urlsplit(url)
+        local = f"{self.base_url}/{parts.netloc}{parts.path}"
+        return local + (f"?{parts.query}" if parts.query else '')
+
+    def url_overrides(self):
+        return {f"https://{host}": f"{self.base_url}/{host}" for host in FIXTURE_HOSTS}
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# ----------------------------------------------------------------------
+# Fixtures: recorded from the live sites, or synthetic
+# ----------------------------------------------------------------------
+
+class RecordingFetcher(Fetcher):
+    """Fetcher that saves every successful response body as a fixture"""
+
+    def __init__(self, directory, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = directory
+
+    def get(self, url, params=None, **kwargs):
+        response = super().get(url, params=params, **kwargs)
+        if response.status_code == 200:
+            path = fixture_path(self.directory, response.url)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(response.content)
+            if kwargs.get('stream'):
+                # .content drained the stream; hand the caller a replay of it
+                response.raw = io.BytesIO(response.content)
+        return response
+
+
+def record_browser_pages(directory, urls, scrolls=0):
+    """Save the rendered DOM of browser-only pages (scrolling first to trigger lazy loading)"""
+    from browser_pool import BrowserPool
+
+    with BrowserPool(size=1, block_stylesheets=False) as pool:
+        with pool.lease() as driver:
+            for url in urls:
+                driver.get(url)
+                time.sleep(5)
+                for _ in range(scrolls):
+                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                    time.sleep(2)
+                path = fixture_path(directory, url)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(driver.page_source)
+                print(f"  ✓ {url}")
+
+
+def record_fixtures(directory, sources):
+    """Run the HTTP scrapers live through a RecordingFetcher; render the browser pages"""
+    print(f"\nRecording fixtures into {directory}/ ...")
+    directory = os.path.abspath(directory)
+    previous = set_fetcher(RecordingFetcher(directory))
+    workdir = tempfile.mkdtemp(prefix='jobprep_record_')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        for source in sources:
+            if source in BROWSER_SOURCES:
+                continue
+            module_name, function_name, kwargs, _ = SCRAPER_BENCHMARKS[source]
+            print(f"  ▶ {source}")
+            getattr(__import__(module_name), function_name)(**kwargs)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+        set_fetcher(previous)
+
+    if 'tryexponent' in sources:
+        import scrape_tryexponent
+        urls = [scrape_tryexponent.BASE_URL.format(page) for page in range(1, TRYEXPONENT_FIXTURE_PAGES + 1)]
+        record_browser_pages(directory, urls)
+    if 'interviewbit' in sources:
+        import scrape_interviewbit_coding
+        record_browser_pages(directory, [scrape_interviewbit_coding.INTERVIEWBIT_URL], scrolls=30)
+
+
+SYNTHETIC_COMPANIES = [
+    'Google', 'Amazon', 'Microsoft', 'Facebook', 'Apple', 'Netflix', 'Adobe', 'Uber',
+    'Airbnb', 'Stripe', 'Bloomberg', 'Oracle', 'Salesforce', 'Nvidia', 'Intuit',
+    'Visa', 'Spotify', 'Snowflake', 'Databricks', 'Coinbase', 'Pinterest', 'Shopify',
+    'Qualcomm', 'Cisco', 'Paypal', 'Walmart', 'Flipkart', 'Samsung', 'Twitter', 'Lyft'
+]
+
+SYNTHETIC_TOPICS = [
+    'an LRU cache', 'a rate limiter', 'a trie for autocomplete', 'a min heap',
+    'a URL shortener', 'merge of k sorted lists', 'binary search on a rotated array',
+    'a graph cycle detector', 'a consistent hash ring', 'a matrix spiral traversal',
+    'an interval merge', 'a top-k frequent elements finder'
+]
+
+
+def _question(i):
+    topic = SYNTHETIC_TOPICS[i % len(SYNTHETIC_TOPICS)]
+    return f"What is the fastest way to implement {topic}, variant {i}?"
+
+
+def _write(directory, url, content):
+    path = fixture_path(directory, url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    mode = 'wb' if isinstance(content, bytes) else 'w'
+    with open(path, mode, **({} if mode == 'wb' else {'encoding': 'utf-8'})) as f:
+        f.write(content)
+
+
+def make_synthetic_browser_fixtures(directory, rng, scale, tryexponent_url, interviewbit_url):
+    """TryExponent listing pages and the InterviewBit problem list"""
+    # TryExponent listing pages
+    q = 0
+    for page in range(1, TRYEXPONENT_FIXTURE_PAGES + 1):
+        items = []
+        for _ in range(20):
+            companies = rng.sample(SYNTHETIC_COMPANIES, 2)
+            links = ''.join(f'<a href="https://www.tryexponent.com/questions?company={c.lower()}">{c}</a>'
+                            for c in companies)
+            items.append(f'<li><a href="{TRYEXPONENT_QUESTION_URL.format(q)}">'
+                         f'Design a scalable notification service, take {q}</a>{links} Software Engineer</li>')
+            q += 1
+        _write(directory, tryexponent_url.format(page), f"<html><body><ul>{''.join(items)}</ul></body></html>")
+
+    # InterviewBit problem tiles (all rendered up front)
+    tiles = []
+    for i in range(INTERVIEWBIT_FIXTURE_PROBLEMS * scale):
+        company = rng.choice(['amazon', 'google', 'microsoft', 'adobe', 'uber'])
+        difficulty = rng.choice(['easy', 'medium', 'hard'])
+        tiles.append(f'<div class="pl-problem-tile"><a class="pl-problem-tile__statement" '
+                     f'href="{INTERVIEWBIT_PROBLEM_URL.format(i)}">Problem statement {i}</a>'
+                     f'<span class="difficulty-level-{difficulty}">{difficulty}</span>'
+                     f'<span class="ib-company-sprites ib-{company}"></span></div>')
+    _write(directory, interviewbit_url, f"<html><body>{''.join(tiles)}</body></html>")
+
+
+def _reddit_comment(subreddit, post_id, comment_id, body, replies=None):
+    return {'kind': 't1', 'data': {
+        'id': comment_id,
+        'body': body,
+        'permalink': f"/r/{subreddit}/comments/{post_id}/post/{comment_id}/",
+        'replies': {'kind': 'Listing', 'data': {'children': replies}} if replies else ''
+    }}
+
+
+def _write_reddit_comments(directory, subreddit, post_id, n):
+    """Comment page for one post: 4 threads of 3 nested replies, then 6 comments behind a 'more' stub"""
+    import requests
+    threads = []
+    for t in range(4):
+        reply = None
+        for depth in reversed(range(3)):
+            i = n * 100 + t * 10 + depth
+            body = (f"They asked me {_question(i)[0].lower()}{_question(i)[1:]} Took me a while."
+                    if depth != 1 else "Same here, good luck everyone!")
+            reply = _reddit_comment(subreddit, post_id, f"c{i:x}", body, [reply] if reply else None)
+        threads.append(reply)
+    more_ids = [f"m{n * 100 + k:x}" for k in range(6)]
+    threads.append({'kind': 'more', 'data': {'count': len(more_ids), 'children': more_ids}})
+    _write(directory, f'https://www.reddit.com/comments/{post_id}.json?limit=500&raw_json=1',
+           json.dumps([{'data': {'children': []}}, {'data': {'children': threads}}]))
+
+    things = [_reddit_comment(subreddit, post_id, more_id, f"Second round: how would you design {SYNTHETIC_TOPICS[k % len(SYNTHETIC_TOPICS)]} at scale?")
+              for k, more_id in enumerate(more_ids)]
+    url = requests.Request('GET', 'https://www.reddit.com/api/morechildren.json', params={
+        'api_type': 'json', 'link_id': f't3_{post_id}', 'children': ','.join(more_ids),
+        'limit_children': 'false', 'raw_json': 1
+    }).prepare().url
+    _write(directory, url, json.dumps({'json': {'data': {'things': things}}}))
+
+
+def make_synthetic_fixtures(directory, seed=0, scale=1):
+    """
+    Deterministic fixtures shaped like each site's responses, for machines
+    without recorded ones (numbers are comparable between synthetic runs only)
+    """
+    import requests
+    rng = random.Random(seed)
+    print(f"\nWriting synthetic fixtures into {directory}/ ...")
+
+    # Reddit search JSON: 50 posts per subreddit/query, and for each post a
+    # comment page (nested replies plus a 'more' stub) and its morechildren expansion
+    from scrape_reddit_interviews import SUBREDDITS, SEARCH_QUERIES
+    n = 0
+    for subreddit in SUBREDDITS:
+        for query in SEARCH_QUERIES:
+            posts = []
+            for _ in range(50):
+                company = rng.choice(SYNTHETIC_COMPANIES)
+                post_id = f"{n:06x}"
+                posts.append({'data': {
+                    'id': post_id,
+                    'title': f"{company} onsite interview experience",
+                    'selftext': f"I was asked in the phone screen. {_question(n)}\n"
+                                f"Follow-up: what is the time complexity of the search step?",
+                    'permalink': f"/r/{subreddit}/comments/{post_id}/post/"
+                }})
+                _write_reddit_comments(directory, subreddit, post_id, n)
+                n += 1
+            url = requests.Request('GET', f'https://www.reddit.com/r/{subreddit}/search.json', params={
+                'q': query, 'restrict_sr': 'true', 'sort': 'relevance', 'limit': 50, 't': 'all'
+            }).prepare().url
+            _write(directory, url, json.dumps({'data': {'children': posts}}))
+
+    # GitHub: repo contents listing + one all.csv per company, and the same
+    # files as a codeload tarball behind the branch-head SHA
+    repo = 'snehasishroy/leetcode-companywise-interview-questions'
+    sha = hashlib.sha1(f"synthetic-{seed}-{scale}".encode('utf-8')).hexdigest()
+    folders = [f"{company.lower()}-{i}" for i in range(2 * scale) for company in SYNTHETIC_COMPANIES]
+    contents = [{'name': name, 'type': 'dir'} for name in folders] + [{'name': 'README.md', 'type': 'file'}]
+    _write(directory, f'https://api.github.com/repos/{repo}/contents', json.dumps(contents))
+    _write(directory, f'https://api.github.com/repos/{repo}/commits/master', sha)
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode='w:gz') as tar:
+        for folder in folders:
+            lines = ['ID,URL,Title,Difficulty,Acceptance %,Frequency %']
+            for i in range(150):
+                difficulty = rng.choice(['EASY', 'MEDIUM', 'HARD'])
+                lines.append(f'{i},https://leetcode.com/problems/problem-{i},Problem {folder} {i},{difficulty},50.0%,{rng.random() * 100:.1f}%')
+            body = ('\n'.join(lines) + '\n').encode('utf-8')
+            _write(directory, f'https://raw.githubusercontent.com/{repo}/master/{folder}/all.csv', body)
+            member = tarfile.TarInfo(f"{repo.split('/')[1]}-{sha}/{folder}/all.csv")
+            member.size = len(body)
+            tar.addfile(member, io.BytesIO(body))
+    _write(directory, f'https://codeload.github.com/{repo}/tar.gz/{sha}', archive.getvalue())
+
+    # GFG article: company headings, difficulty labels, question links, listing links
+    from scrape_geeksforgeeks_companywise import GFG_URL
+    sections = []
+    q = 0
+    for company in SYNTHETIC_COMPANIES:
+        slug = company.lower()
+        sections.append(f"<h2>{company} Interview Coding Questions</h2>")
+        sections.append(f'<p>See also <a href="https://www.geeksforgeeks.org/company/{slug}/">{company} archive</a></p>')
+        for label in ['Easy:', 'Medium:', 'Hard:']:
+            sections.append(f"<p>{label}</p><ul>")
+            for _ in range(10 * scale):
+                sections.append(f'<li><a href="https://www.geeksforgeeks.org/problems/question-{q}/1">'
+                                f'Question number {q} on arrays</a></li>')
+                q += 1
+            sections.append("</ul>")
+        # Listing page reached by the crawler
+        items = ''.join(
+            f'<li><a href="https://www.geeksforgeeks.org/problems/{slug}-listed-{i}/1">Listed {company} problem {i}</a></li>'
+            for i in range(40 * scale)
+        )
+        _write(directory, f'https://www.geeksforgeeks.org/company/{slug}/',
+               f"<html><body><main><ul>{items}</ul></main></body></html>")
+    footer = ''.join(f'<a href="https://www.geeksforgeeks.org/{word}/">{word.title()}</a>'
+                     for word in ['about', 'careers', 'privacy-policy', 'contact-us'])
+    _write(directory, GFG_URL, f"<html><body><header>Nav</header><article>{''.join(sections)}</article>"
+                               f"<footer>{footer}</footer></body></html>")
+
+    # TryExponent question pages (plain HTTP, read by the detail enrichment)
+    for q in range(TRYEXPONENT_FIXTURE_PAGES * 20):
+        question = {'id': q, 'difficulty': rng.choice(['EASY', 'MEDIUM', 'HARD']),
+                    'questionType': rng.choice(['System Design', 'Coding', 'Behavioral']),
+                    'tags': [{'name': topic} for topic in rng.sample(SYNTHETIC_TOPICS, 3)],
+                    'askedAt': f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T00:00:00Z"}
+        answers = ''.join(f"<p>Answer {i}: {_question(q + i)}</p>" for i in range(20))
+        data = json.dumps({'props': {'pageProps': {'question': question}}})
+        _write(directory, TRYEXPONENT_QUESTION_URL.format(q),
+               f'<html><body><h1>Design a scalable notification service, take {q}</h1>{answers}'
+               f'<script id="__NEXT_DATA__" type="application/json">{data}</script></body></html>')
+
+    # InterviewBit problem pages: topic links and every company that asked it
+    ib_topics = ['arrays', 'strings', 'hashing', 'two-pointers', 'dynamic-programming', 'graph-data-structure-algorithms']
+    for i in range(INTERVIEWBIT_FIXTURE_PROBLEMS * scale):
+        difficulty = rng.choice(['easy', 'medium', 'hard'])
+        topics = ''.join(f'<a href="https://www.interviewbit.com/courses/programming/{topic}/">{topic.replace("-", " ").title()}</a>'
+                         for topic in rng.sample(ib_topics, 2))
+        companies = ''.join(f'<span class="ib-company-sprites ib-{company.lower()}"></span>'
+                            for company in rng.sample(SYNTHETIC_COMPANIES, rng.randint(1, 8)))
+        statement = ''.join(f"<p>{_question(i + j)}</p>" for j in range(10))
+        _write(directory, INTERVIEWBIT_PROBLEM_URL.format(i),
+               f'<html><body><h1>Problem statement {i}</h1><span class="difficulty-level-{difficulty}">{difficulty}</span>'
+               f'{statement}<div class="p-topics">{topics}</div><div class="asked-in">Asked In: {companies}</div></body></html>')
+
+    # Browser-only pages; their URLs live in the selenium scraper modules
+    try:
+        import scrape_tryexponent
+        import scrape_interviewbit_coding
+    except ImportError as e:
+        print(f"  (skipping TryExponent/InterviewBit fixtures: {e.name} not installed)")
+    else:
+        make_synthetic_browser_fixtures(directory, rng, scale,
+                                        scrape_tryexponent.BASE_URL,
+                                        scrape_interviewbit_coding.INTERVIEWBIT_URL)
+
+    with open(os.path.join(directory, 'SYNTHETIC'), 'w', encoding='utf-8') as f:
+        f.write(f"seed={seed} scale={scale}\n")
+
+
+# ----------------------------------------------------------------------
+# Benchmarks
+# ----------------------------------------------------------------------
+
+def _summarize_spans(recorder, stage_span, unit_span, wall):
+    stage = recorder.totals.get(stage_span, {'counters': {}})
+    unit = recorder.totals.get(unit_span, {'calls': 0, 'seconds': 0.0, 'counters': {}})
+    counters = stage['counters']
+    rows = counters.get('rows', 0)
+    network = counters.get('http_network_seconds', 0) + counters.get('http_throttled_seconds', 0)
+    # Unit time not spent waiting on the network or the rate limiter ~
+    # parsing/extraction (summed per unit, so it also holds for concurrent crawls),
+    # plus a separate <source>.parse stage for scrapers that parse after downloading
+    unit_network = (unit['counters'].get('http_network_seconds', 0) +
+                    unit['counters'].get('http_throttled_seconds', 0))
+    extraction = max(0.0, unit['seconds'] - unit_network)
+    parse_span = f"{stage_span.split('.', 1)[1]}.parse"
+    if parse_span != unit_span:
+        extraction += recorder.totals.get(parse_span, {'seconds': 0.0})['seconds']
+    return {
+        'wall_seconds': round(wall, 4),
+        'units': unit['calls'],
+        'units_per_sec': round(unit['calls'] / wall, 2) if wall else None,
+        'rows': int(rows),
+        'rows_per_sec': round(rows / wall, 1) if wall else None,
+        'bytes_fetched': int(counters.get('bytes_fetched', 0)),
+        'http_requests': int(counters.get('http_requests', 0)),
+        'network_seconds': round(network, 4),
+        'extraction_us_per_row': round(extraction / rows * 1e6, 2) if rows else None
+    }
+
+
+def benchmark_scraper(source, server, repeat=3, verbose=False):
+    """Run one scraper against the fixture server; metrics from the median-wall run"""
+    module_name, function_name, kwargs, unit_span = SCRAPER_BENCHMARKS[source]
+    module = __import__(module_name)
+    scraper = getattr(module, function_name)
+
+    # No politeness limits against localhost: this measures our own throughput
+    previous_fetcher = set_fetcher(Fetcher(url_overrides=server.url_overrides(), default_rate=1e6))
+    patched = {}
+    if source == 'tryexponent':
+        patched = {'BASE_URL': server.url_for(module.BASE_URL),
+                   'MAX_PAGES': TRYEXPONENT_FIXTURE_PAGES}
+    elif source == 'interviewbit':
+        patched = {'INTERVIEWBIT_URL': server.url_for(module.INTERVIEWBIT_URL)}
+    originals = {name: getattr(module, name) for name in patched}
+    for name, value in patched.items():
+        setattr(module, name, value)
+
+    runs = []
+    workdir = tempfile.mkdtemp(prefix='jobprep_bench_')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        for _ in range(repeat):
+            recorder = instrumentation.configure(None)
+            output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+            start = time.perf_counter()
+            with output:
+                result = scraper(**kwargs)
+            wall = time.perf_counter() - start
+            if result is None:
+                raise RuntimeError(f"{source} scraper returned no data (missing fixtures?)")
+            # Variants such as github-archive share their source's stage span
+            runs.append(_summarize_spans(recorder, f"scrape.{source.partition('-')[0]}", unit_span, wall))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+        for name, value in originals.items():
+            setattr(module, name, value)
+        set_fetcher(previous_fetcher)
+        instrumentation.configure(None)
+
+    runs.sort(key=lambda run: run['wall_seconds'])
+    median = runs[len(runs) // 2]
+    median['wall_seconds_min'] = runs[0]['wall_seconds']
+    return median
+
+
+def make_loader_csv(path, rows, seed=0):
+    import pandas as pd
+    rng = random.Random(seed)
+    companies = [f"{company} {i}" for i in range(10) for company in SYNTHETIC_COMPANIES]
+    pd.DataFrame({
+        'company_name': [rng.choice(companies) for _ in range(rows)],
+        'role_name': 'Software Engineer',
+        'interview_question': [_question(i) for i in range(rows)],
+        'difficulty': [rng.choice(['Easy', 'Medium', 'Hard', 'Not Specified']) for _ in range(rows)],
+        'question_url': [f"https://example.com/q/{i}" for i in range(rows)],
+        'source': 'Benchmark',
+        'date_collected': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }).to_csv(path, index=False)
+
+
+def benchmark_loader(rows=100_000, repeat=3):
+    """Load throughput against an embedded DuckDB stand-in for the warehouse"""
+    from storage_backends import DuckDBBackend, prepare_records
+    from streaming_ingest import StreamingLoader
+
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='jobprep_bench_load_')
+    try:
+        csv_path = os.path.join(workdir, 'questions.csv')
+        make_loader_csv(csv_path, rows)
+
+        timings = {'read_prepare': [], 'merge_new': [], 'merge_duplicates': [], 'merge_file_new': [], 'stream_new': []}
+        for i in range(repeat):
+            backend = DuckDBBackend(os.path.join(workdir, f'bench_{i}.duckdb'))
+            backend.connect()
+            backend.create_schema()
+
+            start = time.perf_counter()
+            df = prepare_records(backend.read_input(csv_path))
+            timings['read_prepare'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            backend.merge_dataframe(df)
+            timings['merge_new'].append(time.perf_counter() - start)
+
+            # Re-loading the same file: every row hits the duplicate path
+            start = time.perf_counter()
+            backend.merge_dataframe(df)
+            timings['merge_duplicates'].append(time.perf_counter() - start)
+            backend.close()
+
+            backend = DuckDBBackend(os.path.join(workdir, f'bench_file_{i}.duckdb'))
+            backend.connect()
+            backend.create_schema()
+            start = time.perf_counter()
+            backend.merge_file(csv_path)
+            timings['merge_file_new'].append(time.perf_counter() - start)
+            backend.close()
+
+            # The same rows pushed in scraper-sized chunks through the streaming loader
+            backend = DuckDBBackend(os.path.join(workdir, f'bench_stream_{i}.duckdb'))
+            backend.connect()
+            backend.create_schema()
+            backend.close()
+            loader = StreamingLoader(backend, update_search_index=False,
+                                     cache_path=os.path.join(workdir, 'query_cache.sqlite'))
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()), loader:
+                for chunk in range(0, rows, STREAM_CHUNK_ROWS):
+                    loader.put(df.iloc[chunk:chunk + STREAM_CHUNK_ROWS])
+            timings['stream_new'].append(time.perf_counter() - start)
+
+        for name, values in timings.items():
+            seconds = statistics.median(values)
+            results[name] = {'seconds': round(seconds, 4), 'rows_per_sec': round(rows / seconds, 1)}
+        results['rows'] = rows
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def _pandas_company_rows(company_name, data):
+    """The pre-Arrow GitHub parse (decode, StringIO, pandas, one dict per row), kept as the baseline"""
+    import pandas as pd
+    rows = []
+    df = pd.read_csv(io.StringIO(data.decode('utf-8')))
+    for _, row in df.iterrows():
+        title = str(row.get('Title', '')).strip()
+        difficulty = str(row.get('Difficulty', 'Not Specified')).strip()
+        url = str(row.get('URL', '')).strip()
+        if not title or title == 'nan' or len(title) < 3:
+            continue
+        difficulty = difficulty.capitalize() if difficulty.lower() in ['easy', 'medium', 'hard'] else 'Not Specified'
+        rows.append({
+            'company_name': company_name,
+            'role_name': 'Software Engineer',
+            'interview_question': title,
+            'difficulty': difficulty,
+            'question_url': '' if url == 'nan' else url,
+            'source': 'GitHub - LeetCode Company-wise',
+            'date_collected': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        })
+    return rows
+
+
+def _load_github_csvs(fixtures_dir):
+    """(company name, bytes) for every recorded raw all.csv, as the scraper downloads them"""
+    blobs = []
+    root = os.path.join(fixtures_dir, 'raw.githubusercontent.com')
+    for directory, _, files in sorted(os.walk(root)):
+        if 'all.csv' in files:
+            with open(os.path.join(directory, 'all.csv'), 'rb') as f:
+                folder = os.path.basename(directory)
+                blobs.append((folder.replace('-', ' ').replace('_', ' ').title(), f.read()))
+    return blobs
+
+
+def _run_github_parse(path, fixtures_dir, repeat):
+    """
+    One parse path in a fresh process: median seconds, and the peak memory
+    of an untimed run (tracemalloc for Python/NumPy objects plus the Arrow
+    memory pool high-water mark, which tracemalloc can't see)
+    """
+    import tracemalloc
+    import pandas as pd
+    import pyarrow as pa
+    import scrape_github_leetcode_final as github
+
+    def parse(blobs):
+        if path == 'pandas':
+            return pd.DataFrame([row for name, data in blobs for row in _pandas_company_rows(name, data)])
+        return github.company_questions(github.parse_company_csvs(blobs))
+
+    blobs = _load_github_csvs(fixtures_dir)
+    parse(blobs[:1])
+
+    pool = pa.default_memory_pool()
+    arrow_baseline = pool.bytes_allocated()
+    tracemalloc.start()
+    df = parse(blobs)
+    python_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    rows = len(df)
+    del df
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(blobs)
+        timings.append(time.perf_counter() - start)
+    return {
+        'seconds': round(statistics.median(timings), 4),
+        'peak_bytes': python_peak + max(0, pool.max_memory() - arrow_baseline),
+        'rows': rows
+    }
+
+
+def benchmark_github_parse(fixtures_dir, repeat=3):
+    """
+    Parse time and peak memory for every GitHub all.csv in the fixtures:
+    the old pandas/StringIO path against the Arrow parse stage, each in its
+    own process so one path's allocations don't skew the other's
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    files = len(_load_github_csvs(fixtures_dir))
+    if not files:
+        return None
+    results = {'files': files}
+    for path in ['pandas', 'arrow']:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            results[path] = executor.submit(_run_github_parse, path, fixtures_dir, repeat).result()
+    return results
+
+
+def make_merged_rows(rows, seed=0):
+    """Row dicts shaped like a merged scrape: several sources, each row stamped as the scrapers did"""
+    rng = random.Random(seed)
+    companies = [f"{company} {i}" for i in range(10) for company in SYNTHETIC_COMPANIES]
+    sources = ['GitHub - LeetCode Company-wise', 'Reddit - r/leetcode', 'Reddit - r/csinterviewproblems',
+               'GeeksforGeeks', 'InterviewBit', 'TryExponent']
+    roles = ['Software Engineer'] * 6 + ['Product Manager', 'ML Engineer', 'Technical Program Manager']
+    started = time.time()
+    return [{
+        'company_name': rng.choice(companies),
+        'role_name': rng.choice(roles),
+        'interview_question': _question(i),
+        'difficulty': rng.choice(['Easy', 'Medium', 'Hard', 'Not Specified']),
+        'question_url': f"https://example.com/q/{i}",
+        'source': sources[i * len(sources) // rows],
+        # A fresh strftime() string per row, one second apart every 1000 rows
+        'date_collected': datetime.fromtimestamp(started + i // 1000).strftime('%Y-%m-%d %H:%M:%S')
+    } for i in range(rows)]
+
+
+def benchmark_record_memory(rows=200_000, seed=0):
+    """
+    Bytes per row of a merged dataset held as row dicts / object-dtype
+    DataFrame (how the scrapers and merge used to hold it) and as
+    QuestionRecords / compact DataFrame
+    """
+    import tracemalloc
+    import pandas as pd
+    from records import QuestionRecords, concat_records, memory_bytes
+
+    tracemalloc.start()
+    merged = make_merged_rows(rows, seed)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    results = {'rows': rows, 'dict_rows': dict_bytes}
+    results['dataframe_object'] = memory_bytes(pd.DataFrame(merged, dtype=object))
+    results['dataframe_default'] = memory_bytes(pd.DataFrame(merged))
+
+    # The builder is fed source by source, as each scraper does
+    tracemalloc.start()
+    batches = []
+    for source in dict.fromkeys(row['source'] for row in merged):
+        batch = QuestionRecords(source=source)
+        batch.extend(row for row in merged if row['source'] == source)
+        batches.append(batch)
+    # The text strings are shared with `merged` rather than allocated here
+    results['question_records'] = tracemalloc.get_traced_memory()[0] + sum(
+        sys.getsizeof(text) for batch in batches for column in batch.text.values() for text in column)
+    tracemalloc.stop()
+
+    results['dataframe_compact'] = memory_bytes(concat_records([batch.to_frame() for batch in batches]))
+    return results
+
+
+def make_reddit_dump(path, posts, seed=0, match_every=20):
+    """
+    Synthetic .zst NDJSON dump: submissions and comments across many
+    subreddits, one in `match_every` from a subreddit the scraper follows
+    """
+    import zstandard
+    from scrape_reddit_interviews import SUBREDDITS
+
+    rng = random.Random(seed)
+    other = ['AskReddit', 'funny', 'gaming', 'worldnews', 'cscareerquestions', 'python', 'programming']
+    padding = {'author_flair_text': None, 'gilded': 0, 'score': 1, 'over_18': False, 'stickied': False,
+               'retrieved_on': 1700000000, 'edited': False, 'distinguished': None}
+    with open(path, 'wb') as f:
+        with zstandard.ZstdCompressor(level=3).stream_writer(f) as writer:
+            for i in range(posts):
+                subreddit = rng.choice(SUBREDDITS) if i % match_every == 0 else rng.choice(other)
+                company = rng.choice(SYNTHETIC_COMPANIES)
+                if i % 3:
+                    item = {'id': f"c{i:x}", 'subreddit': subreddit, 'link_id': f"t3_{i // 3:x}",
+                            'body': f"{company} onsite interview: they asked {_question(i)} I was nervous."}
+                else:
+                    item = {'id': f"{i:x}", 'subreddit': subreddit, 'title': f"{company} interview experience",
+                            'selftext': f"Phone screen went fine. {_question(i)}",
+                            'permalink': f"/r/{subreddit}/comments/{i:x}/post/"}
+                item.update(padding)
+                writer.write(json.dumps(item).encode('utf-8') + b'\n')
+
+
+def benchmark_reddit_dump(posts=200_000, workers=None):
+    """Dump ingestion throughput (compressed MB/s, posts/s) on a synthetic dump"""
+    import scrape_reddit_interviews
+
+    workdir = tempfile.mkdtemp(prefix='jobprep_bench_dump_')
+    cwd = os.getcwd()
+    try:
+        path = os.path.join(workdir, 'RS_synthetic.zst')
+        make_reddit_dump(path, posts)
+        os.chdir(workdir)
+        recorder = instrumentation.configure(None)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = scrape_reddit_interviews.ingest_reddit_dumps([path], workers=workers)
+        seconds = time.perf_counter() - start
+        counters = recorder.totals['scrape.reddit_dump']['counters']
+        check_reddit_dump_cli(path, len(df) if df is not None else 0)
+        return {
+            'posts': posts,
+            'seconds': round(seconds, 3),
+            'compressed_mb_per_sec': round(counters['dump_bytes'] / (1024 * 1024) / seconds, 1),
+            'decompressed_mb_per_sec': round(counters['dump_bytes_decompressed'] / (1024 * 1024) / seconds, 1),
+            'posts_per_sec': round(counters['lines'] / seconds, 1),
+            'matched': int(counters['matched']),
+            'rows': int(counters['rows'])
+        }
+    finally:
+        os.chdir(cwd)
+        instrumentation.configure(None)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def check_reddit_dump_cli(path, expected_rows, workers=2):
+    """
+    Run the same dump through `jobprep scrape reddit --dump` in a fresh
+    process (the process-pool worker must pickle when the script isn't
+    __main__) and fail unless it saves the rows the in-process run found
+    """
+    import pandas as pd
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    outdir = tempfile.mkdtemp(prefix='jobprep_bench_dump_cli_')
+    try:
+        completed = subprocess.run(
+            [sys.executable, os.path.join(script_dir, 'jobprep.py'), 'scrape', 'reddit',
+             '--dump', path, '--workers', str(workers)],
+            cwd=outdir, capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=script_dir)
+        )
+        outputs = [f for f in os.listdir(outdir) if f.startswith('reddit_dump_') and f.endswith('.csv')]
+        rows = len(pd.read_csv(os.path.join(outdir, outputs[0]))) if outputs else 0
+        if completed.returncode != 0 or rows != expected_rows:
+            raise RuntimeError(f"jobprep scrape reddit --dump: exit {completed.returncode}, {rows} rows "
+                               f"(expected {expected_rows})\n{completed.stderr[-2000:]}")
+    finally:
+        shutil.rmtree(outdir, ignore_errors=True)
+
+
+def check_search_without_terms():
+    """Fail if a query with no indexable terms (e.g. '++') or an empty query file crashes the search CLI"""
+    import search_questions
+
+    workdir = tempfile.mkdtemp(prefix='jobprep_bench_search_')
+    try:
+        index_path = os.path.join(workdir, 'search.sqlite')
+        query_file = os.path.join(workdir, 'queries.txt')
+        open(query_file, 'w').close()
+        index = search_questions.QuestionSearchIndex(index_path)
+        results, facet_counts = index.search('++')
+        index.close()
+        if results or facet_counts:
+            raise RuntimeError(f"search('++') matched {len(results)} question(s)")
+        with contextlib.redirect_stdout(io.StringIO()):
+            search_questions.main(['++', '--index-path', index_path])
+            search_questions.main(['--benchmark', query_file, '--repeat', '1', '--index-path', index_path])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def check_gfg_link_filter(fixtures_dir):
+    """Fail unless the compiled GFG link filter classifies every link on the fixture page like the original scan"""
+    import scrape_geeksforgeeks_companywise as gfg
+
+    with open(fixture_path(fixtures_dir, gfg.GFG_URL), 'rb') as f:
+        html = f.read()
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        agrees = gfg.benchmark_link_filter(html, repeat=1)
+    if not agrees:
+        raise RuntimeError(f"GFG link filter regression:\n{output.getvalue()}")
+
+
+def check_gfg_listing_company():
+    """Fail unless a listing page linked from another company's page is attributed to its own company"""
+    import scrape_geeksforgeeks_companywise as gfg
+
+    fixtures_dir = tempfile.mkdtemp(prefix='jobprep_bench_gfg_listing_')
+    seed = '<article><ul><li><a href="https://www.geeksforgeeks.org/company/amazon/">Amazon archive</a></li></ul></article>'
+    pages = {
+        'amazon': '<a href="https://www.geeksforgeeks.org/company/google/">Google archive</a>',
+        'google': '<a href="https://www.geeksforgeeks.org/problems/google-listed-1/1">Listed Google problem 1</a>'
+    }
+    for slug, body in pages.items():
+        _write(fixtures_dir, f'https://www.geeksforgeeks.org/company/{slug}/',
+               f'<html><body><article>{body}</article></body></html>')
+    try:
+        with FixtureServer(fixtures_dir) as server:
+            previous_fetcher = set_fetcher(Fetcher(url_overrides=server.url_overrides(), default_rate=1e6))
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    rows = gfg.crawl_gfg_company_pages(seed, max_depth=2, max_workers=1)
+            finally:
+                set_fetcher(previous_fetcher)
+    finally:
+        shutil.rmtree(fixtures_dir, ignore_errors=True)
+    companies = {row['interview_question']: row['company_name'] for row in rows}
+    if companies != {'Listed Google problem 1': 'Google'}:
+        raise RuntimeError(f"GFG crawl attributed listing questions wrongly: {companies}")
+
+
+def benchmark_seen_index(items=200_000):
+    """
+    Seen-question index lookups on `items` known keys, with the Bloom filter
+    sized for exactly that many (so its false-positive rate is the 1% target)
+    """
+    import seen_index
+
+    workdir = tempfile.mkdtemp(prefix='jobprep_bench_seen_')
+    try:
+        index = seen_index.SeenIndex(os.path.join(workdir, 'seen.sqlite'), capacity=items)
+        known = [seen_index.question_key(url=f"https://www.tryexponent.com/questions/{i}/design-{i}") for i in range(items)]
+        unseen = [seen_index.question_key(url=f"https://www.tryexponent.com/questions/{i}/new-{i}") for i in range(items)]
+        start = time.perf_counter()
+        index.add_many(known, source='benchmark')
+        index.commit()
+        add_seconds = time.perf_counter() - start
+
+        def per_key_ns(func, keys):
+            start = time.perf_counter()
+            func(keys)
+            return round((time.perf_counter() - start) / len(keys) * 1e9, 1)
+
+        known_digests = [seen_index.key_digest(key) for key in known]
+        unseen_digests = [seen_index.key_digest(key) for key in unseen]
+        bloom = index.bloom
+        sample = items // 10
+        result = {
+            'items': items,
+            'filter_bytes': len(bloom.mm),
+            'add_us': round(add_seconds / items * 1e6, 2),
+            'digest_ns': per_key_ns(lambda keys: [seen_index.key_digest(key) for key in keys], known),
+            'filter_known_ns': per_key_ns(lambda digests: [digest in bloom for digest in digests], known_digests),
+            'filter_unseen_ns': per_key_ns(lambda digests: [digest in bloom for digest in digests], unseen_digests),
+            'filter_batch_ns': per_key_ns(bloom.contains_many, known_digests + unseen_digests),
+            'lookup_known_us': round(per_key_ns(lambda keys: [key in index for key in keys], known[:sample]) / 1000, 2),
+            'lookup_unseen_us': round(per_key_ns(lambda keys: [key in index for key in keys], unseen[:sample]) / 1000, 2)
+        }
+        index.false_positives = index.lookups = index.hits = 0
+        index.contains_many(unseen)
+        stats = index.stats()
+        result['observed_fp_rate'] = round(stats['observed_fp_rate'], 5)
+        result['expected_fp_rate'] = round(stats['expected_fp_rate'], 5)
+        index.close()
+        return result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# source -> (question page URL template, pages, parser in enrichment.py)
+ENRICHMENT_BENCHMARKS = {
+    'tryexponent': (TRYEXPONENT_QUESTION_URL, TRYEXPONENT_FIXTURE_PAGES * 20, 'parse_tryexponent_question'),
+    'interviewbit': (INTERVIEWBIT_PROBLEM_URL, INTERVIEWBIT_FIXTURE_PROBLEMS, 'parse_interviewbit_problem')
+}
+
+
+def benchmark_enrichment(server, workers=8):
+    """
+    Detail-page enrichment against the fixture server: a cold cache, a warm
+    cache (no requests) and a forced revalidation (every page answers 304)
+    """
+    import enrichment
+
+    previous_fetcher = set_fetcher(Fetcher(url_overrides=server.url_overrides(), default_rate=1e6))
+    workdir = tempfile.mkdtemp(prefix='jobprep_bench_enrich_')
+    results = {}
+    try:
+        for source, (template, pages, parser) in ENRICHMENT_BENCHMARKS.items():
+            urls = [template.format(i) for i in range(pages)]
+            cache = enrichment.DetailCache(os.path.join(workdir, f"{source}.sqlite"))
+            metrics = {'pages': pages, 'workers': workers}
+            try:
+                for phase, revalidate_after in [('cold', None), ('warm', None), ('revalidate', 0)]:
+                    recorder = instrumentation.configure(None)
+                    start = time.perf_counter()
+                    with contextlib.redirect_stdout(io.StringIO()), instrumentation.span('benchmark.enrich'):
+                        details = enrichment.enrich_urls(urls, getattr(enrichment, parser), cache=cache, name=source,
+                                                         workers=workers, revalidate_after=revalidate_after)
+                    seconds = time.perf_counter() - start
+                    counters = recorder.totals['benchmark.enrich']['counters']
+                    metrics[phase] = {
+                        'seconds': round(seconds, 4),
+                        'pages_per_sec': round(pages / seconds, 1),
+                        'http_requests': int(counters.get('http_requests', 0)),
+                        'enriched': sum(1 for fields in details.values() if fields.get('tags'))
+                    }
+            finally:
+                cache.close()
+            results[source] = metrics
+    finally:
+        set_fetcher(previous_fetcher)
+        instrumentation.configure(None)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+# Command lines whose cold start is measured; "--help" does no work, so
+# what is left is interpreter startup plus module imports
+STARTUP_COMMANDS = [
+    ['jobprep.py', '--help'],
+    ['jobprep.py', 'setup', '--help'],
+    ['jobprep.py', 'load', '--help'],
+    ['jobprep.py', 'query', '--help'],
+    ['jobprep.py', 'search', '--help'],
+    ['jobprep.py', 'pipeline', '--help'],
+    ['jobprep.py', 'scrape', 'reddit', '--help'],
+    ['jobprep.py', 'scrape', 'gfg', '--help'],
+    ['jobprep.py', 'scrape', 'tryexponent', '--help'],
+    ['jobprep.py', 'scrape', 'interviewbit', '--help']
+]
+
+# Imports a --help run should never pay for
+HEAVY_MODULES = ['pandas', 'pyarrow', 'duckdb', 'lxml', 'bs4', 'selenium', 'snowflake']
+
+
+def parse_importtime(stderr):
+    """Total import time (ms) and top-level modules from `python -X importtime` output"""
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        parts = line.split(':', 1)[1].split('|')
+        total_us += int(parts[0])
+        modules.add(parts[2].strip().split('.')[0])
+    return total_us / 1000, modules
+
+
+def benchmark_startup(repeat=5):
+    """Cold-start wall time and -X importtime total per CLI command (median of `repeat`)"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for command in STARTUP_COMMANDS:
+        walls, imports = [], []
+        heavy = set()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            completed = subprocess.run([sys.executable, '-X', 'importtime'] + command,
+                                       cwd=script_dir, capture_output=True, text=True)
+            walls.append(time.perf_counter() - start)
+            import_ms, modules = parse_importtime(completed.stderr)
+            imports.append(import_ms)
+            heavy = modules & set(HEAVY_MODULES)
+        results[' '.join(command)] = {
+            'wall_ms': round(statistics.median(walls) * 1000, 1),
+            'import_ms': round(statistics.median(imports), 1),
+            'heavy_imports': sorted(heavy)
+        }
+    return results
+
+
+# ----------------------------------------------------------------------
+# Results
+# ----------------------------------------------------------------------
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_previous(results_path, fixtures_kind):
+    try:
+        with open(results_path, encoding='utf-8') as f:
+            runs = [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return None
+    runs = [run for run in runs if run.get('fixtures') == fixtures_kind]
+    return runs[-1] if runs else None
+
+
+def _change(current, previous):
+    if not isinstance(current, (int, float)) or not isinstance(previous, (int, float)) or not previous:
+        return ''
+    return f" ({(current - previous) / previous * 100:+.1f}%)"
+
+
+def print_report(record, previous=None):
+    print("\n" + "="*80)
+    print(f"BENCHMARK RESULTS ({record['fixtures']} fixtures, commit {record['commit']})")
+    if previous:
+        print(f"compared with {previous['timestamp']} (commit {previous['commit']})")
+    print("="*80)
+
+    for source, metrics in record['scrapers'].items():
+        before = (previous or {}).get('scrapers', {}).get(source, {})
+        if 'skipped' in metrics:
+            print(f"\n{source}: skipped ({metrics['skipped']})")
+            continue
+        print(f"\n{source}:")
+        for key in ['wall_seconds', 'units_per_sec', 'rows_per_sec', 'extraction_us_per_row']:
+            print(f"  {key:<24} {metrics[key]!s:>12}{_change(metrics[key], before.get(key))}")
+        print(f"  {'units / rows':<24} {metrics['units']:>5} / {metrics['rows']}")
+
+    if record.get('loader'):
+        before = (previous or {}).get('loader') or {}
+        if before.get('rows') != record['loader']['rows']:
+            before = {}
+        print(f"\nloader (DuckDB, {record['loader']['rows']} rows):")
+        for name, metrics in record['loader'].items():
+            if name == 'rows':
+                continue
+            rate = metrics['rows_per_sec']
+            print(f"  {name:<24} {rate:>12,.0f} rows/s{_change(rate, before.get(name, {}).get('rows_per_sec'))}")
+
+    if record.get('github_parse'):
+        parse = record['github_parse']
+        before = (previous or {}).get('github_parse') or {}
+        print(f"\ngithub parse ({parse['files']} files, {parse['arrow']['rows']} rows):")
+        for path in ['pandas', 'arrow']:
+            metrics = parse[path]
+            change = _change(metrics['seconds'], before.get(path, {}).get('seconds'))
+            print(f"  {path:<24} {metrics['seconds']:>8.3f} s{change}, "
+                  f"peak {metrics['peak_bytes'] / (1024 * 1024):.1f} MB")
+        print(f"  {'speedup':<24} {parse['pandas']['seconds'] / parse['arrow']['seconds']:>8.1f}x")
+
+    if record.get('records'):
+        memory = record['records']
+        before = (previous or {}).get('records') or {}
+        if before.get('rows') != memory['rows']:
+            before = {}
+        print(f"\nrecord memory ({memory['rows']} merged rows, bytes per row):")
+        for name in ['dict_rows', 'dataframe_object', 'dataframe_default', 'question_records', 'dataframe_compact']:
+            per_row = memory[name] / memory['rows']
+            previous_per_row = before[name] / before['rows'] if name in before else None
+            print(f"  {name:<24} {per_row:>8.1f}{_change(per_row, previous_per_row)}")
+
+    if record.get('reddit_dump'):
+        dump = record['reddit_dump']
+        before = (previous or {}).get('reddit_dump') or {}
+        if before.get('posts') != dump['posts']:
+            before = {}
+        print(f"\nreddit dump ingestion ({dump['posts']} posts/comments, {dump['matched']} matched, {dump['rows']} rows):")
+        for key in ['compressed_mb_per_sec', 'decompressed_mb_per_sec', 'posts_per_sec']:
+            print(f"  {key:<24} {dump[key]:>12,.1f}{_change(dump[key], before.get(key))}")
+
+    if record.get('seen_index'):
+        seen = record['seen_index']
+        before = (previous or {}).get('seen_index') or {}
+        if before.get('items') != seen['items']:
+            before = {}
+        print(f"\nseen index ({seen['items']:,} keys, {seen['filter_bytes'] / 1024:.0f} KB filter):")
+        for key in ['digest_ns', 'filter_known_ns', 'filter_unseen_ns', 'filter_batch_ns']:
+            print(f"  {key:<24} {seen[key]:>12,.1f} ns{_change(seen[key], before.get(key))}")
+        for key in ['lookup_known_us', 'lookup_unseen_us', 'add_us']:
+            print(f"  {key:<24} {seen[key]:>12,.2f} us{_change(seen[key], before.get(key))}")
+        print(f"  {'false positives':<24} {seen['observed_fp_rate']:>12.3%} observed, "
+              f"{seen['expected_fp_rate']:.3%} expected")
+
+    for source, enrich in (record.get('enrichment') or {}).items():
+        before = ((previous or {}).get('enrichment') or {}).get(source) or {}
+        if before.get('pages') != enrich['pages']:
+            before = {}
+        print(f"\n{source} detail enrichment ({enrich['pages']} pages, {enrich['workers']} workers):")
+        for phase in ['cold', 'warm', 'revalidate']:
+            metrics = enrich[phase]
+            change = _change(metrics['pages_per_sec'], before.get(phase, {}).get('pages_per_sec'))
+            print(f"  {phase:<24} {metrics['pages_per_sec']:>12,.1f} pages/s{change}, "
+                  f"{metrics['http_requests']} requests, {metrics['enriched']} enriched")
+
+    if record.get('startup'):
+        before = (previous or {}).get('startup') or {}
+        print("\nCLI startup (python -X importtime, median):")
+        for command, metrics in record['startup'].items():
+            heavy = f"  imports {', '.join(metrics['heavy_imports'])}" if metrics['heavy_imports'] else ''
+            change = _change(metrics['wall_ms'], before.get(command, {}).get('wall_ms'))
+            print(f"  {command:<36} {metrics['wall_ms']:>7.1f} ms wall{change}, "
+                  f"{metrics['import_ms']:>6.1f} ms imports{heavy}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers on recorded fixtures and the loader on DuckDB")
+    parser.add_argument('--sources', nargs='*', choices=list(SCRAPER_BENCHMARKS),
+                        default=[source for source in SCRAPER_BENCHMARKS if source not in BROWSER_SOURCES],
+                        help="scrapers to benchmark (browser scrapers need Chrome; default: the HTTP ones)")
+    parser.add_argument('--fixtures', default=FIXTURES_DIR)
+    parser.add_argument('--record', action='store_true', help="record fresh fixtures from the live sites first")
+    parser.add_argument('--synthetic', action='store_true',
+                        help="(re)generate synthetic fixtures instead of using recorded ones")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--loader-rows', type=int, default=100_000, help="0 skips the loader benchmark")
+    parser.add_argument('--record-rows', type=int, default=200_000,
+                        help="merged rows for the record memory benchmark (0 skips it)")
+    parser.add_argument('--dump-posts', type=int, default=200_000,
+                        help="lines in the synthetic Reddit dump for the ingestion benchmark (0 skips it)")
+    parser.add_argument('--seen-items', type=int, default=200_000,
+                        help="keys in the seen-index lookup benchmark (0 skips it)")
+    parser.add_argument('--detail-workers', type=int, default=8,
+                        help="concurrency for the detail enrichment benchmark (0 skips it; synthetic fixtures only)")
+    parser.add_argument('--startup', action='store_true', help="also measure CLI cold start with -X importtime")
+    parser.add_argument('--results', default=RESULTS_PATH, help="JSON lines file runs are appended to")
+    parser.add_argument('--verbose', action='store_true', help="show scraper output")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        record_fixtures(args.fixtures, args.sources)
+    elif args.synthetic or not os.path.isdir(args.fixtures):
+        make_synthetic_fixtures(args.fixtures)
+    fixtures_kind = 'synthetic' if os.path.exists(os.path.join(args.fixtures, 'SYNTHETIC')) else 'recorded'
+    fixtures_dir = os.path.abspath(args.fixtures)
+
+    record = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'fixtures': fixtures_kind,
+        'scrapers': {},
+        'loader': None,
+        'github_parse': None,
+        'records': None,
+        'reddit_dump': None,
+        'enrichment': None,
+        'seen_index': None,
+        'startup': None
+    }
+
+    with FixtureServer(fixtures_dir) as server:
+        for source in args.sources:
+            print(f"▶ {source}...", file=sys.stderr)
+            try:
+                record['scrapers'][source] = benchmark_scraper(source, server, args.repeat, args.verbose)
+            except ImportError as e:
+                record['scrapers'][source] = {'skipped': f"missing dependency: {e.name}"}
+            except Exception as e:
+                record['scrapers'][source] = {'skipped': str(e)[:120]}
+
+    print("▶ search without terms...", file=sys.stderr)
+    check_search_without_terms()
+
+    if 'gfg' in args.sources:
+        print("▶ gfg link filter...", file=sys.stderr)
+        check_gfg_link_filter(fixtures_dir)
+        print("▶ gfg listing companies...", file=sys.stderr)
+        check_gfg_listing_company()
+
+    if 'github' in args.sources:
+        print("▶ github parse...", file=sys.stderr)
+        record['github_parse'] = benchmark_github_parse(fixtures_dir, args.repeat)
+
+    if args.seen_items:
+        print("▶ seen index...", file=sys.stderr)
+        record['seen_index'] = benchmark_seen_index(args.seen_items)
+
+    if args.detail_workers and fixtures_kind == 'synthetic':
+        print("▶ detail enrichment...", file=sys.stderr)
+        with FixtureServer(fixtures_dir) as server:
+            record['enrichment'] = benchmark_enrichment(server, args.detail_workers)
+
+    if args.loader_rows:
+        print("▶ loader...", file=sys.stderr)
+        record['loader'] = benchmark_loader(args.loader_rows, args.repeat)
+
+    if args.record_rows:
+        print("▶ record memory...", file=sys.stderr)
+        record['records'] = benchmark_record_memory(args.record_rows)
+
+    if args.dump_posts:
+        print("▶ reddit dump...", file=sys.stderr)
+        record['reddit_dump'] = benchmark_reddit_dump(args.dump_posts)
+
+    if args.startup:
+        print("▶ startup...", file=sys.stderr)
+        record['startup'] = benchmark_startup(max(args.repeat, 5))
+
+    previous = load_previous(args.results, fixtures_kind)
+    print_report(record, previous)
+
+    with open(args.results, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + '\n')
+    print(f"\n✓ Appended to {args.results}")
+
+
+if __name__ == "__main__":
+    main()
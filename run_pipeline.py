@@ -0,0 +1,320 @@
+import argparse
+import glob
+import hashlib
+import importlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+import instrumentation
+from instrumentation import span
+from profiling import add_profile_argument, profile_run
+from streaming_ingest import StreamingLoader, DEFAULT_BATCH_ROWS, DEFAULT_FLUSH_SECONDS
+
+STATE_PATH = '.pipeline_state.json'
+
+# How many stages may hold each resource at once
+RESOURCE_LIMITS = {
+    'http': 3,       # requests-based scrapers (own per-host rate limits in http_fetch)
+    'browser': 1,    # Chrome-based scrapers (each may run its own BrowserPool)
+    'warehouse': 1
+}
+
+# source -> (module, function, CSV pattern it writes, resource, max age in hours)
+SCRAPERS = {
+    'github': ('scrape_github_leetcode_final', 'scrape_github_leetcode_archive', 'github_leetcode_*.csv', 'http', 24),
+    'reddit': ('scrape_reddit_interviews', 'scrape_reddit_technical_questions', 'reddit_technical_*.csv', 'http', 12),
+    'gfg': ('scrape_geeksforgeeks_companywise', 'scrape_geeksforgeeks_correct', 'gfg_companywise_*.csv', 'http', 24 * 7),
+    'interviewbit': ('scrape_interviewbit_coding', 'scrape_interviewbit_complete', 'interviewbit_full_*.csv', 'browser', 24 * 7),
+    'tryexponent': ('scrape_tryexponent', 'scrape_tryexponent_updated', 'tryexponent_updated_*.csv', 'browser', 24)
+}
+
+# Extra arguments for scheduled runs: the daily TryExponent refresh stops
+# once it reaches pages of known questions (with its own periodic full sweep)
+SCRAPER_KWARGS = {
+    'tryexponent': {'incremental': True}
+}
+
+# Scrapers that push rows to a StreamingLoader while they run (`sink=`);
+# the others' results are streamed when they return
+STREAMING_SCRAPERS = {'reddit'}
+
+
+def file_fingerprint(paths):
+    """Cheap change detector for stage inputs: path, size and mtime of each file"""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        stat = os.stat(path)
+        digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def newest_file(pattern, since=0):
+    """Most recently modified file matching pattern, written at or after `since`"""
+    candidates = [f for f in glob.glob(pattern) if os.path.getmtime(f) >= since]
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+
+class Stage:
+    """
+    One node of the pipeline DAG
+
+    `run(inputs)` receives {dependency name: output path} and returns the
+    stage's output path (or None on failure). A stage with `max_age_hours`
+    is re-run once its last output is older than that; otherwise it is
+    re-run only when the fingerprint of its inputs changes.
+    """
+
+    def __init__(self, name, run, deps=(), resource=None, max_age_hours=None, require_all_deps=True):
+        self.name = name
+        self.run = run
+        self.deps = list(deps)
+        self.resource = resource
+        self.max_age_hours = max_age_hours
+        self.require_all_deps = require_all_deps
+
+
+def scrape_stage(source, sink=None):
+    module_name, function_name, pattern, resource, max_age_hours = SCRAPERS[source]
+
+    def run(inputs):
+        started = time.time()
+        # Imported per stage so an HTTP-only run doesn't need selenium installed
+        scraper = getattr(importlib.import_module(module_name), function_name)
+        kwargs = dict(SCRAPER_KWARGS.get(source, {}))
+        if sink is not None and source in STREAMING_SCRAPERS:
+            kwargs['sink'] = sink
+        df = scraper(**kwargs)
+        if df is None:
+            return None
+        if sink is not None and source not in STREAMING_SCRAPERS:
+            sink.put(df)
+        # A scraper that found its source unchanged returns data without writing a new file
+        return newest_file(pattern, since=started) or newest_file(pattern)
+
+    return Stage(f"scrape:{source}", run, resource=resource, max_age_hours=max_age_hours)
+
+
+def merge_stage(deps):
+    def run(inputs):
+        import pandas as pd
+        from records import compact_frame, concat_records
+        from storage_backends import prepare_records
+
+        # Each source is compacted as soon as it's read, so the merged set
+        # never exists as one object-dtype frame
+        frames = [compact_frame(pd.read_csv(path)) for path in inputs.values()]
+        now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        df = prepare_records(concat_records(frames), now_str)
+
+        filename = f'MASTER_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+        df.to_csv(filename, index=False)
+        print(f"✓ Merged {len(frames)} source file(s) into {len(df)} unique questions: {filename}")
+        return filename
+
+    # Merge whatever sources are available; one failed scraper shouldn't block the rest
+    return Stage('merge', run, deps=deps, require_all_deps=False)
+
+
+def load_stage(backend_name=None):
+    def run(inputs):
+        from load_to_snowflake import load_csv_to_snowflake
+        from storage_backends import get_backend
+
+        csv_file = inputs['merge']
+        return csv_file if load_csv_to_snowflake(csv_file, backend=get_backend(backend_name)) else None
+
+    return Stage('load', run, deps=['merge'], resource='warehouse')
+
+
+def build_pipeline(sources=None, load=True, backend_name=None, sink=None):
+    """
+    scrape:<source> (parallel) -> merge -> load
+    With a `sink` (StreamingLoader) the scrapers load as they go, so there
+    is no load stage and the merge only writes the MASTER_ CSV
+    """
+    sources = sources or list(SCRAPERS)
+    stages = [scrape_stage(source, sink) for source in sources]
+    stages.append(merge_stage([stage.name for stage in stages]))
+    if load and sink is None:
+        stages.append(load_stage(backend_name))
+    return stages
+
+
+class PipelineRunner:
+    """
+    Runs a stage DAG as soon as each stage's dependencies finish, with
+    per-resource concurrency limits, and skips stages that are up to date
+    according to the state file
+    """
+
+    def __init__(self, stages, state_path=STATE_PATH, resource_limits=None, force=False):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_path = state_path
+        self.force = force
+        limits = dict(RESOURCE_LIMITS, **(resource_limits or {}))
+        self.semaphores = {name: threading.Semaphore(limit) for name, limit in limits.items()}
+        self.lock = threading.Lock()
+        self.state = self._load_state()
+        self.results = {}
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+
+    def is_fresh(self, stage, fingerprint):
+        previous = self.state.get(stage.name)
+        if self.force or not previous:
+            return False
+        if not previous.get('output') or not os.path.exists(previous['output']):
+            return False
+        if previous.get('fingerprint') != fingerprint:
+            return False
+        if stage.max_age_hours is not None:
+            return time.time() - previous['finished_at'] < stage.max_age_hours * 3600
+        return True
+
+    def _run_stage(self, stage, inputs):
+        fingerprint = file_fingerprint(inputs.values())
+        if self.is_fresh(stage, fingerprint):
+            return {'status': 'skipped', 'output': self.state[stage.name]['output'], 'seconds': 0.0}
+
+        semaphore = self.semaphores.get(stage.resource)
+        start = time.perf_counter()
+        if semaphore is not None:
+            semaphore.acquire()
+        try:
+            waited = time.perf_counter() - start
+            print(f"\n▶ {stage.name} started")
+            with span(stage.name):
+                output = stage.run(inputs)
+        except Exception as e:
+            print(f"\n✗ {stage.name} failed: {e}")
+            output = None
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+        seconds = time.perf_counter() - start - waited
+
+        if output is None:
+            return {'status': 'failed', 'output': None, 'seconds': seconds}
+
+        with self.lock:
+            self.state[stage.name] = {
+                'output': output,
+                'fingerprint': fingerprint,
+                'finished_at': time.time()
+            }
+            self._save_state()
+        return {'status': 'ran', 'output': output, 'seconds': seconds}
+
+    def _inputs_for(self, stage):
+        """Outputs of the dependencies, falling back to a failed scraper's last good file"""
+        inputs = {}
+        for dep in stage.deps:
+            output = self.results[dep]['output']
+            if output is None:
+                previous = self.state.get(dep, {}).get('output')
+                if previous and os.path.exists(previous):
+                    output = previous
+            if output is not None:
+                inputs[dep] = output
+        return inputs
+
+    def run(self):
+        pending = dict(self.stages)
+        running = {}
+        wall_start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.stages))) as executor:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if not all(dep in self.results for dep in stage.deps):
+                        continue
+                    del pending[name]
+                    inputs = self._inputs_for(stage)
+                    if (stage.deps and not inputs) or (stage.require_all_deps and len(inputs) < len(stage.deps)):
+                        self.results[name] = {'status': 'blocked', 'output': None, 'seconds': 0.0}
+                        continue
+                    running[executor.submit(self._run_stage, stage, inputs)] = name
+
+                if not running:
+                    # Everything left was blocked; loop again to resolve dependents
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    self.results[running.pop(future)] = future.result()
+
+        self.wall_seconds = time.perf_counter() - wall_start
+        return self.results
+
+    def print_summary(self):
+        print("\n" + "="*80)
+        print("PIPELINE SUMMARY")
+        print("="*80)
+        for name in self.stages:
+            result = self.results.get(name, {'status': 'not run', 'output': None, 'seconds': 0.0})
+            output = os.path.basename(result['output']) if result['output'] else '-'
+            print(f"  {name:<20} {result['status']:<8} {result['seconds']:>8.1f}s  {output}")
+
+        stage_total = sum(result['seconds'] for result in self.results.values())
+        print(f"\n  Wall time: {self.wall_seconds:.1f}s (sum of stages: {stage_total:.1f}s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape all sources in parallel, merge and load")
+    parser.add_argument('--sources', nargs='+', choices=list(SCRAPERS), help="scrapers to run (default: all)")
+    parser.add_argument('--backend', help="storage backend for the load stage (default: $JOBPREP_BACKEND or snowflake)")
+    parser.add_argument('--no-load', action='store_true', help="stop after writing the MASTER_ CSV")
+    parser.add_argument('--force', action='store_true', help="re-run every stage even if it is up to date")
+    parser.add_argument('--stream', action='store_true',
+                        help="merge rows into the warehouse in micro-batches while the scrapers run")
+    parser.add_argument('--batch-rows', type=int, default=DEFAULT_BATCH_ROWS, help="--stream: rows per merge")
+    parser.add_argument('--flush-seconds', type=float, default=DEFAULT_FLUSH_SECONDS,
+                        help="--stream: merge a partial batch after this long")
+    parser.add_argument('--http-stages', type=int, default=RESOURCE_LIMITS['http'])
+    parser.add_argument('--browser-stages', type=int, default=RESOURCE_LIMITS['browser'])
+    parser.add_argument('--state', default=STATE_PATH)
+    parser.add_argument('--metrics', default=os.environ.get(instrumentation.METRICS_PATH_ENV),
+                        help="append one JSON line per timed span to this file")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+    
+    instrumentation.configure(args.metrics)
+
+    sink = None
+    if args.stream and not args.no_load:
+        from storage_backends import get_backend
+        sink = StreamingLoader(get_backend(args.backend), batch_rows=args.batch_rows,
+                               flush_seconds=args.flush_seconds).start()
+
+    runner = PipelineRunner(
+        build_pipeline(args.sources, load=not args.no_load, backend_name=args.backend, sink=sink),
+        state_path=args.state,
+        resource_limits={'http': args.http_stages, 'browser': args.browser_stages},
+        force=args.force
+    )
+    try:
+        with profile_run('pipeline', enabled=args.profile):
+            runner.run()
+    finally:
+        if sink is not None:
+            sink.close()
+    runner.print_summary()
+    if sink is not None:
+        sink.print_summary()
+    instrumentation.print_summary()
+
+
+if __name__ == "__main__":
+    main()
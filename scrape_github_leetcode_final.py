@@ -1,15 +1,204 @@
-import requests
-import pandas as pd
 from datetime import datetime
+import argparse
+import json
+import os
+import tarfile
 import time
-import io
+from http_fetch import get_fetcher
+from records import repeated_category, batch_timestamps, compact_frame
+from seen_index import SeenIndex, DEFAULT_INDEX_PATH
+from instrumentation import span, count, print_summary
+from profiling import add_profile_argument, profile_run
 
-def scrape_github_leetcode_raw():
+REPO_OWNER = "snehasishroy"
+REPO_NAME = "leetcode-companywise-interview-questions"
+REPO_BRANCH = "master"
+
+# One small API call for the branch head, one codeload download for the snapshot
+COMMIT_API_URL = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/commits/{REPO_BRANCH}"
+ARCHIVE_URL = f"https://codeload.github.com/{REPO_OWNER}/{REPO_NAME}/tar.gz/{{}}"
+
+# Commit SHA and CSV of the last archive scrape
+SNAPSHOT_STATE_PATH = '.github_snapshot.json'
+
+
+def parse_company_csvs(blobs, max_workers=None):
+    """
+    Parse [(company name, raw all.csv bytes), ...] into one Arrow table of
+    Title/Difficulty/URL plus a dictionary-encoded company column
+
+    pyarrow reads each response body in place (no str decode or StringIO
+    copy) and releases the GIL while parsing, so the files are spread over
+    a thread pool sized to Arrow's CPU pool. A file that fails to parse is
+    reported and left out.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    from concurrent.futures import ThreadPoolExecutor
+
+    columns = ['Title', 'Difficulty', 'URL']
+    convert_options = pacsv.ConvertOptions(
+        include_columns=columns,
+        include_missing_columns=True,
+        column_types={name: pa.string() for name in columns},
+        strings_can_be_null=True
+    )
+    # Each file is a few KB: parallelism comes from parsing files side by side
+    read_options = pacsv.ReadOptions(use_threads=False)
+
+    def parse(blob):
+        company_name, data = blob
+        try:
+            return pacsv.read_csv(pa.BufferReader(pa.py_buffer(data)),
+                                  read_options=read_options, convert_options=convert_options)
+        except pa.ArrowInvalid as e:
+            print(f"  ✗ {company_name}: {str(e)[:60]}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers or pa.cpu_count()) as executor:
+        tables = list(executor.map(parse, blobs))
+
+    companies = pa.array([company_name for company_name, _ in blobs], pa.string())
+    parsed = []
+    for i, table in enumerate(tables):
+        if table is None:
+            continue
+        indices = pa.array([i] * table.num_rows, pa.int32())
+        parsed.append(table.append_column('company', pa.DictionaryArray.from_arrays(indices, companies)))
+
+    if not parsed:
+        return None
+    return pa.concat_tables(parsed)
+
+
+def company_questions(table):
+    """Question rows (the scrapers' CSV columns) from a parse_company_csvs table"""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    title = pc.utf8_trim_whitespace(table['Title'])
+    # Nulls are empty cells and 'nan'/'NA'-style markers, as pandas would read them
+    keep = pc.and_(pc.greater_equal(pc.utf8_length(title), 3), pc.not_equal(title, 'nan'))
+    table = table.filter(pc.fill_null(keep, False))
+    title = pc.utf8_trim_whitespace(table['Title'])
+
+    difficulty = pc.utf8_lower(pc.utf8_trim_whitespace(table['Difficulty']))
+    known = pc.fill_null(pc.is_in(difficulty, value_set=pa.array(['easy', 'medium', 'hard'])), False)
+    difficulty = pc.if_else(known, pc.utf8_capitalize(difficulty), 'Not Specified')
+
+    url = pc.utf8_trim_whitespace(table['URL'])
+    url = pc.fill_null(pc.if_else(pc.equal(url, 'nan'), '', url), '')
+
+    # Already columnar: labels stay dictionary-encoded and text stays in Arrow buffers
+    rows = table.num_rows
+    return pd.DataFrame({
+        'company_name': table['company'].to_pandas(),
+        'role_name': repeated_category('Software Engineer', rows),
+        'interview_question': pd.arrays.ArrowStringArray(title),
+        'difficulty': pc.dictionary_encode(difficulty).to_pandas(),
+        'question_url': pd.arrays.ArrowStringArray(url),
+        'source': repeated_category('GitHub - LeetCode Company-wise', rows),
+        'date_collected': batch_timestamps(time.time(), rows)
+    })
+
+
+def parse_questions(blobs, seen=None):
+    """
+    Parse stage shared by both scrapers: downloaded all.csv bodies -> question DataFrame
+    (company, question) rows already in the `seen` index are dropped before they're emitted
+    """
+    with span('github.parse', files=len(blobs)) as parse:
+        table = parse_company_csvs(blobs)
+        if table is None:
+            return None
+        parse.count('rows', table.num_rows)
+        df = company_questions(table)
+        if seen is not None:
+            known = seen.known_rows(df)
+            parse.count('seen_skipped', int(known.sum()))
+            print(f"✓ Skipped {int(known.sum())} already-collected row(s), {int((~known).sum())} new")
+            df = df[~known].reset_index(drop=True)
+        return df
+
+
+def remember_seen(seen, df):
+    """Record the saved rows in the seen index and report its hit/false-positive stats"""
+    if seen is None:
+        return
+    if df is not None:
+        seen.add_frame(df, source='GitHub')
+    seen.print_stats()
+    seen.close()
+
+
+def save_results(df):
+    """Write github_leetcode_<timestamp>.csv and print the report; returns (df, filename)"""
+    if df is not None and len(df):
+        df = df.drop_duplicates(subset=['company_name', 'interview_question'])
+        
+        filename = f'github_leetcode_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+        df.to_csv(filename, index=False)
+        count('rows', len(df))
+        
+        print("\n" + "="*80)
+        print("FINAL RESULTS")
+        print("="*80)
+        print(f"✓ Total questions: {len(df)}")
+        print(f"✓ Companies covered: {df['company_name'].nunique()}")
+        print(f"✓ Saved to: {filename}")
+        
+        # Top companies
+        print("\n" + "-"*80)
+        print("Top 20 Companies:")
+        print("-"*80)
+        top = df.groupby('company_name').size().reset_index(name='count')
+        top = top.sort_values('count', ascending=False).head(20)
+        for _, row in top.iterrows():
+            print(f"  {row['company_name']:<30} {row['count']:>5}")
+        
+        # Difficulty
+        print("\n" + "-"*80)
+        print("By Difficulty:")
+        print("-"*80)
+        diffs = df.groupby('difficulty').size().reset_index(name='count')
+        for _, row in diffs.iterrows():
+            print(f"  {row['difficulty']:<20} {row['count']:>5}")
+        
+        # Quality
+        print("\n" + "="*80)
+        print("DATA QUALITY")
+        print("="*80)
+        print("  ✅ 100% Company-Specific (organized by folders)")
+        print("  ✅ LeetCode curated questions")
+        print("  ✅ Difficulty levels included")
+        print(f"  ✅ {df['company_name'].nunique()} companies covered")
+        
+        # Samples
+        print("\n" + "-"*80)
+        print("Sample Questions:")
+        print("-"*80)
+        sample = df.sample(min(10, len(df)))
+        for _, row in sample.iterrows():
+            print(f"\n{row['company_name']} [{row['difficulty']}]:")
+            print(f"  {row['interview_question']}")
+        
+        print("\n" + "="*80)
+        print("✅ COMPLETE! Ready to load to Snowflake!")
+        print("="*80)
+        
+        return df, filename
+    
+    return None, None
+
+
+@span('scrape.github')
+def scrape_github_leetcode_raw(skip_seen=False, seen_path=DEFAULT_INDEX_PATH):
     """
     Scrape using raw GitHub URLs (bypasses API rate limits!)
     Automatically discovers ALL company folders!
+    With skip_seen, only rows missing from the shared seen index are saved
     """
-    
     print("GitHub LeetCode Scraper - Auto-Discover All Companies")
     print("="*80)
     
@@ -23,10 +212,13 @@ def scrape_github_leetcode_raw():
         'User-Agent': 'JobPrepAI'
     }
     
+    # Pooled keep-alive sessions, retries on 429/5xx and per-host rate limits
+    fetcher = get_fetcher()
+    
     print("\nStep 1: Auto-discovering all company folders...")
     
     try:
-        response = requests.get(api_url, headers=headers, timeout=10)
+        response = fetcher.get(api_url, headers=headers, timeout=10)
         
         if response.status_code == 200:
             contents = response.json()
@@ -41,7 +233,7 @@ def scrape_github_leetcode_raw():
             print("⚠️  API rate limited. Using fallback method...")
             # Fallback: Use web scraping to get folder list
             page_url = f"https://github.com/{repo_owner}/{repo_name}"
-            response = requests.get(page_url, timeout=10)
+            response = fetcher.get(page_url, timeout=10)
             
             if response.status_code == 200:
                 # Simple regex to find folder names in HTML
@@ -67,7 +259,7 @@ def scrape_github_leetcode_raw():
     
     base_raw_url = "https://raw.githubusercontent.com/snehasishroy/leetcode-companywise-interview-questions/master"
     
-    all_data = []
+    blobs = []
     successful = 0
     failed = 0
     
@@ -77,177 +269,179 @@ def scrape_github_leetcode_raw():
         
         print(f"[{i}/{len(company_folders)}] {company_name:<30}", end=" ")
         
-        try:
-            # Construct raw URL to all.csv
-            csv_url = f"{base_raw_url}/{company_folder}/all.csv"
-            
-            # Download CSV directly (no API!)
-            response = requests.get(csv_url, timeout=10)
-            
-            if response.status_code == 200:
-                # Parse CSV
-                df = pd.read_csv(io.StringIO(response.text))
+        with span('github.company', company=company_name) as unit:
+            try:
+                # Construct raw URL to all.csv
+                csv_url = f"{base_raw_url}/{company_folder}/all.csv"
                 
-                # Extract questions
-                for _, row in df.iterrows():
-                    title = str(row.get('Title', '')).strip()
-                    difficulty = str(row.get('Difficulty', 'Not Specified')).strip()
-                    url = str(row.get('URL', '')).strip()
-                    
-                    if not title or title == 'nan' or len(title) < 3:
-                        continue
-                    
-                    if difficulty.lower() in ['easy', 'medium', 'hard']:
-                        difficulty = difficulty.capitalize()
-                    else:
-                        difficulty = 'Not Specified'
+                # Download CSV directly (no API!)
+                response = fetcher.get(csv_url, timeout=10)
+                
+                if response.status_code == 200:
+                    # Keep the raw bytes; every file is parsed together afterwards
+                    blobs.append((company_name, response.content))
                     
-                    if url == 'nan':
-                        url = ''
+                    unit.count('csv_bytes', len(response.content))
+                    print(f"✓ {len(response.content) / 1024:5.1f} KB")
+                    successful += 1
                     
-                    all_data.append({
-                        'company_name': company_name,
-                        'role_name': 'Software Engineer',
-                        'interview_question': title,
-                        'difficulty': difficulty,
-                        'question_url': url,
-                        'source': 'GitHub - LeetCode Company-wise',
-                        'date_collected': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    })
-                
-                print(f"✓ {len(df):3d} questions")
-                successful += 1
+                elif response.status_code == 404:
+                    print("✗ No all.csv")
+                    failed += 1
+                else:
+                    print(f"✗ Error {response.status_code}")
+                    failed += 1
                 
-            elif response.status_code == 404:
-                print("✗ No all.csv")
+            except Exception as e:
+                print(f"✗ {str(e)[:30]}")
                 failed += 1
-            else:
-                print(f"✗ Error {response.status_code}")
-                failed += 1
-            
-            time.sleep(0.3)  # Small delay to be polite
-            
-        except Exception as e:
-            print(f"✗ {str(e)[:30]}")
-            failed += 1
     
     print(f"\n{'='*80}")
     print(f"Completed: {successful} successful, {failed} failed")
     print(f"{'='*80}")
     
-    # Save
-    if all_data:
-        df = pd.DataFrame(all_data)
-        df = df.drop_duplicates(subset=['company_name', 'interview_question'])
-        
-        filename = f'github_leetcode_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        df.to_csv(filename, index=False)
-        
-        print("\n" + "="*80)
-        print("FINAL RESULTS")
-        print("="*80)
-        print(f"✓ Total questions: {len(df)}")
-        print(f"✓ Companies covered: {df['company_name'].nunique()}")
-        print(f"✓ Saved to: {filename}")
-        
-        # Top companies
-        print("\n" + "-"*80)
-        print("Top 20 Companies:")
-        print("-"*80)
-        top = df.groupby('company_name').size().reset_index(name='count')
-        top = top.sort_values('count', ascending=False).head(20)
-        for _, row in top.iterrows():
-            print(f"  {row['company_name']:<30} {row['count']:>5}")
-        
-        # Difficulty
-        print("\n" + "-"*80)
-        print("By Difficulty:")
-        print("-"*80)
-        diffs = df.groupby('difficulty').size().reset_index(name='count')
-        for _, row in diffs.iterrows():
-            print(f"  {row['difficulty']:<20} {row['count']:>5}")
-        
-        # Quality
-        print("\n" + "="*80)
-        print("DATA QUALITY")
-        print("="*80)
-        print("  ✅ 100% Company-Specific (organized by folders)")
-        print("  ✅ LeetCode curated questions")
-        print("  ✅ Difficulty levels included")
-        print(f"  ✅ {df['company_name'].nunique()} companies covered")
-        
-        # Samples
-        print("\n" + "-"*80)
-        print("Sample Questions:")
-        print("-"*80)
-        sample = df.sample(min(10, len(df)))
-        for _, row in sample.iterrows():
-            print(f"\n{row['company_name']} [{row['difficulty']}]:")
-            print(f"  {row['interview_question']}")
-        
-        print("\n" + "="*80)
-        print("✅ COMPLETE! Ready to load to Snowflake!")
-        print("="*80)
-        
-        return df
+    seen = SeenIndex(seen_path) if skip_seen else None
+    df, _ = save_results(parse_questions(blobs, seen))
+    remember_seen(seen, df)
+    return df
+
+
+def latest_commit_sha(fetcher):
+    """SHA of the branch head (the API returns just the SHA for this media type), or None"""
+    headers = {
+        'Accept': 'application/vnd.github.sha',
+        'User-Agent': 'JobPrepAI'
+    }
+    try:
+        response = fetcher.get(COMMIT_API_URL, headers=headers, timeout=10, use_cache=False)
+    except Exception as e:
+        print(f"⚠️  Could not check the latest commit: {e}")
+        return None
     
-    return None
+    if response.status_code != 200:
+        print(f"⚠️  Could not check the latest commit: status {response.status_code}")
+        return None
+    return response.text.strip()
+
+
+def load_snapshot_state(path=SNAPSHOT_STATE_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+@span('scrape.github')
+def scrape_github_leetcode_archive(force=False, state_path=SNAPSHOT_STATE_PATH, skip_seen=False,
+                                   seen_path=DEFAULT_INDEX_PATH):
+    """
+    Download the repository once as a codeload tarball and read every
+    <company>/all.csv straight out of the decompressing stream (nothing is
+    extracted to disk). Produces the same rows as scrape_github_leetcode_raw
+    with one download instead of one request per company, and reuses the
+    last CSV when the branch head hasn't moved since it was written.
+    With skip_seen, only rows missing from the shared seen index are saved.
+    """
+    import pandas as pd
     
-    # Save results
-    if all_data:
-        df = pd.DataFrame(all_data)
-        df = df.drop_duplicates(subset=['company_name', 'interview_question'])
-        
-        filename = f'github_leetcode_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        df.to_csv(filename, index=False)
-        
-        print("\n" + "="*80)
-        print("RESULTS")
-        print("="*80)
-        print(f"✓ Total unique questions: {len(df)}")
-        print(f"✓ Saved to: {filename}")
-        
-        # Breakdown
-        print("\n" + "-"*80)
-        print("Questions by Company (Top 20):")
-        print("-"*80)
-        top_companies = df.groupby('company_name').size().reset_index(name='count')
-        top_companies = top_companies.sort_values('count', ascending=False).head(20)
-        for _, row in top_companies.iterrows():
-            print(f"  {row['company_name']:<30} {row['count']:>5}")
-        
-        print("\n" + "-"*80)
-        print("Questions by Difficulty:")
-        print("-"*80)
-        diffs = df.groupby('difficulty').size().reset_index(name='count')
-        for _, row in diffs.iterrows():
-            print(f"  {row['difficulty']:<20} {row['count']:>5}")
-        
-        # Quality
-        print("\n" + "-"*80)
-        print("Data Quality:")
-        print("-"*80)
-        print("  ✅ 100% Company-Specific")
-        print("  ✅ Curated LeetCode questions")
-        print("  ✅ Clean structured data")
-        print(f"  ✅ {len(top_companies)} companies covered")
-        
-        # Samples
-        print("\n" + "-"*80)
-        print("Sample Questions (First 10):")
-        print("-"*80)
-        for idx, row in df.head(10).iterrows():
-            print(f"\n{row['company_name']} [{row['difficulty']}]:")
-            print(f"  {row['interview_question']}")
+    print("GitHub LeetCode Scraper - Repository Snapshot")
+    print("="*80)
+    
+    fetcher = get_fetcher()
+    
+    # Step 1: Has the repository changed since the last run?
+    print("\nStep 1: Checking the latest commit...")
+    sha = latest_commit_sha(fetcher)
+    state = load_snapshot_state(state_path)
+    
+    if sha and not force and state.get('sha') == sha and os.path.exists(state.get('csv', '')):
+        print(f"✓ Snapshot {sha[:7]} unchanged since {state['fetched_at']}, reusing {state['csv']}")
+        return compact_frame(pd.read_csv(state['csv']))
+    
+    # Step 2: Stream the tarball and pull each all.csv member out as it goes by
+    ref = sha or REPO_BRANCH
+    print(f"\nStep 2: Downloading snapshot {ref[:7] if sha else ref}...\n")
+    
+    blobs = []
+    successful = 0
+    failed = 0
+    
+    with span('github.archive', ref=ref) as archive:
+        try:
+            response = fetcher.get(ARCHIVE_URL.format(ref), timeout=30, stream=True)
+        except Exception as e:
+            print(f"✗ Download failed: {e}")
+            return None
         
-        print("\n" + "="*80)
-        print("✅ SCRAPING COMPLETE!")
-        print("="*80)
+        if response.status_code != 200:
+            print(f"✗ Download failed: status {response.status_code}")
+            response.close()
+            return None
         
-        return df
+        # The body is the .tar.gz itself; only a transfer encoding would be undone here
+        response.raw.decode_content = True
+        try:
+            with tarfile.open(fileobj=response.raw, mode='r|gz') as tar:
+                for member in tar:
+                    # <repo>-<sha>/<company folder>/all.csv
+                    parts = member.name.split('/')
+                    if not member.isfile() or len(parts) != 3 or parts[2] != 'all.csv':
+                        continue
+                    
+                    company_name = parts[1].replace('-', ' ').replace('_', ' ').title()
+                    print(f"[{successful + failed + 1}] {company_name:<30}", end=" ")
+                    
+                    with span('github.company', company=company_name) as unit:
+                        try:
+                            data = tar.extractfile(member).read()
+                            blobs.append((company_name, data))
+                            
+                            unit.count('csv_bytes', len(data))
+                            print(f"✓ {len(data) / 1024:5.1f} KB")
+                            successful += 1
+                        except Exception as e:
+                            print(f"✗ {str(e)[:30]}")
+                            failed += 1
+        except (tarfile.TarError, EOFError, OSError) as e:
+            print(f"\n✗ Archive error: {e}")
+            return None
+        finally:
+            archive.count('bytes_fetched', response.raw.tell())
+            response.close()
+    
+    print(f"\n{'='*80}")
+    print(f"Completed: {successful} successful, {failed} failed")
+    print(f"{'='*80}")
     
-    return None
+    seen = SeenIndex(seen_path) if skip_seen else None
+    df, filename = save_results(parse_questions(blobs, seen))
+    remember_seen(seen, df)
+    if df is not None and sha:
+        with open(state_path, 'w', encoding='utf-8') as f:
+            json.dump({'sha': sha, 'csv': filename,
+                       'fetched_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}, f, indent=2)
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape LeetCode company-wise questions from GitHub")
+    parser.add_argument('--mode', choices=['archive', 'files'], default='archive',
+                        help="archive: one repository tarball (default); files: one raw request per company")
+    parser.add_argument('--force', action='store_true',
+                        help="re-download the snapshot even if the repository hasn't changed")
+    parser.add_argument('--skip-seen', action='store_true',
+                        help="only save rows missing from the shared seen-question index (and add them to it)")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+    
+    with profile_run('github', enabled=args.profile):
+        if args.mode == 'archive':
+            scrape_github_leetcode_archive(force=args.force, skip_seen=args.skip_seen)
+        else:
+            scrape_github_leetcode_raw(skip_seen=args.skip_seen)
+    print_summary()
 
 
 if __name__ == "__main__":
-    scrape_github_leetcode_raw()
\ No newline at end of file
+    main()
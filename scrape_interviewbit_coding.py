@@ -1,117 +1,129 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-import pandas as pd
+from browser_pool import BrowserPool
+from records import QuestionRecords
+from enrichment import (DetailCache, enrich_urls, parse_interviewbit_problem, expand_companies,
+                        apply_details, sprite_company_name, DEFAULT_CACHE_PATH, DEFAULT_WORKERS)
+from functools import partial
+from instrumentation import span, count, print_summary
+from profiling import add_profile_argument, profile_run
 from datetime import datetime
+import argparse
 import time
 
-def scrape_interviewbit_complete():
+INTERVIEWBIT_URL = "https://www.interviewbit.com/coding-interview-questions/"
+
+# Company names for the 'ib-<key>' sprite classes on problem tiles
+COMPANY_SPRITES = {
+    'bloomberg': 'Bloomberg', 'google': 'Google', 'amazon': 'Amazon',
+    'microsoft': 'Microsoft', 'facebook': 'Facebook', 'meta': 'Meta',
+    'apple': 'Apple', 'netflix': 'Netflix', 'adobe': 'Adobe',
+    'uber': 'Uber', 'linkedin': 'LinkedIn', 'twitter': 'Twitter',
+    'goldman-sachs': 'Goldman Sachs', 'goldman': 'Goldman Sachs',
+    'goldmann-sachs': 'Goldman Sachs', 'morgan-stanley': 'Morgan Stanley',
+    'morgan': 'Morgan Stanley', 'salesforce': 'Salesforce', 'oracle': 'Oracle',
+    'vmware': 'VMware', 'cisco': 'Cisco', 'paypal': 'PayPal',
+    'ebay': 'eBay', 'airbnb': 'Airbnb', 'flipkart': 'Flipkart',
+    'walmart': 'Walmart', 'yahoo': 'Yahoo', 'samsung': 'Samsung',
+    'intel': 'Intel', 'tesla': 'Tesla', 'de-shaw': 'DE Shaw',
+    'directi': 'Directi', 'tower-research-capital': 'Tower Research',
+    'epic-systems': 'Epic Systems', 'nobrokercom': 'NoBroker',
+    'lyft': 'Lyft', 'intuit': 'Intuit', 'nvidia': 'NVIDIA',
+    'qualcomm': 'Qualcomm', 'visa': 'Visa', 'jpmorgan': 'JPMorgan',
+    'spotify': 'Spotify', 'stripe': 'Stripe', 'snowflake': 'Snowflake'
+}
+
+
+@span('scrape.interviewbit')
+def scrape_interviewbit_complete(headless=True, enrich=True, detail_workers=DEFAULT_WORKERS,
+                                 cache_path=DEFAULT_CACHE_PATH):
     """
     Scrape ALL InterviewBit questions with aggressive scrolling
+    Then fetch each problem page over plain HTTP (cached between runs) for
+    its topics and the full company list the tile sprites truncate
     """
+    from selenium.webdriver.common.by import By
     
     print("InterviewBit Complete Scraper - Aggressive Scroll Mode")
     print("="*80)
     
-    url = "https://www.interviewbit.com/coding-interview-questions/"
+    url = INTERVIEWBIT_URL
     
-    # Company mapping from CSS classes
-    company_mapping = {
-        'bloomberg': 'Bloomberg', 'google': 'Google', 'amazon': 'Amazon',
-        'microsoft': 'Microsoft', 'facebook': 'Facebook', 'meta': 'Meta',
-        'apple': 'Apple', 'netflix': 'Netflix', 'adobe': 'Adobe',
-        'uber': 'Uber', 'linkedin': 'LinkedIn', 'twitter': 'Twitter',
-        'goldman-sachs': 'Goldman Sachs', 'goldman': 'Goldman Sachs',
-        'goldmann-sachs': 'Goldman Sachs', 'morgan-stanley': 'Morgan Stanley',
-        'morgan': 'Morgan Stanley', 'salesforce': 'Salesforce', 'oracle': 'Oracle',
-        'vmware': 'VMware', 'cisco': 'Cisco', 'paypal': 'PayPal',
-        'ebay': 'eBay', 'airbnb': 'Airbnb', 'flipkart': 'Flipkart',
-        'walmart': 'Walmart', 'yahoo': 'Yahoo', 'samsung': 'Samsung',
-        'intel': 'Intel', 'tesla': 'Tesla', 'de-shaw': 'DE Shaw',
-        'directi': 'Directi', 'tower-research-capital': 'Tower Research',
-        'epic-systems': 'Epic Systems', 'nobrokercom': 'NoBroker',
-        'lyft': 'Lyft', 'intuit': 'Intuit', 'nvidia': 'NVIDIA',
-        'qualcomm': 'Qualcomm', 'visa': 'Visa', 'jpmorgan': 'JPMorgan',
-        'spotify': 'Spotify', 'stripe': 'Stripe', 'snowflake': 'Snowflake'
-    }
+    records = QuestionRecords(source='InterviewBit')
     
-    all_data = []
-    driver = None
+    # Stylesheets stay enabled: lazy loading is triggered by the scroll
+    # height, which depends on the page layout
+    pool = BrowserPool(
+        size=1,
+        headless=headless,
+        block_stylesheets=False,
+        experimental_options={
+            'excludeSwitches': ['enable-automation'],
+            'useAutomationExtension': False
+        }
+    )
     
     try:
         # Initialize browser
-        print("\n[1/6] Starting Chrome browser...")
-        
-        options = webdriver.ChromeOptions()
-        # Run visible so you can see it working
-        # options.add_argument('--headless')  # Commented out - visible mode
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        
-        driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=options
-        )
+        print(f"\n[1/6] Starting Chrome browser ({'headless' if headless else 'visible'})...")
+        
+        driver = pool.acquire()
         print("✓ Chrome initialized")
         
         # Load page
         print(f"\n[2/6] Loading page...")
-        driver.get(url)
-        time.sleep(5)
+        with span('interviewbit.load'):
+            driver.get(url)
+            time.sleep(5)
         print("✓ Page loaded")
         
         # Aggressive scrolling
         print("\n[3/6] Aggressive scrolling to load all questions...")
-        print("(This takes 2-3 minutes - watch Chrome window scroll!)\n")
+        print("(This takes 2-3 minutes)\n")
         
         previous_count = 0
         no_change_count = 0
         max_no_change = 5
         
         for iteration in range(50):
-            # AGGRESSIVE MULTI-SCROLL (based on your observation)
-            # Do 5 rapid scrolls to trigger lazy loading
-            for rapid in range(5):
-                # Scroll to absolute bottom
-                driver.execute_script("""
-                    window.scrollTo({
-                        top: document.body.scrollHeight,
-                        behavior: 'smooth'
-                    });
-                """)
-                time.sleep(0.4)
+            with span('interviewbit.scroll', iteration=iteration + 1) as unit:
+                # AGGRESSIVE MULTI-SCROLL (based on your observation)
+                # Do 5 rapid scrolls to trigger lazy loading
+                for rapid in range(5):
+                    # Scroll to absolute bottom
+                    driver.execute_script("""
+                        window.scrollTo({
+                            top: document.body.scrollHeight,
+                            behavior: 'smooth'
+                        });
+                    """)
+                    time.sleep(0.4)
+                    
+                    # Backup scroll method
+                    driver.execute_script("window.scrollBy(0, 10000);")
+                    time.sleep(0.4)
                 
-                # Backup scroll method
-                driver.execute_script("window.scrollBy(0, 10000);")
-                time.sleep(0.4)
-            
-            # Wait for new content
-            time.sleep(3)
-            
-            # Check tile count
-            tiles = driver.find_elements(By.CLASS_NAME, "pl-problem-tile")
-            current_count = len(tiles)
-            
-            print(f"  Iteration {iteration + 1:2d}: {current_count:3d} questions", end="")
-            
-            if current_count == previous_count:
-                no_change_count += 1
-                print(f" (no change #{no_change_count})")
+                # Wait for new content
+                time.sleep(3)
                 
-                if no_change_count >= max_no_change:
-                    print(f"\n✓ Finished! No new content after {max_no_change} attempts")
-                    break
-            else:
-                added = current_count - previous_count
-                no_change_count = 0
-                print(f" (+{added} new) ✓")
-            
-            previous_count = current_count
+                # Check tile count
+                tiles = driver.find_elements(By.CLASS_NAME, "pl-problem-tile")
+                current_count = len(tiles)
+                unit.set(tiles=current_count)
+                
+                print(f"  Iteration {iteration + 1:2d}: {current_count:3d} questions", end="")
+                
+                if current_count == previous_count:
+                    no_change_count += 1
+                    print(f" (no change #{no_change_count})")
+                    
+                    if no_change_count >= max_no_change:
+                        print(f"\n✓ Finished! No new content after {max_no_change} attempts")
+                        break
+                else:
+                    added = current_count - previous_count
+                    no_change_count = 0
+                    print(f" (+{added} new) ✓")
+                
+                previous_count = current_count
         
         final_count = len(driver.find_elements(By.CLASS_NAME, "pl-problem-tile"))
         print(f"\n✓ Total questions loaded: {final_count}")
@@ -122,68 +134,61 @@ def scrape_interviewbit_complete():
         problem_tiles = driver.find_elements(By.CLASS_NAME, "pl-problem-tile")
         processed = set()
         
-        for i, tile in enumerate(problem_tiles):
-            try:
-                # Get question
-                link = tile.find_element(By.CLASS_NAME, "pl-problem-tile__statement")
-                title = link.text.strip()
-                url_q = link.get_attribute('href')
-                
-                if not title or title in processed:
-                    continue
-                processed.add(title)
-                
-                # Get difficulty
-                difficulty = 'Not Specified'
+        with span('interviewbit.extract', tiles=len(problem_tiles)) as unit:
+            for i, tile in enumerate(problem_tiles):
                 try:
-                    diff = tile.find_element(By.CSS_SELECTOR, "[class*='difficulty-level']")
-                    diff_text = diff.text.strip().lower()
-                    if 'easy' in diff_text:
-                        difficulty = 'Easy'
-                    elif 'medium' in diff_text:
-                        difficulty = 'Medium'
-                    elif 'hard' in diff_text:
-                        difficulty = 'Hard'
-                except:
-                    pass
+                    # Get question
+                    link = tile.find_element(By.CLASS_NAME, "pl-problem-tile__statement")
+                    title = link.text.strip()
+                    url_q = link.get_attribute('href')
+                    
+                    if not title or title in processed:
+                        continue
+                    processed.add(title)
+                    
+                    # Get difficulty
+                    difficulty = 'Not Specified'
+                    try:
+                        diff = tile.find_element(By.CSS_SELECTOR, "[class*='difficulty-level']")
+                        diff_text = diff.text.strip().lower()
+                        if 'easy' in diff_text:
+                            difficulty = 'Easy'
+                        elif 'medium' in diff_text:
+                            difficulty = 'Medium'
+                        elif 'hard' in diff_text:
+                            difficulty = 'Hard'
+                    except:
+                        pass
+                    
+                    # Get companies
+                    comp_list = []
+                    try:
+                        sprites = tile.find_elements(By.CSS_SELECTOR, "[class*='ib-company-sprites']")
+                        for sprite in sprites:
+                            classes = sprite.get_attribute('class').split()
+                            for cls in classes:
+                                if cls.startswith('ib-') and cls != 'ib-company-sprites':
+                                    comp_list.append(sprite_company_name(cls[3:], COMPANY_SPRITES))
+                    except:
+                        pass
+                    
+                    comp_list = list(set(comp_list))
+                    if not comp_list:
+                        comp_list = ['Multiple Companies']
+                    
+                    # Add entries
+                    for comp in comp_list:
+                        records.append(comp, title, url_q, difficulty)
+                    
+                    if (i + 1) % 50 == 0:
+                        print(f"  → Processed {i + 1}/{len(problem_tiles)}...")
                 
-                # Get companies
-                comp_list = []
-                try:
-                    sprites = tile.find_elements(By.CSS_SELECTOR, "[class*='ib-company-sprites']")
-                    for sprite in sprites:
-                        classes = sprite.get_attribute('class').split()
-                        for cls in classes:
-                            if cls.startswith('ib-') and cls != 'ib-company-sprites':
-                                key = cls.replace('ib-', '')
-                                if key in company_mapping:
-                                    comp_list.append(company_mapping[key])
                 except:
-                    pass
-                
-                comp_list = list(set(comp_list))
-                if not comp_list:
-                    comp_list = ['Multiple Companies']
-                
-                # Add entries
-                for comp in comp_list:
-                    all_data.append({
-                        'company_name': comp,
-                        'role_name': 'Software Engineer',
-                        'interview_question': title,
-                        'difficulty': difficulty,
-                        'question_url': url_q,
-                        'source': 'InterviewBit',
-                        'date_collected': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    })
-                
-                if (i + 1) % 50 == 0:
-                    print(f"  → Processed {i + 1}/{len(problem_tiles)}...")
+                    continue
             
-            except:
-                continue
+            unit.count('rows', len(records))
         
-        print(f"✓ Extracted {len(all_data)} question-company pairs")
+        print(f"✓ Extracted {len(records)} question-company pairs")
         
         # Save HTML
         print(f"\n[5/6] Saving debug file...")
@@ -193,27 +198,36 @@ def scrape_interviewbit_complete():
         
         # Close browser
         print(f"\n[6/6] Closing browser...")
-        driver.quit()
+        pool.close()
         print("✓ Done")
         
     except Exception as e:
         print(f"\n✗ Error: {e}")
         import traceback
         traceback.print_exc()
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
+        pool.close()
         return None
     
     # Save results
-    if all_data:
-        df = pd.DataFrame(all_data)
+    if records:
+        df = records.to_frame()
+        
+        if enrich:
+            cache = DetailCache(cache_path)
+            try:
+                details = enrich_urls(df['question_url'], partial(parse_interviewbit_problem, sprite_names=COMPANY_SPRITES),
+                                      cache=cache, name='interviewbit', workers=detail_workers)
+                df = apply_details(expand_companies(df, details), details)
+            except Exception as e:
+                print(f"⚠️  Enrichment failed ({str(e)[:60]}), saving the listing data only")
+            finally:
+                cache.close()
+        
         df = df.drop_duplicates(subset=['company_name', 'interview_question'])
         
         filename = f'interviewbit_full_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
         df.to_csv(filename, index=False)
+        count('rows', len(df))
         
         print("\n" + "="*80)
         print("FINAL RESULTS")
@@ -245,5 +259,22 @@ def scrape_interviewbit_complete():
     return None
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape InterviewBit coding questions")
+    parser.add_argument('--no-enrich', action='store_true',
+                        help="skip fetching each problem page for topics and companies")
+    parser.add_argument('--detail-workers', type=int, default=DEFAULT_WORKERS,
+                        help="problem pages fetched concurrently")
+    parser.add_argument('--detail-cache', default=DEFAULT_CACHE_PATH,
+                        help="SQLite cache of parsed problem pages")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+    
+    with profile_run('interviewbit', enabled=args.profile):
+        scrape_interviewbit_complete(enrich=not args.no_enrich, detail_workers=args.detail_workers,
+                                     cache_path=args.detail_cache)
+    print_summary()
+
+
 if __name__ == "__main__":
-    scrape_interviewbit_complete()
\ No newline at end of file
+    main()
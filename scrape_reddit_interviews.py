@@ -1,107 +1,171 @@
-import requests
-import pandas as pd
 from datetime import datetime
-import time
+import argparse
+import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from http_fetch import get_fetcher, HOST_RATES
+from records import QuestionRecords
+from instrumentation import span, bind, count, print_summary
+from profiling import add_profile_argument, profile_run
+
+# Focus on technical subreddits only
+SUBREDDITS = [
+    'csinterviewproblems',  # Most technical
+    'leetcode',              # Coding focused
+    'ExperiencedDevs'        # Professional discussions
+]
+
+# More specific search queries
+SEARCH_QUERIES = [
+    'asked to implement',
+    'asked to design',
+    'asked to code',
+    'technical question',
+    'algorithm question',
+    'coding question asked'
+]
 
-def scrape_reddit_technical_questions():
+# Comment mining: only posts that name a company in an interview context.
+# Searches and comment fetches share reddit's token bucket (HOST_RATES,
+# 0.5 req/s), so more workers would only queue on the limiter: two keep a
+# fetch in flight while the other waits for a token. A post costs 1 +
+# up to MAX_MORE_BATCHES requests, i.e. ~2-8 s of the rate budget.
+COMMENT_WORKERS = 2
+MORE_CHILDREN_BATCH = 100     # ids per /api/morechildren call (Reddit's maximum)
+MAX_MORE_BATCHES = 3          # morechildren calls per post at most
+
+# Archive dumps (one JSON object per line, zstd-compressed, e.g. RS_2024-01.zst)
+DUMP_READ_SIZE = 16 * 1024 * 1024
+DUMP_BATCH_LINES = 2000
+DUMP_MAX_WINDOW = 2 ** 31     # the monthly dumps are compressed with --long=31
+
+@span('scrape.reddit')
+def scrape_reddit_technical_questions(comments=True, comment_workers=COMMENT_WORKERS,
+                                      max_more_batches=MAX_MORE_BATCHES, sink=None):
     """
     Fixed Reddit scraper - only technical questions with proper company extraction
+    With `comments`, the comment trees of posts that name a company are mined
+    too (on a bounded pool, while the searches continue). With a `sink`
+    (a StreamingLoader), new rows are pushed to it after every query.
     """
-    
     print("Reddit Technical Interview Questions Scraper (Fixed)")
     print("="*80)
     
-    all_data = []
-    
-    # Focus on technical subreddits only
-    subreddits = [
-        'csinterviewproblems',  # Most technical
-        'leetcode',              # Coding focused
-        'ExperiencedDevs'        # Professional discussions
-    ]
+    records = QuestionRecords()
     
-    # More specific search queries
-    search_queries = [
-        'asked to implement',
-        'asked to design',
-        'asked to code',
-        'technical question',
-        'algorithm question',
-        'coding question asked'
-    ]
+    subreddits = SUBREDDITS
+    search_queries = SEARCH_QUERIES
     
     headers = {
         'User-Agent': 'JobPrepAI Scraper v2.0'
     }
     
+    # Pooled session with retries/backoff; pacing comes from the per-host
+    # token bucket instead of a fixed sleep after every request
+    fetcher = get_fetcher()
+    
     print(f"\nSearching {len(subreddits)} technical subreddits...")
     print("(Takes ~2 minutes)\n")
     
+    # post id -> pending comment-mining future; a post found by several queries is mined once
+    comment_jobs = {}
+    executor = ThreadPoolExecutor(max_workers=comment_workers) if comments else None
+    # Bound here so the workers' spans nest under this scrape, not the query that found the post
+    mine_comments = bind(mine_post_comments)
+    
     for subreddit in subreddits:
         print(f"📍 r/{subreddit}")
         print("-"*60)
         
         for query in search_queries:
-            try:
-                url = f'https://www.reddit.com/r/{subreddit}/search.json'
-                params = {
-                    'q': query,
-                    'restrict_sr': 'true',
-                    'sort': 'relevance',  # Changed to relevance
-                    'limit': 50,          # Increased limit
-                    't': 'all'            # All time for more data
-                }
-                
-                response = requests.get(url, headers=headers, params=params, timeout=10)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    posts = data.get('data', {}).get('children', [])
+            with span('reddit.query', subreddit=subreddit, query=query) as unit:
+                try:
+                    url = f'https://www.reddit.com/r/{subreddit}/search.json'
+                    params = {
+                        'q': query,
+                        'restrict_sr': 'true',
+                        'sort': 'relevance',  # Changed to relevance
+                        'limit': 50,          # Increased limit
+                        't': 'all'            # All time for more data
+                    }
                     
-                    questions_found = 0
+                    response = fetcher.get(url, headers=headers, params=params, timeout=10)
                     
-                    for post in posts:
-                        post_data = post.get('data', {})
-                        title = post_data.get('title', '')
-                        selftext = post_data.get('selftext', '')
-                        permalink = post_data.get('permalink', '')
+                    if response.status_code == 200:
+                        data = response.json()
+                        posts = data.get('data', {}).get('children', [])
                         
-                        # Extract company (more conservative)
-                        company = extract_company_conservative(title, selftext)
+                        questions_found = 0
                         
-                        # Only process if we found a real company
-                        if company != 'SKIP':
-                            # Extract technical questions only
-                            questions = extract_technical_questions(title, selftext)
+                        for post in posts:
+                            post_data = post.get('data', {})
+                            title = post_data.get('title', '')
+                            selftext = post_data.get('selftext', '')
+                            permalink = post_data.get('permalink', '')
+                            
+                            # Extract company (more conservative)
+                            company = extract_company_conservative(title, selftext)
                             
-                            for q in questions:
-                                all_data.append({
-                                    'company_name': company,
-                                    'role_name': 'Software Engineer',
-                                    'interview_question': q,
-                                    'difficulty': 'Not Specified',
-                                    'question_url': f"https://reddit.com{permalink}",
-                                    'source': f'Reddit - r/{subreddit}',
-                                    'date_collected': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                })
-                                questions_found += 1
+                            # Only process if we found a real company
+                            if company != 'SKIP':
+                                post_id = post_data.get('id')
+                                if executor is not None and post_id and post_id not in comment_jobs:
+                                    comment_jobs[post_id] = (company, subreddit, executor.submit(
+                                        mine_comments, fetcher, post_id, headers, max_more_batches))
+                                
+                                # Extract technical questions only
+                                questions = extract_technical_questions(title, selftext)
+                                
+                                for q in questions:
+                                    records.append(company, q, f"https://reddit.com{permalink}",
+                                                   source=f'Reddit - r/{subreddit}')
+                                    questions_found += 1
+                        
+                        unit.count('posts', len(posts))
+                        unit.count('rows', questions_found)
+                        
+                        if questions_found > 0:
+                            print(f"  '{query[:25]}...' → {questions_found} technical questions")
                     
-                    if questions_found > 0:
-                        print(f"  '{query[:25]}...' → {questions_found} technical questions")
-                
-                time.sleep(2)
-                
+                    else:
+                        print(f"  ✗ '{query[:25]}...' failed after retries: Status {response.status_code}")
+                    
+                except Exception as e:
+                    print(f"  ✗ Error: {e}")
+            
+            if sink is not None:
+                sink.put(records.take_new())
+    
+    if executor is not None:
+        pending = sum(not future.done() for _, _, future in comment_jobs.values())
+        per_post = (1 + max_more_batches) / HOST_RATES['www.reddit.com']
+        print(f"\n💬 Mining comments of {len(comment_jobs)} company posts "
+              f"({pending} left, up to ~{pending * per_post / 60:.0f} min at the reddit rate limit)...")
+        comment_questions = 0
+        for company, subreddit, future in comment_jobs.values():
+            try:
+                found = future.result()
             except Exception as e:
-                print(f"  ✗ Error: {e}")
+                print(f"  ✗ Comments: {e}")
+                continue
+            for q, permalink in found:
+                records.append(company, q, f"https://reddit.com{permalink}",
+                               source=f'Reddit - r/{subreddit}')
+            comment_questions += len(found)
+            if sink is not None:
+                sink.put(records.take_new())
+        executor.shutdown()
+        print(f"  → {comment_questions} technical questions from comments")
     
     # Save results
-    if all_data:
-        df = pd.DataFrame(all_data)
+    if records:
+        df = records.to_frame()
         df = df.drop_duplicates(subset=['interview_question'])
         
         filename = f'reddit_technical_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
         df.to_csv(filename, index=False)
+        count('rows', len(df))
         
         print("\n" + "="*80)
         print("RESULTS")
@@ -267,5 +331,228 @@ def extract_technical_questions(title, text):
     return questions
 
 
+def walk_comments(children):
+    """
+    Yield (kind, data) for every thing in a comment listing, depth first,
+    without building a flattened copy of the tree (an explicit stack, so
+    deep threads don't hit the recursion limit)
+    """
+    stack = list(reversed(children))
+    while stack:
+        child = stack.pop()
+        kind, data = child.get('kind'), child.get('data') or {}
+        yield kind, data
+        replies = data.get('replies')
+        if kind == 't1' and isinstance(replies, dict):
+            stack.extend(reversed(replies.get('data', {}).get('children', [])))
+
+
+def iter_post_comments(fetcher, post_id, headers=None, max_more_batches=MAX_MORE_BATCHES):
+    """
+    Yield (body, permalink) for each comment of a post: the comment page
+    first, then 'more' stubs expanded through /api/morechildren in batches
+    of up to 100 ids (at most `max_more_batches` calls per post)
+    """
+    response = fetcher.get(f'https://www.reddit.com/comments/{post_id}.json', headers=headers,
+                           params={'limit': 500, 'raw_json': 1}, timeout=10)
+    if response.status_code != 200:
+        return
+    listing = response.json()
+    if not isinstance(listing, list) or len(listing) < 2:
+        return
+    
+    more_ids = []
+    things = listing[1].get('data', {}).get('children', [])
+    batches = 0
+    while True:
+        for kind, data in walk_comments(things):
+            if kind == 't1':
+                count('comments')
+                yield data.get('body', ''), data.get('permalink', '')
+            elif kind == 'more':
+                more_ids.extend(data.get('children', []))
+        
+        if not more_ids or batches >= max_more_batches:
+            break
+        batch, more_ids = more_ids[:MORE_CHILDREN_BATCH], more_ids[MORE_CHILDREN_BATCH:]
+        batches += 1
+        count('more_batches')
+        response = fetcher.get('https://www.reddit.com/api/morechildren.json', headers=headers, params={
+            'api_type': 'json',
+            'link_id': f't3_{post_id}',
+            'children': ','.join(batch),
+            'limit_children': 'false',
+            'raw_json': 1
+        }, timeout=10)
+        if response.status_code != 200:
+            break
+        # A flat list of comments (and further stubs), parents before children
+        things = response.json().get('json', {}).get('data', {}).get('things', [])
+
+
+def mine_post_comments(fetcher, post_id, headers=None, max_more_batches=MAX_MORE_BATCHES):
+    """Technical questions found in a post's comments, as (question, comment permalink)"""
+    found = []
+    with span('reddit.comments', post=post_id) as unit:
+        for body, permalink in iter_post_comments(fetcher, post_id, headers, max_more_batches):
+            for q in extract_technical_questions('', body):
+                found.append((q, permalink))
+        unit.count('rows', len(found))
+    return found
+
+
+def subreddit_prefilter(subreddits):
+    """
+    Byte pattern for '"subreddit":"<name>"' so lines from other subreddits
+    are dropped before any JSON parsing (quotes inside string values are
+    escaped, so the key can't be spoofed by post text)
+    """
+    names = b'|'.join(re.escape(name.lower().encode('utf-8')) for name in subreddits)
+    return re.compile(rb'"subreddit"\s*:\s*"(?:' + names + rb')"', re.IGNORECASE)
+
+
+def iter_dump_lines(path, read_size=DUMP_READ_SIZE):
+    """
+    Stream-decompress a .zst NDJSON dump and yield its lines as bytes;
+    memory stays at one read buffer plus a partial line, whatever the file size
+    """
+    import zstandard
+    
+    decompressor = zstandard.ZstdDecompressor(max_window_size=DUMP_MAX_WINDOW)
+    with open(path, 'rb') as f:
+        reader = decompressor.stream_reader(f, read_across_frames=True)
+        tail = b''
+        while True:
+            chunk = reader.read(read_size)
+            if not chunk:
+                break
+            lines = (tail + chunk).split(b'\n')
+            tail = lines.pop()
+            count('dump_bytes_decompressed', len(chunk))
+            yield from lines
+        if tail:
+            yield tail
+
+
+@span('scrape.reddit_dump')
+def ingest_reddit_dumps(paths, workers=None, subreddits=SUBREDDITS, batch_lines=DUMP_BATCH_LINES, sink=None):
+    """
+    Backfill from monthly Reddit archive dumps (submissions and/or comments)
+    
+    Each file is stream-decompressed, lines are prefiltered on their raw
+    bytes by subreddit, and the survivors are parsed and run through the
+    extractors in batches on a process pool. At most 2 batches per worker
+    are in flight, so memory doesn't grow with the file. With a `sink`,
+    each batch's questions are pushed to it as soon as they are collected.
+    """
+    print("Reddit Archive Dump Ingestion")
+    print("="*80)
+    
+    # The worker lives in its own module so it pickles by an importable
+    # name however this file was started (script, jobprep, import)
+    from reddit_dump_worker import extract_dump_batch
+    
+    workers = workers or os.cpu_count() or 1
+    prefilter = subreddit_prefilter(subreddits)
+    records = QuestionRecords()
+    totals = {'compressed': 0, 'lines': 0, 'matched': 0, 'parsed': 0}
+    
+    def collect(futures):
+        for future in futures:
+            found, parsed = future.result()
+            totals['parsed'] += parsed
+            for company, q, permalink, subreddit in found:
+                records.append(company, q, f"https://reddit.com{permalink}", source=f'Reddit - r/{subreddit}')
+        if sink is not None:
+            sink.put(records.take_new())
+    
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path in paths:
+            print(f"\n📦 {path} ({os.path.getsize(path) / (1024 * 1024):.1f} MB compressed)")
+            with span('reddit.dump', path=os.path.basename(path)) as unit:
+                in_flight = set()
+                batch = []
+                for line in iter_dump_lines(path):
+                    totals['lines'] += 1
+                    if not prefilter.search(line):
+                        continue
+                    batch.append(line)
+                    if len(batch) >= batch_lines:
+                        totals['matched'] += len(batch)
+                        in_flight.add(executor.submit(extract_dump_batch, batch, subreddits))
+                        batch = []
+                        if len(in_flight) >= 2 * workers:
+                            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                            collect(done)
+                if batch:
+                    totals['matched'] += len(batch)
+                    in_flight.add(executor.submit(extract_dump_batch, batch, subreddits))
+                collect(in_flight)
+                
+                totals['compressed'] += os.path.getsize(path)
+                unit.count('dump_bytes', os.path.getsize(path))
+    seconds = time.perf_counter() - start
+    
+    count('lines', totals['lines'])
+    count('matched', totals['matched'])
+    count('rows', len(records))
+    
+    print(f"\n{'='*80}")
+    print(f"Scanned {totals['lines']:,} posts/comments in {seconds:.1f}s: "
+          f"{totals['compressed'] / (1024 * 1024) / seconds:.1f} MB/s compressed, "
+          f"{totals['lines'] / seconds:,.0f} posts/s")
+    print(f"{totals['matched']:,} passed the subreddit prefilter, {totals['parsed']:,} parsed, "
+          f"{len(records):,} technical questions")
+    print(f"{'='*80}")
+    
+    if not records:
+        return None
+    
+    df = records.to_frame().drop_duplicates(subset=['interview_question'])
+    filename = f'reddit_dump_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    df.to_csv(filename, index=False)
+    print(f"✓ {len(df)} unique questions saved to: {filename}")
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape technical interview questions from Reddit")
+    parser.add_argument('--no-comments', action='store_true', help="only search post titles and text")
+    parser.add_argument('--comment-workers', type=int, default=COMMENT_WORKERS,
+                        help="concurrent comment fetches (all share reddit's 0.5 req/s limit)")
+    parser.add_argument('--more-batches', type=int, default=MAX_MORE_BATCHES,
+                        help="/api/morechildren calls per post at most")
+    parser.add_argument('--dump', nargs='+', metavar='FILE',
+                        help="ingest Reddit archive dumps (.zst NDJSON submissions/comments) instead of searching")
+    parser.add_argument('--workers', type=int, help="processes for --dump (default: CPU count)")
+    from storage_backends import BACKENDS
+    parser.add_argument('--stream', action='store_true',
+                        help="merge questions into the warehouse while scraping (micro-batches)")
+    parser.add_argument('--backend', choices=list(BACKENDS),
+                        help="storage backend for --stream (default: $JOBPREP_BACKEND or snowflake)")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+    
+    sink = None
+    if args.stream:
+        from storage_backends import get_backend
+        from streaming_ingest import StreamingLoader
+        sink = StreamingLoader(get_backend(args.backend)).start()
+    
+    try:
+        with profile_run('reddit', enabled=args.profile):
+            if args.dump:
+                ingest_reddit_dumps(args.dump, workers=args.workers, sink=sink)
+            else:
+                scrape_reddit_technical_questions(comments=not args.no_comments, comment_workers=args.comment_workers,
+                                                  max_more_batches=args.more_batches, sink=sink)
+    finally:
+        if sink is not None:
+            sink.close()
+            sink.print_summary()
+    print_summary()
+
+
 if __name__ == "__main__":
-    scrape_reddit_technical_questions()
\ No newline at end of file
+    main()
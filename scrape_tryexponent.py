@@ -1,155 +1,273 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from browser_pool import BrowserPool
+from records import QuestionRecords
+from seen_index import SeenIndex, question_key, DEFAULT_INDEX_PATH
+from enrichment import DetailCache, enrich_urls, parse_tryexponent_question, apply_details, DEFAULT_CACHE_PATH, DEFAULT_WORKERS
+from instrumentation import span, bind, count, print_summary
+from profiling import add_profile_argument, profile_run
 from datetime import datetime
+import argparse
+import json
 import time
 
+BASE_URL = "https://www.tryexponent.com/questions?page={}"
+MAX_PAGES = 221
 
-def scrape_tryexponent_updated():
+# Incremental crawls: every question URL seen so far and the last full sweep
+STATE_PATH = ".tryexponent_state.json"
+STOP_AFTER_KNOWN_PAGES = 3
+FULL_SWEEP_DAYS = 7
+
+
+def scrape_tryexponent_page(driver, page, seen=None):
     """
-    Stable TryExponent scraper using direct page navigation
+    Load one listing page in a leased browser and extract its questions
+    Questions already in the `seen` index are skipped before their
+    companies and role are read
+    Returns (rows, number of <li> elements, questions extracted, every question URL on the page)
     """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
 
-    print("TryExponent Scraper - STABLE VERSION")
-    print("=" * 80)
+    rows = []
+    question_urls = []
 
-    base_url = "https://www.tryexponent.com/questions?page={}"
-    max_pages = 221
-    all_data = []
+    # Navigation + render wait, timed apart from the element extraction below
+    with span('tryexponent.load', page=page):
+        driver.get(BASE_URL.format(page))
 
-    driver = None
+        # Wait until questions load
+        WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "li")))
 
-    try:
-        # ----------------------
-        # 1️⃣ Setup Chrome
-        # ----------------------
-        print("\n[1/5] Starting Chrome...")
+    question_lis = driver.find_elements(By.TAG_NAME, "li")
 
-        options = webdriver.ChromeOptions()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument("--disable-blink-features=AutomationControlled")
+    extracted_this_page = 0
 
-        driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=options
-        )
+    for li in question_lis:
+        try:
+            links = li.find_elements(By.TAG_NAME, "a")
 
-        wait = WebDriverWait(driver, 15)
+            question_link = None
 
-        print("✓ Browser Ready")
+            for link in links:
+                href = link.get_attribute("href") or ""
 
-        # ----------------------
-        # 2️⃣ Scrape Pages
-        # ----------------------
-        print("\n[2/5] Scraping ALL pages...")
-        print("This will take ~15 minutes ☕\n")
+                if (
+                    "/questions/" in href
+                    and "?company=" not in href
+                    and "/questions?" not in href
+                ):
+                    question_link = link
+                    break
 
-        for page in range(1, max_pages + 1):
+            if not question_link:
+                continue
 
-            print(f"\nPage {page}/{max_pages}")
+            question_title = question_link.text.strip()
+            question_url = question_link.get_attribute("href")
 
-            driver.get(base_url.format(page))
+            if not question_title or len(question_title) < 10:
+                continue
 
-            # Wait until questions load
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "li")))
+            question_urls.append(question_url)
+            if seen is not None and question_key(url=question_url) in seen:
+                continue
 
-            question_lis = driver.find_elements(By.TAG_NAME, "li")
+            # Extract companies
+            companies = []
 
-            print(f"Found {len(question_lis)} <li> elements")
+            for link in links:
+                href = link.get_attribute("href") or ""
 
-            extracted_this_page = 0
+                if "?company=" in href or "&company=" in href:
+                    comp_name = link.text.strip()
+                    if comp_name:
+                        companies.append(comp_name)
 
-            for li in question_lis:
-                try:
-                    links = li.find_elements(By.TAG_NAME, "a")
+            if not companies:
+                companies = ["Multiple Companies"]
 
-                    question_link = None
+            # Detect role
+            li_text = li.text
+            role = "Software Engineer"
 
-                    for link in links:
-                        href = link.get_attribute("href") or ""
+            if "Product Manager" in li_text:
+                role = "Product Manager"
+            elif "Machine Learning Engineer" in li_text or "ML Engineer" in li_text:
+                role = "ML Engineer"
+            elif "Technical Program Manager" in li_text or "TPM" in li_text:
+                role = "Technical Program Manager"
 
-                        if (
-                            "/questions/" in href
-                            and "?company=" not in href
-                            and "/questions?" not in href
-                        ):
-                            question_link = link
-                            break
+            for company in companies:
+                rows.append({
+                    "company_name": company,
+                    "role_name": role,
+                    "interview_question": question_title,
+                    "difficulty": "Not Specified",
+                    "question_url": question_url,
+                    "source": "TryExponent",
+                })
 
-                    if not question_link:
-                        continue
+            extracted_this_page += 1
 
-                    question_title = question_link.text.strip()
-                    question_url = question_link.get_attribute("href")
+        except Exception:
+            continue
 
-                    if not question_title or len(question_title) < 10:
-                        continue
+    return rows, len(question_lis), extracted_this_page, question_urls
 
-                    # Extract companies
-                    companies = []
 
-                    for link in links:
-                        href = link.get_attribute("href") or ""
+def load_crawl_state(path=STATE_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    # Per-page fingerprints written by older versions (unused)
+    state.pop("pages", None)
+    state.setdefault("known_urls", [])
+    state.setdefault("last_full_sweep", None)
+    return state
 
-                        if "?company=" in href or "&company=" in href:
-                            comp_name = link.text.strip()
-                            if comp_name:
-                                companies.append(comp_name)
 
-                    if not companies:
-                        companies = ["Multiple Companies"]
+def save_crawl_state(state, path=STATE_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
 
-                    # Detect role
-                    li_text = li.text
-                    role = "Software Engineer"
 
-                    if "Product Manager" in li_text:
-                        role = "Product Manager"
-                    elif "Machine Learning Engineer" in li_text or "ML Engineer" in li_text:
-                        role = "ML Engineer"
-                    elif "Technical Program Manager" in li_text or "TPM" in li_text:
-                        role = "Technical Program Manager"
+def full_sweep_due(state, full_sweep_days=FULL_SWEEP_DAYS):
+    last = state["last_full_sweep"]
+    return last is None or time.time() - last >= full_sweep_days * 24 * 60 * 60
 
-                    for company in companies:
-                        all_data.append({
-                            "company_name": company,
-                            "role_name": role,
-                            "interview_question": question_title,
-                            "difficulty": "Not Specified",
-                            "question_url": question_url,
-                            "source": "TryExponent",
-                            "date_collected": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        })
 
-                    extracted_this_page += 1
+@span('scrape.tryexponent')
+def scrape_tryexponent_updated(browsers=3, enrich=True, detail_workers=DEFAULT_WORKERS,
+                               cache_path=DEFAULT_CACHE_PATH, incremental=False,
+                               stop_after=STOP_AFTER_KNOWN_PAGES, full_sweep_days=FULL_SWEEP_DAYS,
+                               state_path=STATE_PATH, skip_seen=False, seen_path=DEFAULT_INDEX_PATH):
+    """
+    Stable TryExponent scraper using direct page navigation
+    Pages are spread over a pool of reusable headless browsers; each
+    question page is then fetched over plain HTTP (cached between runs) for
+    its difficulty, tags, question type and asked-date
 
-                except Exception:
-                    continue
+    Incremental runs read pages in order and stop after `stop_after`
+    consecutive pages holding only known question URLs (new questions land
+    on the first pages), with a full sweep every `full_sweep_days`
 
-            print(f"Extracted {extracted_this_page} questions")
+    With skip_seen, questions already in the shared seen index are left
+    out at extraction time and the saved ones are added to it
+    """
+    print("TryExponent Scraper - STABLE VERSION")
+    print("=" * 80)
 
-            # Light throttle to avoid bot detection
-            time.sleep(2)
+    max_pages = MAX_PAGES
+    records = QuestionRecords(source="TryExponent")
+
+    state = load_crawl_state(state_path)
+    known_urls = set(state["known_urls"])
+    early_stop = incremental and not full_sweep_due(state, full_sweep_days)
+    seen = SeenIndex(seen_path) if skip_seen else None
+
+    pool = BrowserPool(size=browsers)
+
+    def scrape_page(page):
+        with span('tryexponent.page', page=page) as unit:
+            lease_start = time.perf_counter()
+            with pool.lease() as driver:
+                unit.count('browser_wait_seconds', time.perf_counter() - lease_start)
+                result = scrape_tryexponent_page(driver, page, seen)
+                unit.count('rows', len(result[0]))
+                # Light throttle per browser to avoid bot detection
+                time.sleep(2)
+        return result
+
+    try:
+        # ----------------------
+        # 1️⃣ Setup Chrome
+        # ----------------------
+        print(f"\n[1/5] Browser pool: up to {browsers} headless Chrome instance(s)")
+
+        # ----------------------
+        # 2️⃣ Scrape Pages
+        # ----------------------
+        if early_stop:
+            print(f"\n[2/5] Scraping new pages (stop after {stop_after} pages of known questions)...")
+        else:
+            print("\n[2/5] Scraping ALL pages...")
+            print(f"This will take ~{15 // browsers + 1} minutes ☕\n")
+
+        crawled_urls = set()
+        failed_pages = 0
+        known_streak = 0
+        stopped_at = None
+
+        with ThreadPoolExecutor(max_workers=browsers) as executor:
+            # Pages are submitted only a pool's width ahead of the one being
+            # read, so an early stop wastes at most `browsers` page loads
+            pages = iter(range(1, max_pages + 1))
+            pending = deque()
+
+            def submit_next():
+                page = next(pages, None)
+                if page is not None:
+                    pending.append((page, executor.submit(bind(scrape_page), page)))
+
+            for _ in range(browsers):
+                submit_next()
+
+            while pending:
+                page, future = pending.popleft()
+                try:
+                    rows, li_count, extracted, page_urls = future.result()
+                except Exception as e:
+                    print(f"\nPage {page}/{max_pages}: ✗ {str(e)[:60]}")
+                    failed_pages += 1
+                    known_streak = 0
+                    submit_next()
+                    continue
+
+                records.extend(rows)
+                print(f"\nPage {page}/{max_pages}")
+                print(f"Found {li_count} <li> elements")
+                print(f"Extracted {extracted} questions")
+
+                urls = set(page_urls)
+                new_urls = urls - known_urls
+                crawled_urls |= urls
+                known_streak = 0 if new_urls else known_streak + 1
+                print(f"{len(new_urls)} new question(s)")
+
+                if early_stop and known_streak >= stop_after:
+                    stopped_at = page
+                    for _, queued in pending:
+                        queued.cancel()
+                    break
+                submit_next()
+
+        if stopped_at is not None:
+            print(f"\n✓ Stopped at page {stopped_at}/{max_pages}: "
+                  f"{stop_after} consecutive pages with no new questions")
+        elif not failed_pages:
+            state["last_full_sweep"] = time.time()
+        # Saved only once the rows are in a CSV, or a failed run would
+        # leave its questions marked known until the next full sweep
+        state["known_urls"] = sorted(known_urls | crawled_urls)
 
         # ----------------------
         # 3️⃣ Close Browser
         # ----------------------
-        print("\n[3/5] Closing browser...")
-        driver.quit()
+        print("\n[3/5] Closing browsers...")
+        pool.close()
 
-        print("✓ Browser Closed")
+        print("✓ Browsers Closed")
 
     except Exception as e:
         print(f"\n✗ Error: {e}")
-        if driver:
-            driver.quit()
+        pool.close()
+        if seen is not None:
+            seen.close()
         return None
 
     # ----------------------
@@ -157,19 +275,41 @@ def scrape_tryexponent_updated():
     # ----------------------
     print("\n[4/5] Processing Data...")
 
-    if not all_data:
-        print("No data extracted.")
+    if not records:
+        print("No new questions extracted." if seen is not None else "No data extracted.")
+        save_crawl_state(state, state_path)
+        if seen is not None:
+            seen.print_stats()
+            seen.close()
         return None
 
-    df = pd.DataFrame(all_data)
+    df = records.to_frame()
 
     df = df.drop_duplicates(
         subset=["company_name", "interview_question"]
     )
 
+    if enrich:
+        cache = DetailCache(cache_path)
+        try:
+            df = apply_details(df, enrich_urls(df["question_url"], parse_tryexponent_question, cache=cache,
+                                               name="tryexponent", workers=detail_workers))
+        except Exception as e:
+            print(f"⚠️  Enrichment failed ({str(e)[:60]}), saving the listing data only")
+            enrich = False
+        finally:
+            cache.close()
+
     filename = f"tryexponent_updated_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
 
     df.to_csv(filename, index=False)
+    count('rows', len(df))
+    save_crawl_state(state, state_path)
+
+    if seen is not None:
+        seen.add_frame(df, source="TryExponent", per_company=False)
+        seen.print_stats()
+        seen.close()
 
     # ----------------------
     # 5️⃣ Summary
@@ -180,6 +320,9 @@ def scrape_tryexponent_updated():
 
     print(f"Total Questions: {len(df)}")
     print(f"Saved to: {filename}")
+    if enrich:
+        print(f"With difficulty: {int((df['difficulty'] != 'Not Specified').sum())}, "
+              f"with tags: {int(df['tags'].notna().sum())}")
 
     specific = len(df[df["company_name"] != "Multiple Companies"])
     total = len(df)
@@ -205,5 +348,32 @@ def scrape_tryexponent_updated():
     return df
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape TryExponent interview questions")
+    parser.add_argument('--incremental', action='store_true',
+                        help="stop after --stop-after pages of already-known questions")
+    parser.add_argument('--stop-after', type=int, default=STOP_AFTER_KNOWN_PAGES,
+                        help="consecutive known pages that end an incremental crawl")
+    parser.add_argument('--full-sweep-days', type=float, default=FULL_SWEEP_DAYS,
+                        help="incremental runs still crawl every page if the last full sweep is older than this")
+    parser.add_argument('--skip-seen', action='store_true',
+                        help="skip questions already in the shared seen-question index (and add new ones to it)")
+    parser.add_argument('--no-enrich', action='store_true',
+                        help="skip fetching each question page for difficulty/tags/type/date")
+    parser.add_argument('--detail-workers', type=int, default=DEFAULT_WORKERS,
+                        help="question pages fetched concurrently")
+    parser.add_argument('--detail-cache', default=DEFAULT_CACHE_PATH,
+                        help="SQLite cache of parsed question pages")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+    
+    with profile_run('tryexponent', enabled=args.profile):
+        scrape_tryexponent_updated(enrich=not args.no_enrich, detail_workers=args.detail_workers,
+                                   cache_path=args.detail_cache, incremental=args.incremental,
+                                   stop_after=args.stop_after, full_sweep_days=args.full_sweep_days,
+                                   skip_seen=args.skip_seen)
+    print_summary()
+
+
 if __name__ == "__main__":
-    scrape_tryexponent_updated()
\ No newline at end of file
+    main()
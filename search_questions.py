@@ -0,0 +1,235 @@
+import sqlite3
+import argparse
+import re
+import time
+import glob
+import os
+import statistics
+
+DEFAULT_INDEX_PATH = 'question_search.sqlite'
+
+# Used by --benchmark when no query file is given
+BENCHMARK_QUERIES = [
+    'LRU cache', 'design rate limiter', 'two sum', 'binary tree', 'linked list',
+    'dynamic programming', 'merge intervals', 'system design', 'graph', 'heap'
+]
+
+FACET_COLUMNS = ['company_name', 'difficulty', 'source']
+
+
+class QuestionSearchIndex:
+    """
+    Local full-text index over interview questions (SQLite FTS5, BM25 ranking)
+
+    Rows are keyed by (company_name, interview_question), the same key the
+    warehouse MERGE uses, so adding a loader batch only indexes rows that
+    are new - there is never a full rebuild.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self.latencies = []
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS questions (
+                id INTEGER PRIMARY KEY,
+                company_name TEXT,
+                role_name TEXT,
+                interview_question TEXT,
+                difficulty TEXT,
+                question_url TEXT,
+                source TEXT,
+                date_collected TEXT,
+                UNIQUE (company_name, interview_question)
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+                interview_question,
+                content='questions',
+                content_rowid='id',
+                tokenize='porter unicode61'
+            );
+            CREATE TRIGGER IF NOT EXISTS questions_ai AFTER INSERT ON questions BEGIN
+                INSERT INTO questions_fts (rowid, interview_question)
+                VALUES (new.id, new.interview_question);
+            END;
+        """)
+        self._conn.commit()
+
+    def count(self):
+        return self._conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+    def add_records(self, df):
+        """Index new rows from a loader/scraper DataFrame; returns how many were added"""
+        columns = ['company_name', 'role_name', 'interview_question', 'difficulty',
+                   'question_url', 'source', 'date_collected']
+        before = self.count()
+        rows = (
+            tuple(None if value != value else str(value) for value in row)
+            for row in df.reindex(columns=columns).itertuples(index=False, name=None)
+        )
+        self._conn.executemany("""
+            INSERT OR IGNORE INTO questions
+                (company_name, role_name, interview_question, difficulty, question_url, source, date_collected)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        self._conn.commit()
+        return self.count() - before
+
+    def add_csv(self, csv_file):
+        import pandas as pd
+        return self.add_records(pd.read_csv(csv_file))
+
+    @staticmethod
+    def to_match_expression(text):
+        """Turn free text into an FTS5 query (every term must match, prefix on the last)"""
+        terms = re.findall(r'\w+', text.lower())
+        if not terms:
+            return None
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += '*'
+        return ' '.join(quoted)
+
+    def _filters(self, company=None, difficulty=None, source=None):
+        conditions = []
+        params = []
+        for column, value in [('company_name', company), ('difficulty', difficulty), ('source', source)]:
+            if value:
+                conditions.append(f"q.{column} = ? COLLATE NOCASE")
+                params.append(value)
+        return conditions, params
+
+    def search(self, text, company=None, difficulty=None, source=None, limit=10, facets=True):
+        """
+        BM25-ranked search with optional company/difficulty/source filters
+        Returns (results, facet_counts)
+        """
+        match = self.to_match_expression(text)
+        if match is None:
+            return [], {}
+
+        conditions, params = self._filters(company, difficulty, source)
+        where = ' AND '.join(['questions_fts MATCH ?'] + conditions)
+
+        start = time.perf_counter()
+
+        results = self._conn.execute(f"""
+            SELECT q.company_name, q.difficulty, q.source, q.interview_question, q.question_url,
+                   bm25(questions_fts) AS score
+            FROM questions_fts
+            JOIN questions q ON q.id = questions_fts.rowid
+            WHERE {where}
+            ORDER BY score
+            LIMIT ?
+        """, [match] + params + [int(limit)]).fetchall()
+
+        facet_counts = {}
+        if facets:
+            for column in FACET_COLUMNS:
+                facet_counts[column] = self._conn.execute(f"""
+                    SELECT q.{column}, COUNT(*) AS n
+                    FROM questions_fts
+                    JOIN questions q ON q.id = questions_fts.rowid
+                    WHERE {where}
+                    GROUP BY q.{column}
+                    ORDER BY n DESC
+                    LIMIT 10
+                """, [match] + params).fetchall()
+
+        self.latencies.append(time.perf_counter() - start)
+        return results, facet_counts
+
+    def latency_report(self):
+        """p50/p99 search latency in milliseconds over every search so far"""
+        if not self.latencies:
+            return None
+        latencies_ms = sorted(latency * 1000 for latency in self.latencies)
+        if len(latencies_ms) >= 2:
+            percentiles = statistics.quantiles(latencies_ms, n=100, method='inclusive')
+            p50, p99 = percentiles[49], percentiles[98]
+        else:
+            p50 = p99 = latencies_ms[0]
+        return {'queries': len(latencies_ms), 'p50_ms': p50, 'p99_ms': p99, 'max_ms': latencies_ms[-1]}
+
+    def close(self):
+        self._conn.close()
+
+
+def print_results(results, facet_counts):
+    if not results:
+        print("\nNo matching questions")
+        return
+
+    for company, difficulty, source, question, url, score in results:
+        print(f"\n{company} [{difficulty}] ({source})  score={-score:.2f}")
+        print(f"  {question}")
+        if url:
+            print(f"  {url}")
+
+    for column, counts in facet_counts.items():
+        print(f"\n{column}: " + ', '.join(f"{value} ({n})" for value, n in counts))
+
+
+def run_benchmark(index, queries, repeat):
+    print(f"\nBenchmarking {len(queries)} queries x {repeat} over {index.count()} questions...")
+    index.latencies = []
+    for _ in range(repeat):
+        for query in queries:
+            index.search(query)
+    report = index.latency_report()
+    if report is None:
+        # Queries without indexable terms return before anything is timed
+        print("✓ No searches timed (no query had indexable terms)")
+        return
+    print(f"✓ {report['queries']} searches: p50 {report['p50_ms']:.2f} ms, "
+          f"p99 {report['p99_ms']:.2f} ms, max {report['max_ms']:.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Full-text search over interview questions")
+    parser.add_argument('query', nargs='?', help="search text, e.g. 'LRU cache'")
+    parser.add_argument('--company')
+    parser.add_argument('--difficulty')
+    parser.add_argument('--source')
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--index-path', default=DEFAULT_INDEX_PATH)
+    parser.add_argument('--add', nargs='*', metavar='CSV',
+                        help="index CSV files (default with no files: every MASTER_/scraper CSV here)")
+    parser.add_argument('--benchmark', nargs='?', const='', metavar='QUERY_FILE',
+                        help="report p50/p99 latency (one query per line, or built-in queries)")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    index = QuestionSearchIndex(args.index_path)
+
+    if args.add is not None:
+        from load_to_snowflake import CSV_PATTERNS
+        csv_files = args.add or sorted(
+            f for pattern in CSV_PATTERNS for f in glob.glob(pattern)
+        )
+        for csv_file in dict.fromkeys(csv_files):
+            added = index.add_csv(csv_file)
+            print(f"✓ {os.path.basename(csv_file)}: +{added} questions")
+        print(f"✓ Index now holds {index.count()} questions")
+
+    if args.query:
+        results, facet_counts = index.search(args.query, company=args.company,
+                                             difficulty=args.difficulty, source=args.source,
+                                             limit=args.limit)
+        print_results(results, facet_counts)
+        report = index.latency_report()
+        if report is not None:
+            print(f"\n({report['p50_ms']:.2f} ms)")
+
+    if args.benchmark is not None:
+        if args.benchmark:
+            with open(args.benchmark, encoding='utf-8') as f:
+                queries = [line.strip() for line in f if line.strip()]
+        else:
+            queries = BENCHMARK_QUERIES
+        run_benchmark(index, queries, args.repeat)
+
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
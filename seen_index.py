@@ -0,0 +1,305 @@
+import argparse
+import hashlib
+import math
+import mmap
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_INDEX_PATH = '.seen_index.sqlite'
+DEFAULT_CAPACITY = 1_000_000
+DEFAULT_ERROR_RATE = 0.01
+# Bumped whenever BloomFilter's probe positions change; filters written with
+# another layout are rebuilt from SQLite on open
+BLOOM_LAYOUT = 2
+
+
+def normalize_url(url):
+    """Scheme and host lowercased, fragment and trailing slash dropped"""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/')
+    query = f"?{parts.query}" if parts.query else ''
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}{path}{query}"
+
+
+def normalize_title(text):
+    return re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()
+
+
+def question_key(url=None, title=None, company=None):
+    """
+    Index key for a question: its URL when it has one, else its normalized
+    title, scoped to a company for sources that emit one row per company
+    """
+    key = f"url:{normalize_url(url)}" if url else f"title:{normalize_title(title or '')}"
+    return f"{company.strip().lower()}|{key}" if company else key
+
+
+def frame_keys(df, per_company=True):
+    """question_key for every row of a question DataFrame"""
+    urls = df['question_url'].astype(object)
+    titles = df['interview_question'].astype(object)
+    companies = df['company_name'].astype(object) if per_company else [None] * len(df)
+    return [question_key(url=url if isinstance(url, str) and url else None, title=title, company=company)
+            for url, title, company in zip(urls, titles, companies)]
+
+
+def key_digest(key):
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+
+
+class BloomFilter:
+    """
+    Bit array in a memory-mapped file, probed with double hashing over a
+    128-bit digest (k positions from two 64-bit halves). Bits are written
+    straight into the mapping, so the filter persists with no save step.
+    """
+
+    def __init__(self, path, bits, hashes):
+        self.path = path
+        self.bits = bits
+        self.hashes = hashes
+        size = (bits + 7) // 8
+        if not os.path.exists(path) or os.path.getsize(path) != size:
+            with open(path, 'wb') as f:
+                f.truncate(size)
+        with open(path, 'r+b') as f:
+            self.mm = mmap.mmap(f.fileno(), size)
+
+    @staticmethod
+    def parameters(capacity, error_rate):
+        """(bits, hashes) for `capacity` items at a target false-positive rate"""
+        bits = max(2, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        return bits, max(1, round(bits / capacity * math.log(2)))
+
+    def _probe(self, digest):
+        # Both halves are reduced first so contains_many() computes the
+        # same positions in uint64 without overflowing; the step is never 0,
+        # which would collapse all k probes onto one bit
+        start = int.from_bytes(digest[:8], 'little') % self.bits
+        step = 1 + int.from_bytes(digest[8:], 'little') % (self.bits - 1)
+        return start, step
+
+    def _positions(self, digest):
+        start, step = self._probe(digest)
+        return [(start + i * step) % self.bits for i in range(self.hashes)]
+
+    def add(self, digest):
+        mm = self.mm
+        for position in self._positions(digest):
+            mm[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest):
+        mm = self.mm
+        bits = self.bits
+        start, step = self._probe(digest)
+        for i in range(self.hashes):
+            position = (start + i * step) % bits
+            if not mm[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def contains_many(self, digests):
+        """Vectorized membership for a batch of digests (numpy bool array)"""
+        import numpy as np
+
+        halves = np.frombuffer(b''.join(digests), dtype='<u8').reshape(-1, 2)
+        starts = halves[:, :1] % np.uint64(self.bits)
+        steps = np.uint64(1) + halves[:, 1:] % np.uint64(self.bits - 1)
+        probes = np.arange(self.hashes, dtype=np.uint64)
+        positions = (starts + probes * steps) % np.uint64(self.bits)
+        table = np.frombuffer(self.mm, dtype=np.uint8)
+        try:
+            set_bits = (table[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+            return set_bits.all(axis=1)
+        finally:
+            # Release the buffer export so the mapping can be closed
+            del table
+
+    def clear(self):
+        self.mm[:] = bytes(len(self.mm))
+
+    def expected_error_rate(self, items):
+        return (1 - math.exp(-self.hashes * items / self.bits)) ** self.hashes
+
+    def close(self):
+        self.mm.flush()
+        self.mm.close()
+
+
+class SeenIndex:
+    """
+    Persistent index of questions already collected, shared by the scrapers
+
+    SQLite holds the 16-byte digest of every key; a memory-mapped Bloom
+    filter in front answers most lookups without touching it. A "no" from
+    the filter is final, a "maybe" is confirmed in SQLite, so known items
+    are skipped exactly and false positives are only counted. Keys added
+    during a run become durable on commit(), once the scrape has saved its
+    output; a crash before that leaves stray filter bits (more false
+    positives), never a lost question.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE):
+        self.path = path
+        self.bloom_path = os.path.splitext(path)[0] + '.bloom'
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS seen (
+                digest BLOB PRIMARY KEY,
+                source TEXT,
+                first_seen REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+        self._conn.commit()
+        # Counters for this session (approximate when several threads look up at once)
+        self.lookups = 0
+        self.hits = 0
+        self.false_positives = 0
+
+        self.items = self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+        meta = dict(self._conn.execute("SELECT name, value FROM meta"))
+        if (meta.get('layout') == BLOOM_LAYOUT and self.items <= meta['capacity']
+                and os.path.exists(self.bloom_path)):
+            self.capacity = meta['capacity']
+            self.bloom = BloomFilter(self.bloom_path, meta['bits'], meta['hashes'])
+        else:
+            self.capacity = max(capacity, 2 * self.items)
+            self.bloom = None
+            self.rebuild()
+
+    def rebuild(self):
+        """Size the filter for the current capacity and refill it from SQLite"""
+        if self.bloom is not None:
+            self.bloom.close()
+            os.remove(self.bloom_path)
+        bits, hashes = BloomFilter.parameters(self.capacity, self.error_rate)
+        self.bloom = BloomFilter(self.bloom_path, bits, hashes)
+        self.bloom.clear()
+        for (digest,) in self._conn.execute("SELECT digest FROM seen"):
+            self.bloom.add(digest)
+        self._conn.executemany("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                               [('capacity', self.capacity), ('bits', bits), ('hashes', hashes),
+                                ('layout', BLOOM_LAYOUT)])
+        self._conn.commit()
+
+    def __len__(self):
+        return self.items
+
+    def might_contain(self, key):
+        """Filter-only check: no false negatives, ~error_rate false positives"""
+        return key_digest(key) in self.bloom
+
+    def __contains__(self, key):
+        self.lookups += 1
+        digest = key_digest(key)
+        if digest not in self.bloom:
+            return False
+        with self._lock:
+            found = self._conn.execute("SELECT 1 FROM seen WHERE digest = ?", (digest,)).fetchone() is not None
+        if found:
+            self.hits += 1
+        else:
+            self.false_positives += 1
+        return found
+
+    def contains_many(self, keys):
+        """Membership for a batch of keys: one vectorized filter pass, SQLite only for the maybes"""
+        if not keys:
+            return []
+        self.lookups += len(keys)
+        digests = [key_digest(key) for key in keys]
+        maybe = self.bloom.contains_many(digests)
+        found = [False] * len(keys)
+        with self._lock:
+            for position in maybe.nonzero()[0]:
+                digest = digests[position]
+                found[position] = self._conn.execute(
+                    "SELECT 1 FROM seen WHERE digest = ?", (digest,)).fetchone() is not None
+        hits = sum(found)
+        self.hits += hits
+        self.false_positives += int(maybe.sum()) - hits
+        return found
+
+    def add_many(self, keys, source=None):
+        """Record keys as seen (durable after commit())"""
+        now = time.time()
+        digests = [key_digest(key) for key in keys]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO seen (digest, source, first_seen) VALUES (?, ?, ?)",
+                                   [(digest, source, now) for digest in digests])
+            self.items += self._conn.total_changes - before
+            for digest in digests:
+                self.bloom.add(digest)
+
+    def add(self, key, source=None):
+        self.add_many([key], source)
+
+    def known_rows(self, df, per_company=True):
+        """Boolean mask of the question rows in `df` that are already in the index"""
+        import numpy as np
+        return np.array(self.contains_many(frame_keys(df, per_company)), dtype=bool)
+
+    def add_frame(self, df, source=None, per_company=True):
+        self.add_many(frame_keys(df, per_company), source)
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+            self.bloom.mm.flush()
+            if self.items > self.capacity:
+                self.capacity = 2 * self.items
+                self.rebuild()
+
+    def stats(self):
+        negatives = self.lookups - self.hits
+        return {
+            'items': self.items,
+            'capacity': self.capacity,
+            'filter_bytes': len(self.bloom.mm),
+            'hashes': self.bloom.hashes,
+            'lookups': self.lookups,
+            'hits': self.hits,
+            'false_positives': self.false_positives,
+            # Share of lookups for unseen keys that the filter let through to SQLite
+            'observed_fp_rate': self.false_positives / negatives if negatives else 0.0,
+            'expected_fp_rate': self.bloom.expected_error_rate(self.items)
+        }
+
+    def print_stats(self):
+        stats = self.stats()
+        print(f"✓ Seen index: {stats['items']:,} known, {stats['hits']:,}/{stats['lookups']:,} lookups skipped, "
+              f"{stats['false_positives']} filter false positive(s) "
+              f"({stats['observed_fp_rate']:.2%} observed, {stats['expected_fp_rate']:.2%} expected)")
+
+    def close(self):
+        self.commit()
+        self.bloom.close()
+        self._conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the shared seen-question index")
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH)
+    parser.add_argument('--rebuild', action='store_true', help="resize and refill the Bloom filter from SQLite")
+    args = parser.parse_args()
+
+    index = SeenIndex(args.index)
+    if args.rebuild:
+        index.capacity = max(index.capacity, 2 * index.items)
+        index.rebuild()
+    stats = index.stats()
+    print(f"{args.index}: {stats['items']:,} questions (capacity {stats['capacity']:,})")
+    print(f"Bloom filter: {stats['filter_bytes'] / 1024:.0f} KB, {stats['hashes']} hashes, "
+          f"expected false-positive rate {stats['expected_fp_rate']:.3%}")
+    index.close()
@@ -0,0 +1,400 @@
+import os
+from datetime import datetime
+
+TABLE_NAME = 'INTERVIEW_QUESTIONS'
+# Session-scoped temp table bulk uploads land in before the MERGE
+STAGE_TABLE_NAME = 'INTERVIEW_QUESTIONS_STAGE'
+
+# Column order shared by every scraper CSV and both backends
+COLUMNS = [
+    'company_name', 'role_name', 'interview_question', 'difficulty',
+    'question_url', 'source', 'date_collected'
+]
+
+DEFAULT_BACKEND = 'snowflake'
+DEFAULT_DUCKDB_PATH = 'jobprep.duckdb'
+
+
+def column_defaults(now_str=None):
+    """Values used for missing fields, shared by the loader and both backends"""
+    return {
+        'company_name': 'Unknown',
+        'role_name': 'Software Engineer',
+        'interview_question': '',
+        'difficulty': 'Not Specified',
+        'question_url': '',
+        'source': 'Unknown',
+        'date_collected': now_str or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def prepare_records(df, now_str=None):
+    """Fill defaults, keep only the table columns and drop in-file duplicates"""
+    import pandas as pd
+
+    defaults = column_defaults(now_str)
+    df = df.copy()
+    for column in COLUMNS:
+        if column not in df.columns:
+            df[column] = defaults[column]
+    df = df[COLUMNS]
+
+    # Compact (categorical) columns can only be filled with one of their categories
+    for column in COLUMNS:
+        values = df[column]
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            continue
+        default = defaults.pop(column)
+        if not values.hasnans:
+            continue
+        if isinstance(values.cat.categories, pd.DatetimeIndex):
+            default = pd.Timestamp(default)
+        if default not in values.cat.categories:
+            values = values.cat.add_categories([default])
+        df[column] = values.fillna(default)
+
+    df = df.fillna(defaults)
+    df = df.drop_duplicates(subset=['company_name', 'interview_question'])
+    return df.reset_index(drop=True)
+
+
+class StorageBackend:
+    """
+    Storage interface behind setup/load/query
+
+    Queries use qmark ('?') placeholders on every backend so the same SQL
+    text runs unchanged against Snowflake and DuckDB.
+    """
+
+    name = None
+
+    def __init__(self):
+        self.conn = None
+
+    @property
+    def cache_namespace(self):
+        """
+        Table key used by the local query cache: backend, the database it
+        points at and the table, so two databases never share cached results
+        """
+        return f"{self.name.upper()}:{self.location()}.{TABLE_NAME}"
+
+    def location(self):
+        """Identifies the database this backend reads and writes"""
+        raise NotImplementedError
+
+    def describe(self):
+        raise NotImplementedError
+
+    def connect(self, use_database=True):
+        raise NotImplementedError
+
+    def create_schema(self):
+        raise NotImplementedError
+
+    def sample_clause(self, rows):
+        raise NotImplementedError
+
+    def config_errors(self):
+        """Exception types that point at bad credentials/config rather than a bug"""
+        return ()
+
+    def execute(self, sql, params=None):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql, params)
+        finally:
+            cursor.close()
+
+    def fetchall(self, sql, params=None):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def query(self, sql, params=None):
+        raise NotImplementedError
+
+    def count(self):
+        return self.fetchall(f"SELECT COUNT(*) FROM {TABLE_NAME}")[0][0]
+
+    def read_input(self, path):
+        """Read a scraper output file (CSV or Parquet) into a DataFrame"""
+        import pandas as pd
+        if path.endswith('.parquet'):
+            return pd.read_parquet(path)
+        return pd.read_csv(path)
+
+    def merge_dataframe(self, df):
+        """Insert rows whose (company_name, interview_question) isn't already stored"""
+        raise NotImplementedError
+
+    def merge_file(self, path):
+        self.merge_dataframe(prepare_records(self.read_input(path)))
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+class SnowflakeBackend(StorageBackend):
+    """Snowflake warehouse configured through snowflake_config.py"""
+
+    name = 'snowflake'
+
+    def __init__(self):
+        super().__init__()
+        # Imported here so offline backends don't need the connector or config
+        from snowflake_config import SNOWFLAKE_CONFIG
+        self.config = SNOWFLAKE_CONFIG
+
+    def location(self):
+        return f"{self.config['account']}.{self.config['database']}.{self.config['schema']}".upper()
+
+    def describe(self):
+        return (f"Snowflake {self.config['database']}.{self.config['schema']}.{TABLE_NAME}"
+                f" (warehouse {self.config['warehouse']})")
+
+    def connect(self, use_database=True):
+        import snowflake.connector
+
+        # Build connection parameters dynamically
+        conn_params = {
+            'user': self.config['user'],
+            'account': self.config['account'],
+            'warehouse': self.config['warehouse'],
+            'paramstyle': 'qmark'
+        }
+        if use_database:
+            conn_params['database'] = self.config['database']
+            conn_params['schema'] = self.config['schema']
+
+        # Add password if it exists
+        if 'password' in self.config:
+            conn_params['password'] = self.config['password']
+
+            # Ask for MFA code if password authentication is being used
+            print("\n⚠️  MFA Required!")
+            mfa_code = input("Enter your MFA/TOTP code from your authenticator app: ").strip()
+            if mfa_code:
+                conn_params['passcode'] = mfa_code
+
+        # Add authenticator if it exists (for externalbrowser)
+        if 'authenticator' in self.config:
+            conn_params['authenticator'] = self.config['authenticator']
+
+        self.conn = snowflake.connector.connect(**conn_params)
+        return self.conn
+
+    def create_schema(self):
+        self.execute(f"CREATE DATABASE IF NOT EXISTS {self.config['database']}")
+        self.execute(f"USE DATABASE {self.config['database']}")
+        self.execute(f"CREATE SCHEMA IF NOT EXISTS {self.config['schema']}")
+        self.execute(f"USE SCHEMA {self.config['schema']}")
+        self.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+            ID NUMBER AUTOINCREMENT PRIMARY KEY,
+            COMPANY_NAME VARCHAR(255),
+            ROLE_NAME VARCHAR(255),
+            INTERVIEW_QUESTION TEXT,
+            DIFFICULTY VARCHAR(50),
+            QUESTION_URL TEXT,
+            SOURCE VARCHAR(100),
+            DATE_COLLECTED TIMESTAMP_NTZ,
+            CREATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+        )
+        """)
+
+    def sample_clause(self, rows):
+        return f"SAMPLE ({int(rows)} ROWS)"
+
+    def config_errors(self):
+        import snowflake.connector
+        return (snowflake.connector.errors.ProgrammingError,)
+
+    def query(self, sql, params=None):
+        """Fetch a result as a DataFrame through Arrow batches (columnar transfer)"""
+        import pandas as pd
+        import snowflake.connector
+
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            try:
+                return cursor.fetch_pandas_all()
+            except snowflake.connector.errors.NotSupportedError:
+                # Result wasn't returned in Arrow format (e.g. SHOW/DESCRIBE)
+                columns = [col[0] for col in cursor.description]
+                return pd.DataFrame(cursor.fetchall(), columns=columns)
+        finally:
+            cursor.close()
+
+    def merge_dataframe(self, df):
+        """
+        Bulk-load the rows into a session temp table with write_pandas
+        (compressed Parquet through an internal stage), then insert the new
+        ones with a single set-based MERGE instead of one MERGE per row
+        """
+        import pandas as pd
+        from snowflake.connector.pandas_tools import write_pandas
+
+        self.execute(f"""
+        CREATE TEMPORARY TABLE IF NOT EXISTS {STAGE_TABLE_NAME} (
+            COMPANY_NAME VARCHAR(255),
+            ROLE_NAME VARCHAR(255),
+            INTERVIEW_QUESTION TEXT,
+            DIFFICULTY VARCHAR(50),
+            QUESTION_URL TEXT,
+            SOURCE VARCHAR(100),
+            DATE_COLLECTED VARCHAR
+        )
+        """)
+        self.execute(f"TRUNCATE TABLE {STAGE_TABLE_NAME}")
+
+        # Plain strings, so compact (categorical/Arrow) columns upload as VARCHAR
+        staged = pd.DataFrame({
+            column.upper(): [None if pd.isna(value) else str(value) for value in df[column].astype(object)]
+            for column in COLUMNS
+        })
+        write_pandas(self.conn, staged, STAGE_TABLE_NAME, quote_identifiers=False)
+
+        self.execute(f"""
+        MERGE INTO {TABLE_NAME} tgt
+        USING (
+            SELECT * FROM {STAGE_TABLE_NAME}
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY company_name, interview_question ORDER BY date_collected DESC) = 1
+        ) AS src
+        ON tgt.company_name = src.company_name
+           AND tgt.interview_question = src.interview_question
+        WHEN NOT MATCHED THEN
+          INSERT (company_name, role_name, interview_question, difficulty, question_url, source, date_collected)
+          VALUES (src.company_name, src.role_name, src.interview_question, src.difficulty, src.question_url, src.source,
+                  TRY_TO_TIMESTAMP_NTZ(src.date_collected));
+        """)
+
+
+class DuckDBBackend(StorageBackend):
+    """
+    Embedded DuckDB file with the same INTERVIEW_QUESTIONS schema and MERGE
+    semantics, for offline development, tests and benchmarks
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, path=None):
+        super().__init__()
+        self.path = path or os.environ.get('JOBPREP_DUCKDB_PATH', DEFAULT_DUCKDB_PATH)
+
+    def location(self):
+        return os.path.realpath(self.path)
+
+    def describe(self):
+        return f"DuckDB {self.path} ({TABLE_NAME})"
+
+    def connect(self, use_database=True):
+        import duckdb
+        self.conn = duckdb.connect(self.path)
+        return self.conn
+
+    def create_schema(self):
+        self.conn.execute("CREATE SEQUENCE IF NOT EXISTS INTERVIEW_QUESTIONS_ID_SEQ")
+        self.conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+            ID BIGINT DEFAULT nextval('INTERVIEW_QUESTIONS_ID_SEQ') PRIMARY KEY,
+            COMPANY_NAME VARCHAR(255),
+            ROLE_NAME VARCHAR(255),
+            INTERVIEW_QUESTION TEXT,
+            DIFFICULTY VARCHAR(50),
+            QUESTION_URL TEXT,
+            SOURCE VARCHAR(100),
+            DATE_COLLECTED TIMESTAMP,
+            CREATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """)
+
+    def sample_clause(self, rows):
+        return f"USING SAMPLE {int(rows)} ROWS"
+
+    def execute(self, sql, params=None):
+        self.conn.execute(sql, params)
+
+    def fetchall(self, sql, params=None):
+        return self.conn.execute(sql, params).fetchall()
+
+    def query(self, sql, params=None):
+        return self.conn.execute(sql, params).df()
+
+    def read_input(self, path):
+        # DuckDB's parallel CSV/Parquet readers instead of pandas' parser
+        reader = 'read_parquet' if path.endswith('.parquet') else 'read_csv_auto'
+        return self.conn.execute(f"SELECT * FROM {reader}(?)", [path]).df()
+
+    def _merge_from(self, source_sql, params=None, available=COLUMNS):
+        """MERGE from a relation; table columns it lacks (see `available`) get their defaults"""
+        defaults = column_defaults()
+        available = {column.lower() for column in available}
+        selected = ',\n                       '.join(
+            f"COALESCE(CAST({column} AS VARCHAR), '{defaults[column]}') AS {column}"
+            if column in available else f"'{defaults[column]}' AS {column}"
+            for column in COLUMNS
+        )
+        # Latest collection wins among in-file duplicates, as in the Snowflake MERGE
+        self.conn.execute(f"""
+        MERGE INTO {TABLE_NAME} tgt
+        USING (
+            SELECT DISTINCT ON (company_name, interview_question) *
+            FROM (
+                SELECT {selected}
+                FROM {source_sql}
+            )
+            ORDER BY company_name, interview_question, date_collected DESC
+        ) AS src
+        ON tgt.company_name = src.company_name
+           AND tgt.interview_question = src.interview_question
+        WHEN NOT MATCHED THEN
+          INSERT (company_name, role_name, interview_question, difficulty, question_url, source, date_collected)
+          VALUES (src.company_name, src.role_name, src.interview_question, src.difficulty, src.question_url, src.source,
+                  CAST(src.date_collected AS TIMESTAMP));
+        """, params)
+
+    def merge_dataframe(self, df):
+        # The DataFrame is scanned in place (no per-row binding)
+        self.conn.register('merge_source_df', df[COLUMNS])
+        try:
+            self._merge_from('merge_source_df')
+        finally:
+            self.conn.unregister('merge_source_df')
+
+    def merge_file(self, path):
+        """MERGE straight from a CSV/Parquet file with a vectorized scan"""
+        reader = 'read_parquet' if path.endswith('.parquet') else 'read_csv_auto'
+        # Scraper files don't all carry every column (e.g. no role_name)
+        available = [row[0] for row in self.conn.execute(f"DESCRIBE SELECT * FROM {reader}(?)", [path]).fetchall()]
+        self._merge_from(f"{reader}(?)", [path], available)
+
+    def commit(self):
+        # DuckDB autocommits each statement
+        pass
+
+
+BACKENDS = {
+    'snowflake': SnowflakeBackend,
+    'duckdb': DuckDBBackend
+}
+
+
+def get_backend(name=None):
+    """
+    Create a storage backend by name
+    Defaults to $JOBPREP_BACKEND, then Snowflake
+    """
+    name = (name or os.environ.get('JOBPREP_BACKEND') or DEFAULT_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}' (choose from: {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
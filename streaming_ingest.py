@@ -0,0 +1,182 @@
+import queue
+import threading
+import time
+from datetime import datetime
+from instrumentation import span, bind, count
+
+DEFAULT_BATCH_ROWS = 5000
+DEFAULT_FLUSH_SECONDS = 60.0
+DEFAULT_QUEUE_BATCHES = 8
+MAX_FLUSH_RETRIES = 3
+
+_CLOSE = object()
+
+
+class StreamingLoader:
+    """
+    Loads scraped rows into the warehouse while the scrapers are still running
+
+    Producers put() question DataFrames onto a bounded in-process queue; a
+    consumer thread collects them and, every `batch_rows` rows or
+    `flush_seconds` (whichever comes first), merges the micro-batch with
+    one staged bulk MERGE through the storage backend. When the loader
+    falls `max_batches` behind, put() blocks, so a fast crawler is slowed
+    to the warehouse's pace instead of queueing without bound. A batch
+    that still fails after retries is written to a CSV for a manual load.
+    """
+
+    def __init__(self, backend=None, batch_rows=DEFAULT_BATCH_ROWS, flush_seconds=DEFAULT_FLUSH_SECONDS,
+                 max_batches=DEFAULT_QUEUE_BATCHES, update_search_index=True, cache_path=None):
+        if backend is None:
+            from storage_backends import get_backend
+            backend = get_backend()
+        self.backend = backend
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.update_search_index = update_search_index
+        self.cache_path = cache_path
+        self.queue = queue.Queue(maxsize=max_batches)
+        self.thread = None
+        self.error = None
+        # put() runs on every producer thread, _flush()/_spill() on the consumer
+        self.lock = threading.Lock()
+        self.stats = {'batches': 0, 'rows': 0, 'merges': 0, 'merged_rows': 0, 'spilled_rows': 0,
+                      'max_latency_seconds': 0.0, 'backpressure_seconds': 0.0}
+
+    def start(self):
+        # Connected here so a bad config fails before any crawling starts
+        self.backend.connect()
+        self.thread = threading.Thread(target=bind(self._run), name='streaming-loader', daemon=True)
+        self.thread.start()
+        return self
+
+    def put(self, df):
+        """Queue a batch of question rows; blocks while the loader is behind"""
+        if df is None or not len(df):
+            return
+        start = time.perf_counter()
+        self._put((time.time(), df))
+        waited = time.perf_counter() - start
+        with self.lock:
+            self.stats['batches'] += 1
+            self.stats['rows'] += len(df)
+            self.stats['backpressure_seconds'] += waited
+        count('stream_backpressure_seconds', waited)
+
+    def _put(self, item):
+        while True:
+            if not self.thread.is_alive():
+                raise RuntimeError(f"streaming loader stopped: {self.error}")
+            try:
+                self.queue.put(item, timeout=1.0)
+                return
+            except queue.Full:
+                continue
+
+    def close(self):
+        """Flush what is queued, stop the consumer and close the backend"""
+        if self.thread is None:
+            return
+        try:
+            if self.thread.is_alive():
+                self._put(_CLOSE)
+            self.thread.join()
+        finally:
+            self.thread = None
+            self.backend.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        from query_cache import QueryCache
+        from search_questions import QuestionSearchIndex
+
+        # SQLite handles live in the thread that uses them
+        cache = QueryCache(self.cache_path) if self.cache_path else QueryCache()
+        index = QuestionSearchIndex() if self.update_search_index else None
+        frames, enqueued = [], []
+        rows = 0
+        deadline = None
+        closing = False
+        try:
+            while not closing:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                if item is _CLOSE:
+                    closing = True
+                elif item is not None:
+                    enqueued_at, df = item
+                    frames.append(df)
+                    enqueued.append(enqueued_at)
+                    rows += len(df)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_seconds
+
+                if frames and (closing or rows >= self.batch_rows or time.monotonic() >= deadline):
+                    self._flush(frames, min(enqueued), cache, index)
+                    frames, enqueued = [], []
+                    rows = 0
+                    deadline = None
+        except Exception as e:
+            self.error = e
+            print(f"✗ Streaming loader stopped: {e}")
+            raise
+        finally:
+            if index is not None:
+                index.close()
+
+    def _flush(self, frames, oldest, cache, index):
+        from records import concat_records
+        from storage_backends import prepare_records
+
+        now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        df = prepare_records(concat_records(frames), now_str)
+        with span('stream.merge', backend=self.backend.name, rows=len(df)) as unit:
+            for attempt in range(MAX_FLUSH_RETRIES + 1):
+                try:
+                    self.backend.merge_dataframe(df)
+                    self.backend.commit()
+                    break
+                except Exception as e:
+                    if attempt == MAX_FLUSH_RETRIES:
+                        self._spill(df, e)
+                        return
+                    print(f"⚠️  Streaming merge failed ({str(e)[:60]}), retrying...")
+                    time.sleep(2 ** attempt)
+            unit.count('rows', len(df))
+
+        latency = time.time() - oldest
+        with self.lock:
+            self.stats['merges'] += 1
+            self.stats['merged_rows'] += len(df)
+            self.stats['max_latency_seconds'] = max(self.stats['max_latency_seconds'], latency)
+        cache.bump_table_version(self.backend.cache_namespace)
+        if index is not None:
+            index.add_records(df)
+        print(f"  ⇪ Merged {len(df)} rows into {self.backend.name} ({latency:.1f}s after they were scraped)")
+
+    def _spill(self, df, error):
+        filename = f"stream_failed_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.csv"
+        df.to_csv(filename, index=False)
+        with self.lock:
+            self.stats['spilled_rows'] += len(df)
+        count('stream_spilled_rows', len(df))
+        print(f"✗ Streaming merge failed ({str(error)[:60]}); {len(df)} rows saved to {filename} for a manual load")
+
+    def print_summary(self):
+        with self.lock:
+            stats = dict(self.stats)
+        print(f"\n✓ Streamed {stats['rows']:,} rows in {stats['batches']} batch(es) through "
+              f"{stats['merges']} merge(s); slowest row reached {self.backend.name} "
+              f"{stats['max_latency_seconds']:.1f}s after it was scraped")
+        if stats['backpressure_seconds'] >= 0.1:
+            print(f"  Producers waited {stats['backpressure_seconds']:.1f}s on a full queue")
+        if stats['spilled_rows']:
+            print(f"  ⚠️  {stats['spilled_rows']:,} rows could not be merged (see stream_failed_*.csv)")